@@ -143,6 +143,13 @@ def add_argument_dockerfile_dir(parser):
         help="The directory where the 'Dockerfile' will be generated")
 
 
+def add_argument_binary_package_versions_file(parser):
+    parser.add_argument(
+        '--binary-package-versions-file',
+        help='The path of a snapshot file containing the versions of all '
+             'binary packages to use instead of loading the apt cache')
+
+
 def add_argument_debian_repository_urls(parser, nargs='+'):
     parser.add_argument(
         'debian_repository_urls',
@@ -174,6 +181,16 @@ def add_argument_target_repository(parser):
         help='The target repository where generated packages are pushed to')
 
 
+def add_argument_sources_index(parser):
+    parser.add_argument(
+        '--sources-os-code-name',
+        help='The OS code name of the Sources index in the target '
+             'repository to look up the sourcedeb in instead of using apt')
+    parser.add_argument(
+        '--sources-cache-dir',
+        help='The path of a persistent directory to cache the Sources index')
+
+
 def add_argument_custom_rosdep_urls(parser):
     parser.add_argument(
         '--custom-rosdep-urls',
@@ -191,6 +208,47 @@ def add_argument_cache_dir(parser, default=None):
         help='The cache directory')
 
 
+def add_argument_rosdep_cache_dir(parser):
+    parser.add_argument(
+        '--rosdep-cache-dir',
+        help='The path of a persistent directory to cache the resolution of '
+             'rosdep keys')
+
+
+def add_argument_git_mirror_cache_dir(parser):
+    parser.add_argument(
+        '--git-mirror-cache-dir',
+        help='The path of a persistent directory to cache mirrors of the '
+             'cloned git repositories')
+
+
+def add_argument_common_dependencies(parser):
+    parser.add_argument(
+        '--common-dependencies',
+        nargs='*',
+        default=[],
+        help='The list of binary packages needed by many jobs of the '
+             'platform which are installed first to reuse the Docker image '
+             'layers')
+
+
+def add_argument_base_image_registry(parser):
+    parser.add_argument(
+        '--base-image-registry',
+        help='The Docker registry to pull the prebuilt base image from')
+
+
+def add_argument_base_image(parser):
+    parser.add_argument(
+        '--base-image',
+        help='The name of a locally available prebuilt base image')
+    parser.add_argument(
+        '--base-image-packages',
+        nargs='*',
+        default=[],
+        help='The list of packages preinstalled in the base image')
+
+
 def add_argument_missing_only(parser):
     parser.add_argument(
         '--missing-only',
@@ -198,6 +256,15 @@ def add_argument_missing_only(parser):
         help='Only trigger jobs with missing artifacts')
 
 
+def add_argument_roots_only(parser):
+    parser.add_argument(
+        '--roots-only',
+        action='store_true',
+        help='Only trigger jobs with missing artifacts which are not blocked '
+             'by missing artifacts of their dependencies (implies '
+             '--missing-only)')
+
+
 def add_argument_source_only(parser):
     parser.add_argument(
         '--source-only',
@@ -205,11 +272,11 @@ def add_argument_source_only(parser):
         help='Only trigger source jobs')
 
 
-def add_argument_os_code_name_and_arch_tuples(parser):
+def add_argument_os_code_name_and_arch_tuples(parser, required=True):
     parser.add_argument(
         '--os-code-name-and-arch-tuples',
         nargs='+',
-        required=True,
+        required=required,
         help="The colon separated tuple containing an OS code name and an " +
              "architecture (e.g. 'trusty:amd64')")
 
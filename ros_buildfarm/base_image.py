@@ -0,0 +1,235 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import copy
+import os
+import subprocess
+
+from ros_buildfarm.config import get_distribution_file
+from ros_buildfarm.config import get_doc_build_files
+from ros_buildfarm.config import get_release_build_files
+from ros_buildfarm.config import get_source_build_files
+from ros_buildfarm.config.doc_build_file import DOC_TYPE_ROSDOC
+from ros_buildfarm.config.doc_build_file import DocBuildFile
+from ros_buildfarm.config.release_build_file import ReleaseBuildFile
+from ros_buildfarm.config.source_build_file import SourceBuildFile
+from ros_buildfarm.dependency_layers import get_common_core
+from ros_buildfarm.dependency_layers import get_common_dependencies
+from ros_buildfarm.dependency_layers import get_release_dependency_names
+from ros_buildfarm.dependency_layers import get_repository_dependency_names
+
+# keep in sync with scripts/misc/docker_pull_baseimage.py
+BASE_IMAGE_REPOSITORY = 'ros_buildfarm_base'
+# the label of the base image listing the preinstalled packages
+BASE_IMAGE_PACKAGES_LABEL = 'org.ros.buildfarm.base_image.packages'
+# the label of the base image listing the packages needed by many jobs
+BASE_IMAGE_COMMON_DEPENDENCIES_LABEL = \
+    'org.ros.buildfarm.base_image.common_dependencies'
+# the maximum number of dependencies preinstalled in a base image
+DEFAULT_MAX_BASE_IMAGE_DEPENDENCIES = 100
+
+
+def get_base_image_name(
+        rosdistro_name, os_name, os_code_name, arch, registry=None):
+    image_name = '%s:%s_%s_%s_%s' % (
+        BASE_IMAGE_REPOSITORY, rosdistro_name, os_name, os_code_name, arch)
+    if registry:
+        image_name = '%s/%s' % (registry.rstrip('/'), image_name)
+    return image_name
+
+
+def get_base_image_job_name(rosdistro_name, os_name, os_code_name, arch):
+    return '%s_base-image__%s_%s_%s' % (
+        rosdistro_name, os_name, os_code_name, arch)
+
+
+def get_base_image_platforms(config, rosdistro_name):
+    """
+    Get the Debian based platforms targeted by any build file.
+
+    :returns: A dict mapping (os_name, os_code_name, arch) tuples to the list
+      of build files targeting them
+    """
+    platforms = {}
+    build_files = []
+    build_files += get_release_build_files(config, rosdistro_name).values()
+    build_files += get_source_build_files(config, rosdistro_name).values()
+    for build_file in get_doc_build_files(config, rosdistro_name).values():
+        if build_file.documentation_type == DOC_TYPE_ROSDOC:
+            build_files.append(build_file)
+    for build_file in build_files:
+        for os_name, os_code_names in build_file.targets.items():
+            if os_name == 'arch':
+                continue
+            for os_code_name, arches in os_code_names.items():
+                for arch in arches:
+                    platforms.setdefault(
+                        (os_name, os_code_name, arch), []).append(build_file)
+    return platforms
+
+
+def get_merged_repositories_build_file(build_files):
+    """
+    Get a copy of the first build file with the repositories of all.
+
+    Only the repositories of the source and doc build files are used, the
+    ones the devel and doc jobs use anyway.
+    The repositories of release build files contain the building repository
+    and packages installed from it would not be downgraded by the jobs.
+    Each repository is only added once.
+    """
+    merged_build_file = copy.deepcopy(build_files[0])
+    merged_build_file.repository_urls = []
+    merged_build_file.repository_keys = []
+    for build_file in build_files:
+        if isinstance(build_file, ReleaseBuildFile):
+            continue
+        for url, key in zip(
+                build_file.repository_urls, build_file.repository_keys):
+            if url not in merged_build_file.repository_urls:
+                merged_build_file.repository_urls.append(url)
+                merged_build_file.repository_keys.append(key)
+    return merged_build_file
+
+
+def get_base_image_dependencies(
+        index, dist_cache, rosdistro_name, build_files,
+        max_count=DEFAULT_MAX_BASE_IMAGE_DEPENDENCIES):
+    """
+    Get the rosdep keys to preinstall in the base image of a platform.
+
+    Every devel and doc job (one per repository) as well as every binarydeb
+    job (one per package) of the passed build files is considered.
+    Besides the keys to preinstall the keys needed by many of the jobs are
+    determined, which the jobs install first to share the Docker image layers.
+
+    :returns: A tuple containing the list of rosdep keys to preinstall and
+      the list of common rosdep keys, both ordered by descending frequency
+    """
+    dependency_names_per_job = []
+    for build_file in build_files:
+        dist_file = get_distribution_file(index, rosdistro_name, build_file)
+        if not dist_file:
+            continue
+        if isinstance(build_file, ReleaseBuildFile):
+            for pkg_name in build_file.filter_packages(
+                    dist_file.release_packages.keys()):
+                dependency_names_per_job.append(get_release_dependency_names(
+                    dist_cache, [pkg_name], _get_build_dependencies))
+        elif isinstance(build_file, SourceBuildFile):
+            repo_names = [
+                repo_name for repo_name in build_file.filter_repositories(
+                    dist_file.repositories.keys())
+                if dist_file.repositories[repo_name].source_repository]
+            dependency_names_per_job += get_repository_dependency_names(
+                dist_cache, repo_names, _get_build_dependencies)
+        elif isinstance(build_file, DocBuildFile):
+            repo_names = [
+                repo_name for repo_name in build_file.filter_repositories(
+                    dist_file.repositories.keys())
+                if dist_file.repositories[repo_name].doc_repository]
+            dependency_names_per_job += get_repository_dependency_names(
+                dist_cache, repo_names, _get_doc_dependencies)
+    return (
+        get_common_core(dependency_names_per_job, max_count=max_count),
+        get_common_dependencies(dependency_names_per_job))
+
+
+def _get_build_dependencies(pkg):
+    return pkg.build_depends + pkg.buildtool_depends
+
+
+def _get_doc_dependencies(pkg):
+    return pkg.build_depends + pkg.buildtool_depends + \
+        pkg.build_export_depends + pkg.buildtool_export_depends + \
+        pkg.exec_depends + pkg.doc_depends
+
+
+def get_base_image_packages(
+        image_name, pull=False, label=BASE_IMAGE_PACKAGES_LABEL):
+    """
+    Get the packages preinstalled in a locally available base image.
+
+    :param pull: The flag if the image should be pulled from the registry
+      first
+    :param label: The label of the image containing the packages, by default
+      the preinstalled ones
+    :returns: A list of binary package names or ``None`` if the image is not
+      available
+    """
+    try:
+        with open(os.devnull, 'w') as devnull:
+            if pull:
+                print("Pulling base image '%s'" % image_name)
+                subprocess.call(
+                    ['docker', 'pull', image_name],
+                    stdout=devnull, stderr=subprocess.STDOUT)
+            output = subprocess.check_output(
+                ['docker', 'inspect', '--type=image',
+                 '--format={{ index .Config.Labels "%s" }}' % label,
+                 image_name], stderr=devnull)
+    except (OSError, subprocess.CalledProcessError):
+        print("The base image '%s' is not available" % image_name)
+        return None
+    return output.decode().split()
+
+
+def get_base_image_data(
+        rosdistro_name, os_name, os_code_name, arch, registry=None):
+    """
+    Get the template data describing the base image of a platform.
+
+    The packages needed by many jobs of the platform are part of the image
+    data so that they don't need to be passed in the configuration of every
+    job.
+
+    :returns: A dict with the name of the base image (``None`` if it is not
+      available), the list of its preinstalled packages and the list of the
+      common dependencies
+    """
+    image_name = get_base_image_name(
+        rosdistro_name, os_name, os_code_name, arch, registry=registry)
+    packages = get_base_image_packages(image_name, pull=bool(registry))
+    common_dependencies = []
+    if packages is not None:
+        common_dependencies = get_base_image_packages(
+            image_name, label=BASE_IMAGE_COMMON_DEPENDENCIES_LABEL) or []
+    return {
+        'base_image': image_name if packages is not None else None,
+        'base_image_packages': packages or [],
+        'common_dependencies': common_dependencies,
+    }
+
+
+def select_base_image(base_image, base_image_packages, dependencies):
+    """
+    Select the base image if it only contains needed dependencies.
+
+    Using a base image with additional packages would hide undeclared
+    dependencies.
+
+    :returns: The name of the base image or ``None``
+    """
+    if not base_image:
+        return None
+    additional_packages = set(base_image_packages) - set(dependencies)
+    if additional_packages:
+        print("Not using the base image '%s' since it contains the " %
+              base_image + 'following packages which are not needed: ' +
+              ', '.join(sorted(additional_packages)))
+        return None
+    print("Using the base image '%s'" % base_image)
+    return base_image
@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import print_function
+
 import os
+import shutil
 import subprocess
 import sys
+from tempfile import mkdtemp
 from time import strftime
 import traceback
 
@@ -24,7 +28,8 @@ from ros_buildfarm.release_common import dpkg_parsechangelog
 
 def get_sourcedeb(
         rosdistro_index_url, rosdistro_name, package_name, sourcedeb_dir,
-        skip_download_sourcedeb=False):
+        skip_download_sourcedeb=False, target_repository=None,
+        os_code_name=None, cache_dir=None):
     # ensure that no source subfolder exists
     debian_package_name = get_debian_package_name(rosdistro_name, package_name)
     subfolders = _get_package_subfolders(sourcedeb_dir, debian_package_name)
@@ -45,26 +50,33 @@ def get_sourcedeb(
         repo = dist_file.repositories[pkg.repository_name]
         package_version = repo.release_repository.version
 
-        # get the exact sourcedeb version
-        showsrc_output = subprocess.check_output([
-            'apt-cache', 'showsrc', debian_package_name]).decode()
-        line_prefix = 'Version: '
-        debian_package_versions = [
-            l[len(line_prefix):] for l in showsrc_output.splitlines()
-            if l.startswith(line_prefix + package_version)]
-        assert len(debian_package_versions) == 1, \
-            "Failed to find sourcedeb with version '%s', only found: %s" % \
-            (package_version, ', '.join(debian_package_versions))
-
-        # download sourcedeb
-        apt_script = os.path.join(
-            os.path.dirname(__file__), 'wrapper', 'apt.py')
-        cmd = [
-            sys.executable, apt_script,
-            'source', '--download-only', '--only-source',
-            debian_package_name + '=' + debian_package_versions[0]]
-        print("Invoking '%s'" % ' '.join(cmd))
-        subprocess.check_call(cmd, cwd=sourcedeb_dir)
+        if target_repository and os_code_name:
+            # download the sourcedeb files from the pool of the repository
+            # without updating the apt sources
+            _download_sourcedeb(
+                target_repository, os_code_name, debian_package_name,
+                package_version, sourcedeb_dir, cache_dir)
+        else:
+            # get the exact sourcedeb version
+            showsrc_output = subprocess.check_output([
+                'apt-cache', 'showsrc', debian_package_name]).decode()
+            line_prefix = 'Version: '
+            debian_package_versions = [
+                l[len(line_prefix):] for l in showsrc_output.splitlines()
+                if l.startswith(line_prefix + package_version)]
+            assert len(debian_package_versions) == 1, \
+                "Failed to find sourcedeb with version '%s', only found: %s" \
+                % (package_version, ', '.join(debian_package_versions))
+
+            # download sourcedeb
+            apt_script = os.path.join(
+                os.path.dirname(__file__), 'wrapper', 'apt.py')
+            cmd = [
+                sys.executable, apt_script,
+                'source', '--download-only', '--only-source',
+                debian_package_name + '=' + debian_package_versions[0]]
+            print("Invoking '%s'" % ' '.join(cmd))
+            subprocess.check_call(cmd, cwd=sourcedeb_dir)
 
     # extract sourcedeb
     filenames = _get_package_dsc_filename(sourcedeb_dir, debian_package_name)
@@ -90,6 +102,40 @@ def get_sourcedeb(
               ' '.join(sorted(maintainer_emails)))
 
 
+def _download_sourcedeb(
+        debian_repository_baseurl, os_code_name, debian_package_name,
+        package_version, sourcedeb_dir, cache_dir=None):
+    from ros_buildfarm.debian_repo import DebianRepoDownloadError
+    from ros_buildfarm.debian_repo import download_debian_repo_files
+    from ros_buildfarm.debian_repo import get_debian_repo_source_package
+    tmp_cache_dir = None
+    if not cache_dir:
+        tmp_cache_dir = mkdtemp()
+        cache_dir = tmp_cache_dir
+    try:
+        # a cached index might still list files which have been replaced
+        # in the meantime, in that case refresh the index and retry once
+        for refresh in [False, True]:
+            source_package = get_debian_repo_source_package(
+                debian_repository_baseurl, os_code_name, debian_package_name,
+                package_version, cache_dir, refresh=refresh)
+            print("Found sourcedeb '%s' with version '%s'" %
+                  (debian_package_name, source_package['version']))
+            try:
+                download_debian_repo_files(
+                    debian_repository_baseurl, source_package['directory'],
+                    source_package['files'], sourcedeb_dir)
+            except DebianRepoDownloadError as e:
+                if refresh:
+                    raise
+                print('%s, refreshing the cached index' % e, file=sys.stderr)
+                continue
+            break
+    finally:
+        if tmp_cache_dir:
+            shutil.rmtree(tmp_cache_dir)
+
+
 def append_build_timestamp(rosdistro_name, package_name, sourcedeb_dir):
     # ensure that one source subfolder exists
     debian_package_name = get_debian_package_name(rosdistro_name, package_name)
@@ -0,0 +1,86 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+def get_topological_order(dependencies):
+    """
+    Order packages so that each package comes after its dependencies.
+
+    Dependencies on unknown packages are ignored.
+    In case of circular dependencies the packages of the cycle are ordered
+    arbitrarily but deterministically.
+
+    :param dependencies: A dict mapping package names to an iterable of the
+      names of their dependencies
+    :returns: A list of package names
+    """
+    order = []
+    visited = set([])
+    for root in sorted(dependencies.keys()):
+        if root in visited:
+            continue
+        visited.add(root)
+        # iterative depth first search appending packages in post order
+        stack = [(root, iter(sorted(dependencies[root] or [])))]
+        while stack:
+            pkg_name, dependency_names = stack[-1]
+            for dependency_name in dependency_names:
+                if dependency_name in dependencies and \
+                        dependency_name not in visited:
+                    visited.add(dependency_name)
+                    stack.append((
+                        dependency_name,
+                        iter(sorted(dependencies[dependency_name] or []))))
+                    break
+            else:
+                stack.pop()
+                order.append(pkg_name)
+    return order
+
+
+def get_blocked_packages(dependencies, missing_pkg_names, order=None):
+    """
+    Get the missing packages which are blocked by missing dependencies.
+
+    A missing package is blocked if any of its dependencies is missing.
+    The root causes of a blocked package are the missing packages it
+    (recursively) depends on which are not blocked themselves.
+    They are determined in a single pass over the topological order.
+
+    :param dependencies: A dict mapping package names to an iterable of the
+      names of their dependencies
+    :param missing_pkg_names: A set of the names of the missing packages
+    :param order: The topological order of the packages if already known
+    :returns: A dict mapping the names of the blocked packages to a
+      ``frozenset`` of the names of the root causes
+    """
+    if order is None:
+        order = get_topological_order(dependencies)
+    blocked = {}
+    for pkg_name in order:
+        if pkg_name not in missing_pkg_names:
+            continue
+        root_causes = set([])
+        for dependency_name in dependencies[pkg_name] or []:
+            if dependency_name not in missing_pkg_names:
+                continue
+            if dependency_name in blocked:
+                root_causes.update(blocked[dependency_name])
+            else:
+                root_causes.add(dependency_name)
+        # within a cycle a package is a root cause instead of blocking itself
+        root_causes.discard(pkg_name)
+        if root_causes:
+            blocked[pkg_name] = frozenset(root_causes)
+    return blocked
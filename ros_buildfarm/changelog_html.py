@@ -0,0 +1,170 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import hashlib
+import multiprocessing
+import os
+import re
+import sys
+
+# the default upper bound for the size of the cache directory
+DEFAULT_MAX_CACHE_SIZE = 256 * 1024 * 1024
+
+_SYSTEM_MESSAGE_PATTERN = re.compile(
+    '(' + re.escape('<div class="first system-message">') + '.+?' +
+    re.escape('</div>') + ')', flags=re.DOTALL)
+
+
+def render_changelog_html(rst_code):
+    from docutils.core import publish_string
+    html_code = publish_string(rst_code, writer_name='html')
+    html_code = html_code.decode()
+
+    # strip system message from html output
+    return _SYSTEM_MESSAGE_PATTERN.sub('', html_code)
+
+
+def get_changelog_cache_key(rst_code):
+    """
+    Get the key identifying the rendered html of the rst content.
+
+    Since the generated html depends on the docutils version it is part of
+    the key too.
+    """
+    import docutils
+    h = hashlib.sha256()
+    h.update(docutils.__version__.encode())
+    h.update(b'\0')
+    h.update(rst_code.encode())
+    return h.hexdigest()
+
+
+class ChangelogHtmlCache(object):
+    """
+    A persistent cache of rendered changelogs.
+
+    Each entry is stored in a separate file named after its key.
+    The modification time of the files is updated on every hit and is used
+    to evict the least recently used entries when the cache exceeds its size.
+    """
+
+    def __init__(self, path, max_size=DEFAULT_MAX_CACHE_SIZE):
+        self.path = path
+        self.max_size = max_size
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+    def _get_filename(self, key):
+        return os.path.join(self.path, '%s.html' % key)
+
+    def get(self, key):
+        filename = self._get_filename(key)
+        try:
+            with open(filename, 'r') as h:
+                html_code = h.read()
+        except (IOError, OSError):
+            return None
+        try:
+            os.utime(filename, None)
+        except OSError:
+            pass
+        return html_code
+
+    def set(self, key, html_code):
+        filename = self._get_filename(key)
+        # write atomically since other jobs might share the cache directory
+        tmp_filename = '%s.%d' % (filename, os.getpid())
+        with open(tmp_filename, 'w') as h:
+            h.write(html_code)
+        os.rename(tmp_filename, filename)
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        for filename in os.listdir(self.path):
+            if not filename.endswith('.html'):
+                continue
+            filepath = os.path.join(self.path, filename)
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filepath))
+            total_size += stat.st_size
+
+        evicted = 0
+        for _, size, filepath in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            total_size -= size
+            evicted += 1
+        return evicted
+
+
+def get_changelog_htmls(rst_codes, cache=None, jobs=None):
+    """
+    Render the rst code of multiple changelogs to html.
+
+    :param rst_codes: A dict mapping package names to the rst code
+    :param cache: An optional ``ChangelogHtmlCache``
+    :param jobs: The number of processes to render cache misses in parallel
+    :returns: A dict mapping package names to the html code
+    """
+    html_codes = {}
+    misses = {}
+    for pkg_name, rst_code in rst_codes.items():
+        key = get_changelog_cache_key(rst_code)
+        html_code = cache.get(key) if cache else None
+        if html_code is not None:
+            html_codes[pkg_name] = html_code
+        else:
+            misses[pkg_name] = (key, rst_code)
+    if cache:
+        print('Changelog cache: %d hits, %d misses' %
+              (len(html_codes), len(misses)))
+
+    pkg_names = sorted(misses.keys())
+    rst_codes_to_render = [misses[pkg_name][1] for pkg_name in pkg_names]
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    if jobs > 1 and len(rst_codes_to_render) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(rst_codes_to_render)))
+        try:
+            rendered = pool.map(render_changelog_html, rst_codes_to_render)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        rendered = [render_changelog_html(c) for c in rst_codes_to_render]
+
+    for pkg_name, html_code in zip(pkg_names, rendered):
+        html_codes[pkg_name] = html_code
+        if cache:
+            try:
+                cache.set(misses[pkg_name][0], html_code)
+            except (IOError, OSError) as e:
+                print("Failed to cache the changelog of package '%s': %s" %
+                      (pkg_name, e), file=sys.stderr)
+
+    if cache and misses:
+        evicted = cache.evict()
+        if evicted:
+            print('Evicted %d entries from the changelog cache' % evicted)
+    return html_codes
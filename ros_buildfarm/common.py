@@ -12,14 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import print_function
+
 from collections import namedtuple
 import os
 import platform
+import sys
 try:
     from urllib.parse import urlparse
 except ImportError:
     from urlparse import urlparse
 
+from ros_buildfarm.timing import format_duration
+from ros_buildfarm.timing import get_resource_usage
+from ros_buildfarm.timing import PeakRssMeasurement
+from ros_buildfarm.timing import TIMING_FILE_ENVIRONMENT_VARIABLE
+from ros_buildfarm.timing import write_timing_record
+
 
 class JobValidationError(Exception):
     """
@@ -35,16 +44,54 @@ class JobValidationError(Exception):
 
 
 class Scope(object):
+    """
+    A section of the console output.
+
+    The wall time of the section is printed in the END line.
+    If the environment variable ``ROS_BUILDFARM_TIMING_FILE`` is set a JSON
+    record with the wall time, CPU time and peak memory usage of the section
+    is appended to that file.
+    The optional phase groups sections with varying descriptions.
+    """
 
-    def __init__(self, scope_name, description):
+    def __init__(self, scope_name, description, phase=None):
         self.scope_name = scope_name
         self.description = description
+        self.phase = phase or description
+        self._start = None
+        self._peak_rss = None
 
     def __enter__(self):
         print('# BEGIN %s: %s' % (self.scope_name, self.description))
+        self._start = get_resource_usage()
+        self._peak_rss = PeakRssMeasurement()
 
     def __exit__(self, type, value, traceback):
-        print('# END %s' % self.scope_name)
+        end = get_resource_usage()
+        peak_rss_kib = self._peak_rss.stop()
+        wall_time = end['wall_time'] - self._start['wall_time']
+        print('# END %s (%s)' % (self.scope_name, format_duration(wall_time)))
+
+        filename = os.environ.get(TIMING_FILE_ENVIRONMENT_VARIABLE)
+        if filename:
+            record = {
+                'script': os.path.basename(sys.argv[0]),
+                'job_name': os.environ.get('JOB_NAME'),
+                'build_number': os.environ.get('BUILD_NUMBER'),
+                'scope': self.scope_name,
+                'description': self.description,
+                'phase': self.phase,
+                'start': self._start['wall_time'],
+                'wall_time': wall_time,
+                'cpu_time': end['cpu_time'] - self._start['cpu_time'],
+                'failed': type is not None,
+            }
+            # without resetting the peak it covers the whole process
+            if self._peak_rss.resettable:
+                record['peak_rss_kib'] = peak_rss_kib
+            else:
+                record['process_peak_rss_kib'] = peak_rss_kib
+            write_timing_record(filename, record)
 
 
 Target = namedtuple('Target', 'os_name os_code_name arch')
@@ -139,10 +186,64 @@ def get_distribution_repository_keys(urls, key_files):
 
 
 def get_binary_package_versions(apt_cache, debian_pkg_names):
+    versions, missing = lookup_binary_package_versions(
+        apt_cache, debian_pkg_names)
+    if missing:
+        raise KeyError(missing[0])
+    return versions
+
+
+def lookup_binary_package_versions(apt_cache, debian_pkg_names):
+    """
+    Look up the versions of multiple binary packages in a single pass.
+
+    :param apt_cache: Either an ``apt.Cache`` instance or a dict mapping
+      binary package names to versions as returned by
+      ``load_binary_package_versions``
+    :param debian_pkg_names: The binary package names to look up
+    :returns: A tuple containing a dict mapping the found binary package
+      names to their versions and a list of the names which are not available
+    """
     versions = {}
+    missing = []
+    snapshot = isinstance(apt_cache, dict)
     for debian_pkg_name in debian_pkg_names:
-        pkg = apt_cache[debian_pkg_name]
-        versions[debian_pkg_name] = max(pkg.versions).version
+        if snapshot:
+            version = apt_cache.get(debian_pkg_name)
+        else:
+            try:
+                pkg = apt_cache[debian_pkg_name]
+            except KeyError:
+                version = None
+            else:
+                version = max(pkg.versions).version if pkg.versions else None
+        if version is None:
+            missing.append(debian_pkg_name)
+        else:
+            versions[debian_pkg_name] = version
+    return versions, missing
+
+
+def get_binary_package_versions_source(snapshot_file=None):
+    """
+    Get the source to look up binary package versions in.
+
+    Loading the apt cache is expensive, therefore a snapshot file is used
+    instead if it has been passed.
+    """
+    if snapshot_file:
+        print("Using the binary package versions from '%s'" % snapshot_file)
+        return load_binary_package_versions(snapshot_file)
+    from apt import Cache
+    return Cache()
+
+
+def load_binary_package_versions(snapshot_file):
+    versions = {}
+    with open(snapshot_file, 'r') as h:
+        for line in h:
+            name, version = line.split()
+            versions[name] = version
     return versions
 
 
@@ -355,6 +456,8 @@ def get_doc_job_url(
 def get_devel_job_urls(
         jenkins_url, source_build_files, rosdistro_name, repository_name):
     urls = []
+    # track the already added urls in a set to avoid quadratic lookups
+    seen_urls = set([])
     for source_build_name in sorted(source_build_files.keys()):
         build_file = source_build_files[source_build_name]
         for os_name in sorted(build_file.targets.keys()):
@@ -367,7 +470,8 @@ def get_devel_job_urls(
                             rosdistro_name, source_build_name, repository_name,
                             os_name, os_code_name, arch)
                     )
-                    if job_url not in urls:
+                    if job_url not in seen_urls:
+                        seen_urls.add(job_url)
                         urls.append(job_url)
     return urls
 
@@ -375,6 +479,8 @@ def get_devel_job_urls(
 def get_release_job_urls(
         jenkins_url, release_build_files, rosdistro_name, package_name):
     urls = []
+    # track the already added urls in a set to avoid quadratic lookups
+    seen_urls = set([])
     # first add all source jobs
     for release_build_name in sorted(release_build_files.keys()):
         build_file = release_build_files[release_build_name]
@@ -388,7 +494,8 @@ def get_release_job_urls(
                         rosdistro_name, release_build_name,
                         package_name, os_name, os_code_name)
                 )
-                if job_url not in urls:
+                if job_url not in seen_urls:
+                    seen_urls.add(job_url)
                     urls.append(job_url)
 
     # then add all binary jobs
@@ -406,7 +513,8 @@ def get_release_job_urls(
                             rosdistro_name, release_build_name,
                             package_name, os_name, os_code_name, arch)
                     )
-                    if job_url not in urls:
+                    if job_url not in seen_urls:
+                        seen_urls.add(job_url)
                         urls.append(job_url)
     return urls
 
@@ -422,6 +530,8 @@ def write_groovy_script_and_configs(
     This writes the reconfigure script to the file location
     and places the expanded configs in subdirectories 'view_configs' /
     'job_configs' that the script can then access when run.
+    If ``job_configs`` is ``None`` the job configs have already been written
+    by a ``JobConfigWriter``.
     """
     with open(filename, 'w') as h:
         h.write(content)
@@ -435,19 +545,51 @@ def write_groovy_script_and_configs(
             with open(config_filename, 'w') as config_fh:
                 config_fh.write(config_body)
 
-    job_config_dir = os.path.join(os.path.dirname(filename), 'job_configs')
-    if not os.path.isdir(job_config_dir):
-        os.makedirs(job_config_dir)
-    # prefix each config file with a serial number to maintain order
-    format_str = '%0' + str(len(str(len(job_configs)))) + 'd'
-    i = 0
-    for config_name, config_body in job_configs.items():
-        i += 1
-        config_filename = os.path.join(
-            job_config_dir,
-            format_str % i + ' ' + config_name)
-        with open(config_filename, 'w') as config_fh:
-            config_fh.write(config_body)
+    if job_configs is not None:
+        writer = JobConfigWriter(filename)
+        for config_name, config_body in job_configs.items():
+            writer.write(config_name, config_body)
+        writer.close()
+
+
+class JobConfigWriter(object):
+    """
+    Write the job configs for a groovy script as soon as they are generated.
+
+    The configs are placed in the subdirectory 'job_configs' next to the
+    groovy script.
+    Only the names of the written configs are kept in memory.
+    """
+
+    def __init__(self, groovy_script):
+        self.job_config_dir = os.path.join(
+            os.path.dirname(groovy_script), 'job_configs')
+        if not os.path.isdir(self.job_config_dir):
+            os.makedirs(self.job_config_dir)
+        self.job_names = []
+
+    def __len__(self):
+        return len(self.job_names)
+
+    def write(self, job_name, job_config):
+        self.job_names.append(job_name)
+        with open(self._get_filename(len(self.job_names), job_name), 'w') as h:
+            h.write(job_config)
+
+    def close(self):
+        # prefix each config file with a serial number to maintain order
+        # which needs to be zero padded to the width of the final count
+        for i, job_name in enumerate(self.job_names, 1):
+            os.rename(
+                self._get_filename(i, job_name),
+                self._get_filename(i, job_name, len(self.job_names)))
+
+    def _get_filename(self, i, job_name, count=None):
+        if count is None:
+            # the final width is unknown while writing
+            return os.path.join(self.job_config_dir, '.%d %s' % (i, job_name))
+        format_str = '%0' + str(len(str(count))) + 'd'
+        return os.path.join(self.job_config_dir, format_str % i + ' ' + job_name)
 
 
 def topological_order_packages(packages):
@@ -485,6 +627,26 @@ def topological_order_packages(packages):
     return ordered_pkg_tuples
 
 
+def get_release_dependency_names(pkg):
+    """
+    Get the names of the dependencies of a package relevant for its jobs.
+
+    The binary job of a package is triggered by the binary jobs of these
+    dependencies.
+
+    :param pkg: A ``Package`` object
+    :returns: A set of package names
+    """
+    return set([
+        d.name for d in (
+            pkg.buildtool_depends +
+            pkg.build_depends +
+            pkg.buildtool_export_depends +
+            pkg.build_export_depends +
+            pkg.exec_depends +
+            pkg.test_depends)])
+
+
 def get_node_label(config_job_label, default_label=None):
     if config_job_label is not None:
         return config_job_label
@@ -87,6 +87,11 @@ class Index(object):
                 for key in unset_keys:
                     self.distributions[distro_name][key] = value_types[key]()
 
+        self.base_image_registry = ''
+        if 'base_image_registry' in data:
+            self.base_image_registry = data['base_image_registry']
+            assert isinstance(self.base_image_registry, str)
+
         self.doc_builds = {}
         if 'doc_builds' in data and data['doc_builds']:
             assert isinstance(data['doc_builds'], dict)
@@ -14,6 +14,9 @@
 
 from gzip import GzipFile
 import hashlib
+from http.client import HTTPConnection
+from http.client import HTTPException
+from http.client import HTTPSConnection
 from io import BytesIO
 import logging
 import os
@@ -21,6 +24,8 @@ import socket
 import time
 from urllib.error import HTTPError
 from urllib.error import URLError
+from urllib.parse import quote
+from urllib.parse import urlparse
 from urllib.request import urlopen
 
 
@@ -34,24 +39,51 @@ def get_debian_repo_data(debian_repository_baseurl, targets, cache_dir):
 
 
 def get_debian_repo_index(debian_repository_baseurl, target, cache_dir):
-    url = os.path.join(
-        debian_repository_baseurl, 'dists', target.os_code_name, 'main')
-    if target.arch == 'source':
-        url = os.path.join(url, 'source', 'Sources.gz')
-    else:
-        url = os.path.join(url, 'binary-%s' % target.arch, 'Packages.gz')
+    url = _get_debian_repo_index_url(
+        debian_repository_baseurl, target.os_code_name, target.arch)
+    return _get_package_versions(_get_debian_repo_index_blocks(url, cache_dir))
 
-    cache_filename = os.path.join(
-        cache_dir, hashlib.md5(url.encode()).hexdigest())
-    if not os.path.exists(cache_filename):
-        fetch_gzip_url(url, cache_filename)
 
-    logging.debug('Reading file: %s' % cache_filename)
-    # split package blocks
-    with open(cache_filename, 'rb') as f:
-        blocks = f.read().decode('utf8').split('\n\n')
-    blocks = [b.splitlines() for b in blocks if b]
+class DebianRepoIndexStore(object):
+    """
+    Keep the parsed repository indices in memory.
+
+    Multiple pages generated in the same process can share a store so that
+    every index is only fetched and parsed once.
+    The returned dicts are shared and must not be modified.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._package_versions = {}
+
+    def __len__(self):
+        return len(self._package_versions)
 
+    def load(self, repository_baseurls_and_targets):
+        """Load all indices of the passed (repository url, target) tuples."""
+        for debian_repository_baseurl, target in \
+                sorted(repository_baseurls_and_targets):
+            self.get_debian_repo_index(debian_repository_baseurl, target)
+
+    def get_debian_repo_data(self, debian_repository_baseurl, targets):
+        data = {}
+        for target in targets:
+            data[target] = self.get_debian_repo_index(
+                debian_repository_baseurl, target)
+        return data
+
+    def get_debian_repo_index(self, debian_repository_baseurl, target):
+        # the index only depends on the url, not e.g. the OS name
+        url = _get_debian_repo_index_url(
+            debian_repository_baseurl, target.os_code_name, target.arch)
+        if url not in self._package_versions:
+            self._package_versions[url] = _get_package_versions(
+                _get_debian_repo_index_blocks(url, self.cache_dir))
+        return self._package_versions[url]
+
+
+def _get_package_versions(blocks):
     # extract version number of every package
     package_versions = {}
     for lines in blocks:
@@ -68,6 +100,156 @@ def get_debian_repo_index(debian_repository_baseurl, target, cache_dir):
     return package_versions
 
 
+def _get_debian_repo_index_url(debian_repository_baseurl, os_code_name, arch):
+    url = os.path.join(
+        debian_repository_baseurl, 'dists', os_code_name, 'main')
+    if arch == 'source':
+        return os.path.join(url, 'source', 'Sources.gz')
+    return os.path.join(url, 'binary-%s' % arch, 'Packages.gz')
+
+
+def _get_debian_repo_index_blocks(url, cache_dir, refresh=False):
+    cache_filename = os.path.join(
+        cache_dir, hashlib.md5(url.encode()).hexdigest())
+    if refresh or not os.path.exists(cache_filename):
+        fetch_gzip_url(url, cache_filename)
+
+    logging.debug('Reading file: %s' % cache_filename)
+    # split package blocks
+    with open(cache_filename, 'rb') as f:
+        blocks = f.read().decode('utf8').split('\n\n')
+    return [b.splitlines() for b in blocks if b]
+
+
+def get_debian_repo_source_package(
+        debian_repository_baseurl, os_code_name, debian_pkg_name,
+        version_prefix, cache_dir, refresh=False):
+    """
+    Look up a source package in the Sources index of a repository.
+
+    :param refresh: Fetch the index even if it is already cached
+    :returns: A dict with the exact version, the pool directory and a list
+      of (filename, size, checksum type, checksum) tuples of the files
+      belonging to the source package
+    """
+    url = _get_debian_repo_index_url(
+        debian_repository_baseurl, os_code_name, 'source')
+    cache_filename = os.path.join(
+        cache_dir, hashlib.md5(url.encode()).hexdigest())
+    # refresh a cached index if it does not contain the package version
+    refresh_options = [refresh]
+    if not refresh and os.path.exists(cache_filename):
+        refresh_options.append(True)
+    for refresh in refresh_options:
+        blocks = _get_debian_repo_index_blocks(url, cache_dir, refresh=refresh)
+        source_packages = []
+        for lines in blocks:
+            fields = _parse_control_block(lines)
+            if fields.get('Package') != debian_pkg_name:
+                continue
+            if not fields.get('Version', '').startswith(version_prefix):
+                continue
+            source_packages.append(fields)
+        if source_packages:
+            break
+    assert len(source_packages) == 1, \
+        "Failed to find sourcedeb with version '%s', only found: %s" % \
+        (version_prefix, ', '.join(p['Version'] for p in source_packages))
+    fields = source_packages[0]
+
+    files = []
+    if 'Checksums-Sha256' in fields:
+        checksum_type, value = 'sha256', fields['Checksums-Sha256']
+    else:
+        checksum_type, value = 'md5', fields['Files']
+    for line in value.splitlines():
+        if not line.strip():
+            continue
+        checksum, size, filename = line.split()
+        files.append((filename, int(size), checksum_type, checksum))
+    return {
+        'version': fields['Version'],
+        'directory': fields['Directory'],
+        'files': files,
+    }
+
+
+def _parse_control_block(lines):
+    fields = {}
+    name = None
+    for line in lines:
+        if line.startswith((' ', '\t')) and name is not None:
+            # continuation of a multiline field
+            fields[name] += '\n' + line.strip()
+            continue
+        name, _, value = line.partition(':')
+        fields[name] = value.strip()
+    return fields
+
+
+class DebianRepoDownloadError(RuntimeError):
+    """Indicates that a file does not match the index or is unavailable."""
+
+
+def download_debian_repo_files(
+        debian_repository_baseurl, directory, files, dst_dirname,
+        retry=2, retry_period=1):
+    """
+    Download files from the pool of a repository and verify their checksums.
+
+    All files are requested over the same connection.
+    If the connection fails (e.g. since the server closed the idle
+    connection) it is reopened and the request is retried.
+
+    :param files: A list of (filename, size, checksum type, checksum) tuples
+    :param retry: The number of times a failed request is retried
+    """
+    baseurl = urlparse(debian_repository_baseurl)
+    connection_class = HTTPSConnection \
+        if baseurl.scheme == 'https' else HTTPConnection
+    connection = connection_class(baseurl.netloc, timeout=30)
+    try:
+        for filename, size, checksum_type, checksum in files:
+            path = '/'.join([
+                baseurl.path.rstrip('/'), directory, quote(filename)])
+            print("Downloading '%s://%s%s'" %
+                  (baseurl.scheme, baseurl.netloc, path))
+            retries_left = retry
+            while True:
+                try:
+                    connection.request('GET', path)
+                    response = connection.getresponse()
+                    content = response.read()
+                except (HTTPException, OSError) as e:
+                    if not retries_left:
+                        raise
+                    print("Request of '%s' failed (%s), reconnecting" %
+                          (filename, e))
+                else:
+                    if response.status != 503 or not retries_left:
+                        break
+                    print("Request of '%s' failed (%d %s), retrying" %
+                          (filename, response.status, response.reason))
+                retries_left -= 1
+                connection.close()
+                time.sleep(retry_period)
+                connection = connection_class(baseurl.netloc, timeout=30)
+            if response.status != 200:
+                raise DebianRepoDownloadError(
+                    "Failed to download '%s': %d %s" %
+                    (filename, response.status, response.reason))
+            if len(content) != size or \
+                    hashlib.new(checksum_type, content).hexdigest() != \
+                    checksum:
+                raise DebianRepoDownloadError(
+                    "The downloaded file '%s' does not match the size or " %
+                    filename + '%s checksum from the index' % checksum_type)
+            with open(os.path.join(dst_dirname, filename), 'wb') as f:
+                f.write(content)
+    finally:
+        connection.close()
+
+
 def fetch_gzip_url(url, dst_filename):
     dst_dirname = os.path.dirname(dst_filename)
     if not os.path.exists(dst_dirname):
@@ -76,8 +258,11 @@ def fetch_gzip_url(url, dst_filename):
     gz_str = load_url(url)
     gz_stream = BytesIO(gz_str)
     g = GzipFile(fileobj=gz_stream, mode='rb')
-    with open(dst_filename, 'wb') as f:
+    # replace the file atomically since the cache might be shared
+    tmp_filename = '%s.%d' % (dst_filename, os.getpid())
+    with open(tmp_filename, 'wb') as f:
         f.write(g.read())
+    os.rename(tmp_filename, dst_filename)
 
 
 def load_url(url, retry=2, retry_period=1, timeout=10):
@@ -0,0 +1,149 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import lru_cache
+from functools import total_ordering
+import re
+import string
+
+# alternating sequences of non-digits and digits
+_PART_REGEX = re.compile(r'([^0-9]*)([0-9]*)')
+
+# the key of the end of a version part which is equal to an empty
+# non-digit sequence followed by the number zero
+_END_OF_PART = ((0, ), 0)
+
+
+@total_ordering
+class DebianVersion(object):
+    """
+    A Debian version which compares like ``dpkg --compare-versions``.
+
+    The version string is parsed once into a key which can be compared
+    cheaply.
+    Instances should be created using ``get_debian_version`` which reuses
+    instances for repeated version strings.
+    Invalid version strings are compared on a best effort basis rather than
+    being rejected.
+    """
+
+    __slots__ = ('version', 'epoch', 'upstream_version', 'debian_revision',
+                 'key')
+
+    def __init__(self, version):
+        self.version = version
+        self.epoch = 0
+        upstream_version = version
+        epoch, sep, rest = version.partition(':')
+        if sep and epoch.isdigit():
+            self.epoch = int(epoch)
+            upstream_version = rest
+        upstream_version, sep, debian_revision = \
+            upstream_version.rpartition('-')
+        if not sep:
+            upstream_version, debian_revision = debian_revision, ''
+        self.upstream_version = upstream_version
+        self.debian_revision = debian_revision
+        if not version:
+            # like dpkg an empty version is lower than any other version
+            self.key = (-1, (), ())
+        else:
+            self.key = (
+                self.epoch, _get_part_key(upstream_version),
+                _get_part_key(debian_revision))
+
+    def __eq__(self, other):
+        if not isinstance(other, DebianVersion):
+            return NotImplemented
+        return self.key == other.key
+
+    def __ne__(self, other):
+        if not isinstance(other, DebianVersion):
+            return NotImplemented
+        return self.key != other.key
+
+    def __lt__(self, other):
+        if not isinstance(other, DebianVersion):
+            return NotImplemented
+        return self.key < other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __str__(self):
+        return self.version
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.version)
+
+
+@lru_cache(maxsize=65536)
+def get_debian_version(version):
+    """
+    Get the ``DebianVersion`` for a version string.
+
+    The status pages compare the same version strings many times, therefore
+    the most recently used instances are cached.
+    """
+    return DebianVersion(version)
+
+
+def debian_version_key(version):
+    """Sort key for version strings (e.g. ``sorted(versions, key=...)``)."""
+    return get_debian_version(version).key
+
+
+def compare_debian_versions(version, other_version):
+    """
+    Compare two version strings.
+
+    :returns: a negative value, zero or a positive value if the first version
+      is lower than, equal to or higher than the second version
+    """
+    key = get_debian_version(version).key
+    other_key = get_debian_version(other_version).key
+    return (key > other_key) - (key < other_key)
+
+
+def _get_char_order(c):
+    # same order as in dpkg: the tilde sorts before anything (even the end
+    # of the part), letters sort before all other characters
+    if c == '~':
+        return -1
+    if c in string.ascii_letters:
+        return ord(c)
+    return ord(c) + 256
+
+
+def _get_part_key(part):
+    key = []
+    for non_digits, digits in _PART_REGEX.findall(part):
+        if not non_digits and not digits:
+            continue
+        key.append((
+            tuple(_get_char_order(c) for c in non_digits) + (0, ),
+            int(digits) if digits else 0))
+    # trailing parts which compare equal to the end of the part are dropped,
+    # e.g. the revision '0' is equal to no revision
+    while key and key[-1] == _END_OF_PART:
+        key.pop()
+    # every part is terminated by the end marker so that a longer part is
+    # compared against it exactly like dpkg compares against the end of a
+    # string which makes the length of the key irrelevant
+    # only the first element can be equal to the end marker (if the part
+    # starts with zero) so the terminator must be at least the second element
+    key.append(_END_OF_PART)
+    if len(key) < 2:
+        key.append(_END_OF_PART)
+    return tuple(key)
@@ -0,0 +1,150 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import Counter
+
+from catkin_pkg.package import parse_package_string
+
+# the maximum number of dependencies in the common tier
+DEFAULT_MAX_COMMON_DEPENDENCIES = 40
+# the minimum ratio of jobs needing a dependency for it to be common
+DEFAULT_MIN_COMMON_RATIO = 0.1
+# the minimum ratio of jobs needing all dependencies of the common core
+DEFAULT_MIN_CORE_RATIO = 0.5
+
+
+def get_common_dependencies(
+        dependency_names_per_job,
+        max_count=DEFAULT_MAX_COMMON_DEPENDENCIES,
+        min_ratio=DEFAULT_MIN_COMMON_RATIO):
+    """
+    Get the dependencies shared by many jobs.
+
+    :param dependency_names_per_job: An iterable of dependency names for
+      every job
+    :returns: A list of dependency names ordered by descending frequency
+    """
+    frequencies = Counter()
+    job_count = 0
+    for dependency_names in dependency_names_per_job:
+        frequencies.update(set(dependency_names))
+        job_count += 1
+    min_count = max(2, min_ratio * job_count)
+    candidates = [
+        (-count, name) for name, count in frequencies.items()
+        if count >= min_count]
+    return [name for _, name in sorted(candidates)[:max_count]]
+
+
+def get_common_core(
+        dependency_names_per_job,
+        max_count=None,
+        min_ratio=DEFAULT_MIN_CORE_RATIO):
+    """
+    Get a set of dependencies which is needed entirely by many jobs.
+
+    In contrast to the common dependencies every job either needs all or
+    none of the core dependencies.
+    Starting with the most frequent dependency, dependencies are added as
+    long as at least the minimum ratio of jobs still needs all of them.
+
+    :param dependency_names_per_job: An iterable of dependency names for
+      every job
+    :returns: A list of dependency names ordered by descending frequency
+    """
+    jobs = [set(dependency_names) for dependency_names in
+            dependency_names_per_job]
+    frequencies = Counter()
+    for dependency_names in jobs:
+        frequencies.update(dependency_names)
+    min_count = max(1, min_ratio * len(jobs))
+    core = []
+    covered_jobs = jobs
+    for _, name in sorted(
+            [(-count, name) for name, count in frequencies.items()]):
+        if max_count is not None and len(core) >= max_count:
+            break
+        if frequencies[name] < min_count:
+            break
+        remaining_jobs = [
+            dependency_names for dependency_names in covered_jobs
+            if name in dependency_names]
+        if len(remaining_jobs) < min_count:
+            continue
+        core.append(name)
+        covered_jobs = remaining_jobs
+    return core
+
+
+def get_release_dependency_names(
+        dist_cache, pkg_names, get_dependencies_callback):
+    """
+    Get the dependency names of released packages from the distribution cache.
+
+    :param get_dependencies_callback: A function returning a list of
+      dependencies for a parsed package
+    :returns: A set of dependency names
+    """
+    depend_names = set([])
+    for pkg_name in pkg_names:
+        pkg_xml = dist_cache.release_package_xmls.get(pkg_name)
+        if not pkg_xml:
+            continue
+        pkg = parse_package_string(pkg_xml)
+        depend_names.update(
+            [d.name for d in get_dependencies_callback(pkg)])
+    return depend_names - set(pkg_names)
+
+
+def get_repository_dependency_names(
+        dist_cache, repo_names, get_dependencies_callback):
+    """
+    Get the dependency names of the released packages of each repository.
+
+    :returns: A list with a set of dependency names for every repository
+    """
+    repositories = dist_cache.distribution_file.repositories
+    dependency_names_per_repo = []
+    for repo_name in sorted(repo_names):
+        repo = repositories.get(repo_name)
+        if not repo or not repo.release_repository:
+            continue
+        dependency_names_per_repo.append(get_release_dependency_names(
+            dist_cache, repo.release_repository.package_names,
+            get_dependencies_callback))
+    return dependency_names_per_repo
+
+
+def order_dependencies_in_tiers(names, common_names):
+    """
+    Order dependencies with the common ones first.
+
+    Each dependency is installed in a separate Docker layer (as long as the
+    layer limit is not exceeded).
+    Installing the common dependencies first in a stable order lets jobs on
+    the same node share these layers.
+    The common tier keeps the order of the passed common names and only
+    contains the dependencies actually needed.
+    Installing additional packages would hide undeclared dependencies.
+
+    :returns: A tuple containing the ordered list of names and the number of
+      names in the common tier
+    """
+    names = set(names)
+    common_tier = []
+    for name in common_names:
+        if name in names and name not in common_tier:
+            common_tier.append(name)
+    ordered_names = common_tier + sorted(names - set(common_tier))
+    return ordered_names, len(common_tier)
@@ -378,6 +378,7 @@ def _get_devel_job_config(
         'os_code_name': os_code_name,
         'arch': arch,
         'repository_args': repository_args,
+        'base_image_registry': config.base_image_registry,
 
         'notify_compiler_warnings': build_file.notify_compiler_warnings,
         'notify_emails': build_file.notify_emails,
@@ -306,6 +306,7 @@ def _get_doc_job_config(
         'os_code_name': os_code_name,
         'arch': arch,
         'repository_args': repository_args,
+        'base_image_registry': config.base_image_registry,
 
         'upload_user': build_file.upload_user,
         'upload_host': build_file.upload_host,
@@ -0,0 +1,176 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import time
+
+# the maximum total size of all mirrors in bytes
+DEFAULT_MAX_CACHE_SIZE = 10 * 1024 * 1024 * 1024
+# the maximum time in seconds since a mirror has been used last
+DEFAULT_MAX_CACHE_AGE = 30 * 24 * 60 * 60
+
+
+class GitMirrorCache(object):
+    """
+    A node-local cache of bare mirrors of remote git repositories.
+
+    Each mirror is updated incrementally before it is being used.
+    Concurrent jobs are synchronized with a lock file per mirror: updating
+    or evicting a mirror requires an exclusive lock, cloning from it a
+    shared lock.
+    Mirrors which have not been used for a long time or exceed the maximum
+    size of the cache (least recently used first) are evicted.
+    """
+
+    def __init__(
+            self, path, max_size=DEFAULT_MAX_CACHE_SIZE,
+            max_age=DEFAULT_MAX_CACHE_AGE):
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+    def _get_mirror_path(self, url):
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', url.rstrip('/').split('/')[-1])
+        url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return os.path.join(self.path, '%s_%s' % (name, url_hash))
+
+    @contextmanager
+    def _lock(self, mirror_path, exclusive, blocking=True):
+        with open(mirror_path + '.lock', 'a') as h:
+            flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            fcntl.flock(h, flags)
+            try:
+                yield h
+            finally:
+                fcntl.flock(h, fcntl.LOCK_UN)
+
+    def update(self, url):
+        """
+        Create or update the mirror of a repository.
+
+        :returns: The path of the bare mirror
+        """
+        mirror_path = self._get_mirror_path(url)
+        with self._lock(mirror_path, exclusive=True):
+            self._update(url, mirror_path)
+        return mirror_path
+
+    def _update(self, url, mirror_path):
+        # the caller must hold the exclusive lock of the mirror
+        if os.path.exists(mirror_path):
+            cmd = ['git', 'remote', 'update', '--prune']
+            print("Invoking '%s' in '%s'" % (' '.join(cmd), mirror_path))
+            subprocess.check_call(cmd, cwd=mirror_path)
+        else:
+            tmp_path = '%s.%d' % (mirror_path, os.getpid())
+            cmd = ['git', 'clone', '--mirror', url, tmp_path]
+            print("Invoking '%s'" % ' '.join(cmd))
+            try:
+                subprocess.check_call(cmd)
+            except subprocess.CalledProcessError:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+            os.rename(tmp_path, mirror_path)
+        # remember the size to evict mirrors without traversing them
+        # (the modification time marks the mirror as recently used)
+        with open(mirror_path + '.size', 'w') as h:
+            h.write('%d' % _get_directory_size(mirror_path))
+
+    def clone(self, url, branch, dest, depth=None):
+        """
+        Clone a branch or tag of a repository from its local mirror.
+
+        All branches and tags are available in the clone but the objects are
+        copied from the mirror and only the history up to the passed depth
+        is included.
+        The remote ``origin`` of the clone points to the passed url.
+        """
+        mirror_path = self._get_mirror_path(url)
+        while True:
+            with self._lock(mirror_path, exclusive=True) as h:
+                self._update(url, mirror_path)
+                # keep holding the lock while cloning so that the mirror
+                # can't be evicted, a shared lock lets other jobs clone
+                # concurrently
+                fcntl.flock(h, fcntl.LOCK_SH)
+                # converting the lock isn't atomic, the mirror might have
+                # been evicted in between
+                if not os.path.exists(mirror_path):
+                    continue
+                cmd = ['git', 'clone', '--branch', branch, '--no-single-branch']
+                if depth:
+                    cmd += ['--depth', str(depth)]
+                # the file:// protocol is necessary for shallow local clones
+                cmd += ['file://' + os.path.abspath(mirror_path), dest]
+                print("Invoking '%s'" % ' '.join(cmd))
+                subprocess.check_call(cmd)
+                break
+        cmd = ['git', 'remote', 'set-url', 'origin', url]
+        subprocess.check_call(cmd, cwd=dest)
+
+    def evict(self):
+        """Remove mirrors which are too old or exceed the cache size."""
+        mirrors = []
+        for filename in os.listdir(self.path):
+            if not filename.endswith('.size'):
+                continue
+            mirror_path = os.path.join(self.path, filename[:-len('.size')])
+            try:
+                with open(mirror_path + '.size', 'r') as h:
+                    size = int(h.read())
+                last_used = os.path.getmtime(mirror_path + '.size')
+            except (IOError, OSError, ValueError):
+                continue
+            mirrors.append((last_used, size, mirror_path))
+
+        # least recently used first
+        mirrors.sort()
+        total_size = sum(size for _, size, _ in mirrors)
+        now = time.time()
+        for last_used, size, mirror_path in mirrors:
+            if now - last_used <= self.max_age and \
+                    total_size <= self.max_size:
+                break
+            try:
+                with self._lock(mirror_path, exclusive=True, blocking=False):
+                    print("Evicting git mirror '%s'" % mirror_path)
+                    os.remove(mirror_path + '.size')
+                    shutil.rmtree(mirror_path, ignore_errors=True)
+            except (IOError, OSError):
+                # skip mirrors which are currently being used
+                continue
+            total_size -= size
+
+
+def _get_directory_size(path):
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return size
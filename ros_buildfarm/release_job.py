@@ -14,7 +14,6 @@
 
 from __future__ import print_function
 
-from collections import OrderedDict
 import sys
 
 from rosdistro import get_distribution_cache
@@ -26,6 +25,7 @@ from ros_buildfarm.common import get_default_node_label
 from ros_buildfarm.common import get_github_project_url
 from ros_buildfarm.common import get_node_label
 from ros_buildfarm.common import get_release_binary_view_name
+from ros_buildfarm.common import get_release_dependency_names
 from ros_buildfarm.common import get_release_job_prefix
 from ros_buildfarm.common import get_release_source_view_name
 from ros_buildfarm.common import get_release_view_name
@@ -33,6 +33,7 @@ from ros_buildfarm.common \
     import get_repositories_and_script_generating_key_files
 from ros_buildfarm.common import get_sourcedeb_job_name
 from ros_buildfarm.common import get_system_architecture
+from ros_buildfarm.common import JobConfigWriter
 from ros_buildfarm.common import JobValidationError
 from ros_buildfarm.common import write_groovy_script_and_configs
 from ros_buildfarm.config import get_distribution_file
@@ -44,6 +45,7 @@ from ros_buildfarm.jenkins import configure_view
 from ros_buildfarm.jenkins import connect
 from ros_buildfarm.jenkins import remove_jobs
 from ros_buildfarm.templates import expand_template
+from ros_buildfarm.timing import get_resource_usage
 
 
 def configure_release_jobs(
@@ -124,19 +126,22 @@ def configure_release_jobs(
     jenkins = connect(config.jenkins_url) if groovy_script is None else False
 
     all_view_configs = {}
-    all_job_configs = OrderedDict()
+    # the job configs are written as soon as they are generated
+    # to not keep all of them in memory
+    job_config_writer = JobConfigWriter(groovy_script) \
+        if groovy_script is not None else None
 
     job_name, job_config = configure_import_package_job(
         config_url, rosdistro_name, release_build_name,
         config=config, build_file=build_file, jenkins=jenkins, dry_run=dry_run)
     if not jenkins:
-        all_job_configs[job_name] = job_config
+        job_config_writer.write(job_name, job_config)
 
     job_name, job_config = configure_sync_packages_to_main_job(
         config_url, rosdistro_name, release_build_name,
         config=config, build_file=build_file, jenkins=jenkins, dry_run=dry_run)
     if not jenkins:
-        all_job_configs[job_name] = job_config
+        job_config_writer.write(job_name, job_config)
 
     for os_name, os_code_name in platforms:
         for arch in sorted(build_file.targets[os_name][os_code_name]):
@@ -146,7 +151,7 @@ def configure_release_jobs(
                 config=config, build_file=build_file, jenkins=jenkins,
                 dry_run=dry_run)
             if not jenkins:
-                all_job_configs[job_name] = job_config
+                job_config_writer.write(job_name, job_config)
 
     targets = []
     for os_name, os_code_name in platforms:
@@ -175,13 +180,15 @@ def configure_release_jobs(
         pkg_xml = dist_cache.release_package_xmls[pkg_name]
         pkg = parse_package_string(pkg_xml)
         pkgs[pkg_name] = pkg
-    ordered_pkg_tuples = topological_order_packages(pkgs)
+    ordered_pkg_names = [p.name for _, p in topological_order_packages(pkgs)]
+    # the parsed packages are not needed anymore
+    del pkgs
 
     other_build_files = [v for k, v in build_files.items() if k != release_build_name]
 
     all_source_job_names = []
     all_binary_job_names = []
-    for pkg_name in [p.name for _, p in ordered_pkg_tuples]:
+    for pkg_name in ordered_pkg_names:
         if whitelist_package_names:
             if pkg_name not in whitelist_package_names:
                 print("Skipping package '%s' not in the explicitly passed list" %
@@ -235,13 +242,16 @@ def configure_release_jobs(
                     print('Configuration for jobs: ' +
                           ', '.join(source_job_names + binary_job_names))
                     for source_job_name in source_job_names:
-                        all_job_configs[source_job_name] = job_configs[source_job_name]
+                        job_config_writer.write(
+                            source_job_name, job_configs[source_job_name])
                     for binary_job_name in binary_job_names:
-                        all_job_configs[binary_job_name] = job_configs[binary_job_name]
+                        job_config_writer.write(
+                            binary_job_name, job_configs[binary_job_name])
             except JobValidationError as e:
                 print(e.message, file=sys.stderr)
 
-    groovy_data['expected_num_jobs'] = len(all_job_configs)
+    groovy_data['expected_num_jobs'] = \
+        len(job_config_writer) if job_config_writer is not None else 0
     groovy_data['job_prefixes_and_names'] = {}
 
     # with an explicit list of packages we don't delete obsolete jobs
@@ -325,12 +335,16 @@ def configure_release_jobs(
     if groovy_script is not None:
         print(
             "Writing groovy script '%s' to reconfigure %d views and %d jobs" %
-            (groovy_script, len(all_view_configs), len(all_job_configs)))
+            (groovy_script, len(all_view_configs), len(job_config_writer)))
         content = expand_template(
             'snippet/reconfigure_jobs.groovy.em', groovy_data)
+        job_config_writer.close()
         write_groovy_script_and_configs(
-            groovy_script, content, all_job_configs,
-            view_configs=all_view_configs)
+            groovy_script, content, None, view_configs=all_view_configs)
+
+    peak_rss_kib = get_resource_usage()['peak_rss_kib']
+    if peak_rss_kib is not None:
+        print('Peak memory usage: %d MiB' % (peak_rss_kib // 1024))
 
 
 def _get_downstream_package_names(pkg_names, dependencies):
@@ -725,14 +739,8 @@ def _get_direct_dependencies(pkg_name, dist_cache, pkg_names):
     pkg_xml = dist_cache.release_package_xmls[pkg_name]
     pkg = parse_package_string(pkg_xml)
     depends = set([
-        d.name for d in (
-            pkg.buildtool_depends +
-            pkg.build_depends +
-            pkg.buildtool_export_depends +
-            pkg.build_export_depends +
-            pkg.exec_depends +
-            pkg.test_depends)
-        if d.name in pkg_names])
+        name for name in get_release_dependency_names(pkg)
+        if name in pkg_names])
     return depends
 
 
@@ -867,6 +875,7 @@ def _get_binarydeb_job_config(
         'os_code_name': os_code_name,
         'arch': arch,
         'repository_args': repository_args,
+        'base_image_registry': config.base_image_registry,
 
         'append_timestamp': build_file.abi_incompatibility_assumed,
 
@@ -0,0 +1,181 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+
+
+def initialize_resolver(rosdistro_name, os_name, os_code_name):
+    from rosdep2 import create_default_installer_context
+    from rosdep2.catkin_support import get_catkin_view
+
+    # resolve rosdep keys into binary package names
+    ctx = create_default_installer_context()
+    try:
+        installer_key = ctx.get_default_os_installer_key(os_name)
+    except KeyError:
+        raise RuntimeError(
+            "Could not determine the rosdep installer for '%s'" % os_name)
+    installer = ctx.get_installer(installer_key)
+    view = get_catkin_view(rosdistro_name, os_name, os_code_name, update=False)
+    return {
+        'os_name': os_name,
+        'os_code_name': os_code_name,
+        'installer': installer,
+        'view': view,
+    }
+
+
+def get_rosdep_sources_hash(sources_cache_dir=None):
+    """
+    Get a hash identifying the state of the local rosdep sources cache.
+
+    The hash changes whenever `rosdep update` fetched different data.
+    """
+    if sources_cache_dir is None:
+        from rosdep2.sources_list import get_sources_cache_dir
+        sources_cache_dir = get_sources_cache_dir()
+    h = hashlib.sha256()
+    if os.path.isdir(sources_cache_dir):
+        for filename in sorted(os.listdir(sources_cache_dir)):
+            path = os.path.join(sources_cache_dir, filename)
+            if not os.path.isfile(path):
+                continue
+            h.update(filename.encode())
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+class RosdepResolutionCache(object):
+    """
+    A persistent cache of resolved rosdep keys.
+
+    All keys for the same rosdep sources, ROS distribution and platform are
+    stored in a single JSON file.
+    Keys which could not be resolved are stored as ``None``.
+    """
+
+    def __init__(
+            self, path, sources_hash, rosdistro_name, os_name, os_code_name):
+        self.path = path
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+        context = '\0'.join(
+            [sources_hash, rosdistro_name, os_name, os_code_name])
+        self.filename = os.path.join(
+            self.path,
+            '%s.json' % hashlib.sha256(context.encode()).hexdigest())
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as h:
+                return json.load(h)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def get(self, rosdep_keys):
+        """
+        Look up multiple rosdep keys.
+
+        :returns: A tuple containing a dict mapping the cached keys to their
+          resolved names (or ``None`` if they are unresolvable) and a list of
+          the keys missing in the cache
+        """
+        hits = {}
+        misses = []
+        for rosdep_key in rosdep_keys:
+            if rosdep_key in self._entries:
+                hits[rosdep_key] = self._entries[rosdep_key]
+            else:
+                misses.append(rosdep_key)
+        return hits, misses
+
+    def update(self, entries):
+        # merge with entries written concurrently by other jobs
+        self._entries = self._load()
+        self._entries.update(entries)
+        tmp_filename = '%s.%d' % (self.filename, os.getpid())
+        with open(tmp_filename, 'w') as h:
+            json.dump(self._entries, h, sort_keys=True)
+        os.rename(tmp_filename, self.filename)
+
+
+class RosdepResolver(object):
+    """
+    Resolve rosdep keys into binary package names.
+
+    If a cache directory is passed the resolutions are looked up in a
+    persistent cache first and the rosdep view is only loaded when some of
+    the keys are not cached yet.
+    """
+
+    def __init__(
+            self, rosdistro_name, os_name, os_code_name, cache_dir=None):
+        self.rosdistro_name = rosdistro_name
+        self.os_name = os_name
+        self.os_code_name = os_code_name
+        self.cache = None
+        if cache_dir:
+            self.cache = RosdepResolutionCache(
+                cache_dir, get_rosdep_sources_hash(), rosdistro_name,
+                os_name, os_code_name)
+        self._context = None
+
+    def resolve(self, rosdep_keys):
+        """
+        Resolve multiple rosdep keys at once.
+
+        :returns: A tuple containing a dict mapping the resolvable keys to
+          lists of binary package names and a sorted list of the keys which
+          could not be resolved
+        """
+        rosdep_keys = sorted(set(rosdep_keys))
+        if self.cache:
+            results, misses = self.cache.get(rosdep_keys)
+            print('Rosdep resolution cache: %d hits, %d misses' %
+                  (len(results), len(misses)))
+        else:
+            results, misses = {}, rosdep_keys
+
+        if misses:
+            from rosdep2.catkin_support import resolve_for_os
+            if self._context is None:
+                self._context = initialize_resolver(
+                    self.rosdistro_name, self.os_name, self.os_code_name)
+            resolved = {}
+            for rosdep_key in misses:
+                try:
+                    resolved[rosdep_key] = sorted(resolve_for_os(
+                        rosdep_key, self._context['view'],
+                        self._context['installer'], self.os_name,
+                        self.os_code_name))
+                except KeyError:
+                    resolved[rosdep_key] = None
+            results.update(resolved)
+            if self.cache:
+                self.cache.update(resolved)
+
+        resolved_names = {}
+        unresolved_keys = []
+        for rosdep_key in rosdep_keys:
+            if results[rosdep_key] is None:
+                unresolved_keys.append(rosdep_key)
+            else:
+                resolved_names[rosdep_key] = results[rosdep_key]
+        return resolved_names, unresolved_keys
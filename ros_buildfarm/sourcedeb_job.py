@@ -15,12 +15,13 @@
 import subprocess
 
 from ros_buildfarm.common import get_debian_package_name
+from ros_buildfarm.git_mirror import GitMirrorCache
 from ros_buildfarm.release_common import dpkg_parsechangelog
 
 
 def get_sources(
         rosdistro_index_url, rosdistro_name, pkg_name, os_name, os_code_name,
-        sources_dir):
+        sources_dir, git_mirror_cache_dir=None):
     from rosdistro import get_cached_distribution
     from rosdistro import get_index
     index = get_index(rosdistro_index_url)
@@ -38,15 +39,22 @@ def get_sources(
     tag = _get_source_tag(
         rosdistro_name, pkg_name, pkg_version, os_name, os_code_name)
 
-    cmd = [
-        'git', 'clone',
-        '--branch', tag,
-        # fetch all branches and tags but no history
-        '--depth', '1', '--no-single-branch',
-        repo.release_repository.url, sources_dir]
-
-    print("Invoking '%s'" % ' '.join(cmd))
-    subprocess.check_call(cmd)
+    if git_mirror_cache_dir:
+        # clone from a local mirror which is only updated incrementally
+        cache = GitMirrorCache(git_mirror_cache_dir)
+        cache.clone(
+            repo.release_repository.url, tag, sources_dir, depth=1)
+        cache.evict()
+    else:
+        cmd = [
+            'git', 'clone',
+            '--branch', tag,
+            # fetch all branches and tags but no history
+            '--depth', '1', '--no-single-branch',
+            repo.release_repository.url, sources_dir]
+
+        print("Invoking '%s'" % ' '.join(cmd))
+        subprocess.check_call(cmd)
 
     # ensure that the package version is correct
     source_version = dpkg_parsechangelog(sources_dir, ['Version'])[0]
@@ -0,0 +1,209 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import namedtuple
+import os
+import sqlite3
+import time
+
+from .common import Target
+from .debian_version import get_debian_version
+
+StatusHistoryRun = namedtuple(
+    'StatusHistoryRun', 'run_id page_name time baseline change_count')
+
+StatusChange = namedtuple(
+    'StatusChange',
+    'run_id time package target repository old_version new_version')
+
+
+def get_status_change_type(change):
+    """
+    Classify a change of a version.
+
+    :returns: one of ``added``, ``removed``, ``upgraded`` and ``downgraded``
+    """
+    if change.old_version is None:
+        return 'added'
+    if change.new_version is None:
+        return 'removed'
+    if get_debian_version(change.new_version) > \
+            get_debian_version(change.old_version):
+        return 'upgraded'
+    return 'downgraded'
+
+
+class StatusHistory(object):
+    """
+    The history of the package versions shown on the status pages.
+
+    The database contains the current version of every cell of each page
+    (identified by the package, the target and the repository).
+    Each recorded run only appends the cells which changed since the
+    previous run of the same page.
+    The first run of a page is a baseline without any changes.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        dirname = os.path.dirname(filename)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        self._connection = sqlite3.connect(filename)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                page_name TEXT NOT NULL,
+                time REAL NOT NULL,
+                baseline INTEGER NOT NULL,
+                change_count INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS runs_page_name ON runs (page_name);
+            CREATE TABLE IF NOT EXISTS changes (
+                run_id INTEGER NOT NULL REFERENCES runs (run_id),
+                package TEXT NOT NULL,
+                os_name TEXT NOT NULL,
+                os_code_name TEXT NOT NULL,
+                arch TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                old_version TEXT,
+                new_version TEXT);
+            CREATE INDEX IF NOT EXISTS changes_run_id ON changes (run_id);
+            CREATE TABLE IF NOT EXISTS versions (
+                page_name TEXT NOT NULL,
+                package TEXT NOT NULL,
+                os_name TEXT NOT NULL,
+                os_code_name TEXT NOT NULL,
+                arch TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                version TEXT NOT NULL,
+                PRIMARY KEY (
+                    page_name, package, os_name, os_code_name, arch,
+                    repository));
+        """)
+
+    def close(self):
+        self._connection.close()
+
+    def record(self, page_name, versions, timestamp=None):
+        """
+        Record the current versions of a page.
+
+        :param versions: a dict mapping (package, target, repository) tuples
+          to the version, cells without a version can be omitted
+        :returns: the id of the run
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        versions = dict(
+            (k, v) for k, v in versions.items() if v is not None)
+        previous_versions = self._get_versions(page_name)
+        baseline = not self.get_runs(page_name, limit=1)
+
+        changes = []
+        if not baseline:
+            for key in set(previous_versions.keys()) | set(versions.keys()):
+                old_version = previous_versions.get(key)
+                new_version = versions.get(key)
+                if old_version != new_version:
+                    changes.append(key + (old_version, new_version))
+            changes.sort()
+
+        with self._connection:
+            cursor = self._connection.execute(
+                'INSERT INTO runs (page_name, time, baseline, change_count) '
+                'VALUES (?, ?, ?, ?)',
+                (page_name, timestamp, int(baseline), len(changes)))
+            run_id = cursor.lastrowid
+            self._connection.executemany(
+                'INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, package) + tuple(target) +
+                 (repository, old_version, new_version)
+                 for package, target, repository, old_version, new_version
+                 in changes])
+            if baseline:
+                updated = versions.items()
+                removed = []
+            else:
+                updated = [
+                    (c[0:3], c[4]) for c in changes if c[4] is not None]
+                removed = [c[0:3] for c in changes if c[4] is None]
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(page_name, package) + tuple(target) + (repository, version)
+                 for (package, target, repository), version in updated])
+            self._connection.executemany(
+                'DELETE FROM versions WHERE page_name = ? AND package = ? '
+                'AND os_name = ? AND os_code_name = ? AND arch = ? '
+                'AND repository = ?',
+                [(page_name, package) + tuple(target) + (repository, )
+                 for package, target, repository in removed])
+        return run_id
+
+    def get_runs(self, page_name, limit=None):
+        """
+        Get the recorded runs of a page, the latest first.
+
+        :returns: a list of ``StatusHistoryRun`` tuples
+        """
+        query = 'SELECT run_id, page_name, time, baseline, change_count ' \
+            'FROM runs WHERE page_name = ? ORDER BY run_id DESC'
+        params = [page_name]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return [
+            StatusHistoryRun(row[0], row[1], row[2], bool(row[3]), row[4])
+            for row in self._connection.execute(query, params)]
+
+    def get_changes(
+            self, page_name, since_run_id=None, run_id=None, package=None):
+        """
+        Get the recorded changes of a page.
+
+        :param since_run_id: only return the changes of later runs
+        :param run_id: only return the changes of this run
+        :param package: only return the changes of this package
+        :returns: a list of ``StatusChange`` tuples ordered by the run
+        """
+        query = 'SELECT runs.run_id, runs.time, package, ' \
+            'os_name, os_code_name, arch, repository, ' \
+            'old_version, new_version ' \
+            'FROM changes JOIN runs ON changes.run_id = runs.run_id ' \
+            'WHERE runs.page_name = ?'
+        params = [page_name]
+        if since_run_id is not None:
+            query += ' AND runs.run_id > ?'
+            params.append(since_run_id)
+        if run_id is not None:
+            query += ' AND runs.run_id = ?'
+            params.append(run_id)
+        if package is not None:
+            query += ' AND package = ?'
+            params.append(package)
+        query += ' ORDER BY runs.run_id, package, os_name, os_code_name, ' \
+            'arch, repository'
+        return [
+            StatusChange(
+                row[0], row[1], row[2], Target(row[3], row[4], row[5]),
+                row[6], row[7], row[8])
+            for row in self._connection.execute(query, params)]
+
+    def _get_versions(self, page_name):
+        versions = {}
+        for row in self._connection.execute(
+                'SELECT package, os_name, os_code_name, arch, repository, '
+                'version FROM versions WHERE page_name = ?', (page_name, )):
+            versions[(row[0], Target(row[1], row[2], row[3]), row[4])] = \
+                row[5]
+        return versions
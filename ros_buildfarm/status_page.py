@@ -12,22 +12,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import print_function
+
 from collections import namedtuple
-from distutils.version import LooseVersion
+import gzip
+import hashlib
 import itertools
+import json
+import multiprocessing
 import os
 import re
 import shutil
 import sys
 import time
 
+from ros_buildfarm import __version__
+
+from .blocked_packages import get_blocked_packages
+from .blocked_packages import get_topological_order
 from .common import get_debian_package_name
 from .common import get_release_view_name
 from .common import get_short_arch
 from .common import Target
 from .config import get_index as get_config_index
 from .config import get_release_build_files
-from .debian_repo import get_debian_repo_data
+from .debian_repo import DebianRepoIndexStore
+from .debian_repo import load_url
+from .debian_version import get_debian_version
+from .status_history import get_status_change_type
+from .status_history import StatusHistory
 from .status_page_input import get_rosdistro_info
 from .status_page_input import RosPackage
 from .templates import expand_template
@@ -36,7 +49,9 @@ from .templates import get_template_path
 
 def build_release_status_page(
         config_url, rosdistro_name, release_build_name,
-        cache_dir, output_dir, copy_resources=False):
+        cache_dir, output_dir, copy_resources=False,
+        client_side_rendering=False, state_dir=None, repo_index_store=None,
+        history_file=None):
     from rosdistro import get_cached_distribution
     from rosdistro import get_index
 
@@ -49,36 +64,47 @@ def build_release_status_page(
     index = get_index(config.rosdistro_index_url)
 
     # get targets
-    targets = []
-    for os_name in sorted(build_file.targets.keys()):
-        if os_name not in ['debian', 'ubuntu']:
-            continue
-        for os_code_name in sorted(build_file.targets[os_name].keys()):
-            targets.append(Target(os_name, os_code_name, 'source'))
-            for arch in sorted(build_file.targets[os_name][os_code_name]):
-                targets.append(Target(os_name, os_code_name, arch))
+    targets = _get_release_status_page_targets(build_file)
     print('The build file contains the following targets:')
     for _, os_code_name, arch in targets:
         print('  - %s %s' % (os_code_name, arch))
 
+    building_repo_url, testing_repo_url, main_repo_url = \
+        _get_release_status_page_repo_urls(build_file)
+
     # get all input data
-    dist = get_cached_distribution(index, rosdistro_name)
+    if repo_index_store is None:
+        repo_index_store = DebianRepoIndexStore(cache_dir)
+    building_repo_data = repo_index_store.get_debian_repo_data(
+        building_repo_url, targets)
+    testing_repo_data = repo_index_store.get_debian_repo_data(
+        testing_repo_url, targets)
+    main_repo_data = repo_index_store.get_debian_repo_data(
+        main_repo_url, targets)
 
-    rosdistro_info = get_rosdistro_info(dist, build_file)
+    repos_data = [building_repo_data, testing_repo_data, main_repo_data]
 
-    # derive testing and main urls from building url
-    building_repo_url = build_file.target_repository
-    base_url = os.path.dirname(building_repo_url)
-    testing_repo_url = os.path.join(base_url, 'testing')
-    main_repo_url = os.path.join(base_url, 'main')
+    output_name = 'ros_%s_%s' % (rosdistro_name, release_build_name)
+    state = None
+    if state_dir:
+        # the distribution cache is only fingerprinted, parsing it is
+        # deferred until the page actually needs to be regenerated
+        dist_cache_url = index.distributions[rosdistro_name].get(
+            'distribution_cache')
+        state = _StatusPageState(state_dir, output_name, [
+            vars(config), vars(build_file), targets,
+            _get_repos_data_fingerprint(repos_data, targets),
+            _get_url_fingerprint(dist_cache_url) if dist_cache_url else None,
+            client_side_rendering])
+        if state.is_unchanged(output_dir):
+            print("Skipped status page '%s' because the inputs are "
+                  'unchanged' % output_name)
+            additional_resources(output_dir, copy_resources=copy_resources)
+            return
 
-    building_repo_data = get_debian_repo_data(
-        building_repo_url, targets, cache_dir)
-    testing_repo_data = get_debian_repo_data(
-        testing_repo_url, targets, cache_dir)
-    main_repo_data = get_debian_repo_data(main_repo_url, targets, cache_dir)
+    dist = get_cached_distribution(index, rosdistro_name)
 
-    repos_data = [building_repo_data, testing_repo_data, main_repo_data]
+    rosdistro_info = get_rosdistro_info(dist, build_file)
 
     # compute derived attributes
     package_descriptors = get_rosdistro_package_descriptors(
@@ -91,6 +117,12 @@ def build_release_status_page(
         package_descriptors, targets,
         building_repo_data, testing_repo_data, main_repo_data)
 
+    blocked_by = get_blocked_by(
+        package_descriptors, targets, building_repo_data,
+        dict((pkg_name, pkg.dependencies & set(rosdistro_info.keys()))
+             for pkg_name, pkg in rosdistro_info.items()))
+    root_causes = get_root_causes(blocked_by)
+
     version_status = get_version_status(
         package_descriptors, targets, repos_data, strip_version=True)
 
@@ -110,13 +142,12 @@ def build_release_status_page(
     for pkg_name in sorted(rosdistro_info.keys()):
         ordered_pkgs.append(rosdistro_info[pkg_name])
 
-    template_name = 'status/release_status_page.html.em'
     data = {
         'title': 'ROS %s - release status' % rosdistro_name.capitalize(),
         'start_time': start_time,
         'start_time_local_str': time.strftime('%Y-%m-%d %H:%M:%S %z', time.localtime(start_time)),
 
-        'resource_hashes': get_resource_hashes(),
+        'resource_urls': get_resource_urls(),
 
         'repo_names': repo_names,
         'repo_urls': repo_urls,
@@ -132,42 +163,56 @@ def build_release_status_page(
         'repos_data': repos_data,
 
         'affected_by_sync': affected_by_sync,
+        'blocked_by': blocked_by,
         'homogeneous': homogeneous,
         'jenkins_job_urls': jenkins_job_urls,
         'package_counts': package_counts,
         'regressions': regressions,
+        'root_causes': root_causes,
         'version_status': version_status,
     }
-    html = expand_template(template_name, data)
-    output_filename = os.path.join(
-        output_dir, 'ros_%s_%s.html' % (rosdistro_name, release_build_name))
-    print("Generating status page '%s':" % output_filename)
-    with open(output_filename, 'w') as h:
-        h.write(html)
+    output_files = []
+    if history_file:
+        output_files += _write_status_changes_page(
+            data, output_dir, output_name, history_file,
+            _get_status_history_versions(
+                package_descriptors, targets, repo_names, repos_data))
+    _write_status_page(
+        data, output_dir, output_name, client_side_rendering, state=state,
+        output_files=output_files)
 
     additional_resources(output_dir, copy_resources=copy_resources)
 
 
 def build_debian_repos_status_page(
         repo_urls, os_code_name_and_arch_tuples,
-        cache_dir, output_name, output_dir):
+        cache_dir, output_name, output_dir, client_side_rendering=False,
+        state_dir=None, repo_index_store=None, history_file=None):
     start_time = time.time()
 
     # get targets
-    targets = []
-    for os_code_name_and_arch in os_code_name_and_arch_tuples:
-        assert os_code_name_and_arch.count(':') == 1, \
-            'The string (%s) does not contain single colon separating an ' + \
-            'OS code name and an architecture'
-        os_code_name, arch = os_code_name_and_arch.split(':')
-        targets.append(Target('ubuntu', os_code_name, arch))
+    targets = _get_repos_status_page_targets(os_code_name_and_arch_tuples)
 
     # get all input data
+    if repo_index_store is None:
+        repo_index_store = DebianRepoIndexStore(cache_dir)
     repos_data = []
     for repo_url in repo_urls:
-        repo_data = get_debian_repo_data(repo_url, targets, cache_dir)
+        repo_data = repo_index_store.get_debian_repo_data(repo_url, targets)
         repos_data.append(repo_data)
 
+    state = None
+    if state_dir:
+        state = _StatusPageState(state_dir, output_name, [
+            repo_urls, targets,
+            _get_repos_data_fingerprint(repos_data, targets),
+            client_side_rendering])
+        if state.is_unchanged(output_dir):
+            print("Skipped status page '%s' because the inputs are "
+                  'unchanged' % output_name)
+            additional_resources(output_dir)
+            return
+
     # compute derived attributes
     package_descriptors = get_repos_package_descriptors(repos_data, targets)
 
@@ -195,16 +240,16 @@ def build_debian_repos_status_page(
         pkg.status_description = None
         pkg.maintainers = []
         pkg.url = None
+        pkg.dependencies = set([])
 
         ordered_pkgs.append(pkg)
 
-    template_name = 'status/release_status_page.html.em'
     data = {
         'title': 'ROS repository status',
         'start_time': start_time,
         'start_time_local_str': time.strftime('%Y-%m-%d %H:%M:%S %z', time.localtime(start_time)),
 
-        'resource_hashes': get_resource_hashes(),
+        'resource_urls': get_resource_urls(),
 
         'repo_names': repo_names,
         'repo_urls': repo_urls,
@@ -220,20 +265,534 @@ def build_debian_repos_status_page(
         'repos_data': repos_data,
 
         'affected_by_sync': None,
+        'blocked_by': None,
         'homogeneous': homogeneous,
         'jenkins_job_urls': None,
         'package_counts': package_counts,
         'regressions': None,
+        'root_causes': None,
         'version_status': version_status,
     }
+    output_files = []
+    if history_file:
+        output_files += _write_status_changes_page(
+            data, output_dir, output_name, history_file,
+            _get_status_history_versions(
+                package_descriptors, targets, repo_names, repos_data))
+    _write_status_page(
+        data, output_dir, output_name, client_side_rendering, state=state,
+        output_files=output_files)
+
+    additional_resources(output_dir)
+
+
+def build_status_pages(
+        config_url, rosdistro_name, cache_dir, output_dir,
+        copy_resources=False, client_side_rendering=False, state_dir=None,
+        history_file=None, older_rosdistro_names=None,
+        compare_pairwise=False):
+    """
+    Generate all status pages of a ROS distribution in a single process.
+
+    These are the release status pages of all release build files, the repos
+    status pages and the page comparing the distribution with the passed
+    older ones.
+    The union of the repository indices needed by the status pages is loaded
+    once and shared between them.
+
+    :param older_rosdistro_names: The names of the older ROS distributions
+      to compare the distribution with, no compare page is generated if
+      empty
+    :param compare_pairwise: The flag if additional pages comparing the
+      distribution with each older one should be generated
+    """
+    config = get_config_index(config_url)
+    release_build_files = get_release_build_files(config, rosdistro_name)
+    repos_status_pages = get_repos_status_pages(config, rosdistro_name)
+
+    repository_baseurls_and_targets = set([])
+    for build_file in release_build_files.values():
+        targets = _get_release_status_page_targets(build_file)
+        for repo_url in _get_release_status_page_repo_urls(build_file):
+            repository_baseurls_and_targets.update(
+                [(repo_url, t) for t in targets])
+    for status_page in repos_status_pages.values():
+        targets = _get_repos_status_page_targets(
+            status_page['os_code_name_and_arch_tuples'])
+        for repo_url in status_page['debian_repository_urls']:
+            repository_baseurls_and_targets.update(
+                [(repo_url, t) for t in targets])
+
+    repo_index_store = DebianRepoIndexStore(cache_dir)
+    repo_index_store.load(repository_baseurls_and_targets)
+    print('Loaded %d repository indices' % len(repo_index_store))
+
+    for release_build_name in sorted(release_build_files.keys()):
+        build_release_status_page(
+            config_url, rosdistro_name, release_build_name,
+            cache_dir, output_dir, copy_resources=copy_resources,
+            client_side_rendering=client_side_rendering,
+            state_dir=state_dir, repo_index_store=repo_index_store,
+            history_file=history_file)
+
+    for status_page_name in sorted(repos_status_pages.keys()):
+        status_page = repos_status_pages[status_page_name]
+        build_debian_repos_status_page(
+            status_page['debian_repository_urls'],
+            status_page['os_code_name_and_arch_tuples'],
+            cache_dir, '%s_%s' % (rosdistro_name, status_page_name),
+            output_dir, client_side_rendering=client_side_rendering,
+            state_dir=state_dir, repo_index_store=repo_index_store,
+            history_file=history_file)
+
+    if older_rosdistro_names:
+        # compare against all older ones
+        rosdistro_names_list = [older_rosdistro_names + [rosdistro_name]]
+        if compare_pairwise and len(older_rosdistro_names) > 1:
+            rosdistro_names_list += [
+                [n, rosdistro_name] for n in older_rosdistro_names]
+        for rosdistro_names in rosdistro_names_list:
+            build_release_compare_page(
+                config_url, rosdistro_names, output_dir,
+                copy_resources=copy_resources)
+
+
+def get_repos_status_pages(config, rosdistro_name):
+    """
+    Get the repos status pages of a ROS distribution.
+
+    :returns: a dict mapping the name of each status page to a dict with the
+      ``debian_repository_urls`` and ``os_code_name_and_arch_tuples``
+    """
+    targets_by_repo = _get_targets_by_repo(config, rosdistro_name)
+    status_pages = {}
+    for name, repo_urls in config.status_page_repositories.items():
+        targets = None
+        for repo_url in repo_urls:
+            if repo_url in targets_by_repo.keys():
+                targets = targets_by_repo[repo_url]
+                break
+        if targets is None:
+            print(("Skipping repos status page '%s' since no repository URL" +
+                   "matches any of the release build files") % name)
+            continue
+        status_pages[name] = {
+            'debian_repository_urls': repo_urls,
+            'os_code_name_and_arch_tuples': targets,
+        }
+    return status_pages
+
+
+def _get_targets_by_repo(config, rosdistro_name):
+    # collect all target repositories (building) and their targets
+    # from all release build files
+    target_dicts_by_repo = {}
+    release_build_files = get_release_build_files(config, rosdistro_name)
+    for release_build_file in release_build_files.values():
+        target_repository = release_build_file.target_repository
+        merged_os_names = target_dicts_by_repo.setdefault(
+            target_repository, {})
+        for os_name in release_build_file.targets.keys():
+            os_code_names = release_build_file.targets[os_name]
+            merged_os_code_names = merged_os_names.setdefault(os_name, {})
+            for os_code_name in os_code_names.keys():
+                arches = os_code_names[os_code_name]
+                merged_arches = merged_os_code_names.setdefault(
+                    os_code_name, {})
+                for arch in arches.keys():
+                    merged_arches.setdefault(arch, {})
+
+    # flatten each os_code_name and arch into a single colon separated string
+    targets_by_repo = {}
+    for target_repository in target_dicts_by_repo.keys():
+        targets_by_repo[target_repository] = []
+        targets = target_dicts_by_repo[target_repository]
+        # TODO support other OS names
+        if 'ubuntu' in targets:
+            ubuntu_targets = targets['ubuntu']
+            for os_code_name in sorted(ubuntu_targets.keys()):
+                target = '%s:source' % os_code_name
+                targets_by_repo[target_repository].append(target)
+                for arch in sorted(ubuntu_targets[os_code_name].keys()):
+                    target = '%s:%s' % (os_code_name, arch)
+                    targets_by_repo[target_repository].append(target)
+    return targets_by_repo
+
+
+def _get_release_status_page_targets(build_file):
+    targets = []
+    for os_name in sorted(build_file.targets.keys()):
+        if os_name not in ['debian', 'ubuntu']:
+            continue
+        for os_code_name in sorted(build_file.targets[os_name].keys()):
+            targets.append(Target(os_name, os_code_name, 'source'))
+            for arch in sorted(build_file.targets[os_name][os_code_name]):
+                targets.append(Target(os_name, os_code_name, arch))
+    return targets
+
+
+def _get_release_status_page_repo_urls(build_file):
+    # derive testing and main urls from building url
+    building_repo_url = build_file.target_repository
+    base_url = os.path.dirname(building_repo_url)
+    testing_repo_url = os.path.join(base_url, 'testing')
+    main_repo_url = os.path.join(base_url, 'main')
+    return building_repo_url, testing_repo_url, main_repo_url
+
+
+def _get_repos_status_page_targets(os_code_name_and_arch_tuples):
+    targets = []
+    for os_code_name_and_arch in os_code_name_and_arch_tuples:
+        assert os_code_name_and_arch.count(':') == 1, \
+            'The string (%s) does not contain single colon separating an ' + \
+            'OS code name and an architecture'
+        os_code_name, arch = os_code_name_and_arch.split(':')
+        targets.append(Target('ubuntu', os_code_name, arch))
+    return targets
+
+
+def _write_status_page(
+        data, output_dir, output_name, client_side_rendering, state=None,
+        output_files=None):
+    output_files = list(output_files or []) + ['%s.html' % output_name]
+    if not client_side_rendering:
+        template_name = 'status/release_status_page.html.em'
+        data = dict(data, rows=_get_status_page_rows(data, state=state))
+    else:
+        # the page only contains the header and the rows are rendered in the
+        # browser from a separate data file
+        template_name = 'status/release_status_page_shell.html.em'
+        data_filename = '%s.json' % output_name
+        output_files.append(data_filename)
+        data = dict(data, data_filename=data_filename)
+        output_filename = os.path.join(output_dir, data_filename)
+        print("Generating status page data '%s':" % output_filename)
+        with open(output_filename, 'w') as h:
+            json.dump(
+                get_status_page_data(data), h, separators=(',', ':'))
+        output_files += _write_compressed_files(output_filename)
+
     html = expand_template(template_name, data)
-    output_filename = os.path.join(
-        output_dir, '%s.html' % output_name)
+    output_filename = os.path.join(output_dir, '%s.html' % output_name)
     print("Generating status page '%s':" % output_filename)
     with open(output_filename, 'w') as h:
         h.write(html)
+    output_files += _write_compressed_files(output_filename)
 
-    additional_resources(output_dir)
+    if state:
+        state.save(output_files)
+
+
+def _get_status_history_versions(
+        package_descriptors, targets, repo_names, repos_data):
+    versions = {}
+    for package_descriptor in package_descriptors.values():
+        debian_pkg_name = package_descriptor.debian_pkg_name
+        for target in targets:
+            for repo_name, repo_data in zip(repo_names, repos_data):
+                version = repo_data.get(target, {}).get(debian_pkg_name, None)
+                if version is not None:
+                    versions[(debian_pkg_name, target, repo_name)] = version
+    return versions
+
+
+def _write_status_changes_page(
+        data, output_dir, output_name, history_file, versions):
+    """
+    Record the versions of a status page and render the changes page.
+
+    The page only contains the cells which changed since the previous run.
+
+    :returns: a list of the written filenames
+    """
+    history = StatusHistory(history_file)
+    try:
+        run_id = history.record(
+            output_name, versions, timestamp=data['start_time'])
+        runs = history.get_runs(output_name, limit=2)
+        changes = history.get_changes(output_name, run_id=run_id)
+    finally:
+        history.close()
+    print('Recorded %d changes in the status history' % len(changes))
+
+    previous_run = runs[1] if len(runs) > 1 else None
+    changes_data = dict(
+        data,
+        title='%s - changes' % data['title'],
+        status_page_name=output_name,
+        previous_run=previous_run,
+        previous_run_local_str=time.strftime(
+            '%Y-%m-%d %H:%M:%S %z', time.localtime(previous_run.time))
+        if previous_run else None,
+        changes=[(c, get_status_change_type(c)) for c in changes])
+    html = expand_template(
+        'status/release_status_changes_page.html.em', changes_data)
+    output_filename = os.path.join(
+        output_dir, '%s_changes.html' % output_name)
+    print("Generating status changes page '%s':" % output_filename)
+    with open(output_filename, 'w') as h:
+        h.write(html)
+    return [os.path.basename(output_filename)] + \
+        _write_compressed_files(output_filename)
+
+
+# neither YAML nor XML values can contain a NUL character
+_ROW_SEPARATOR = '\0'
+
+
+def _get_status_page_rows(data, state=None):
+    """
+    Render the table rows of the status page.
+
+    If a state is passed only the rows whose inputs changed since the
+    previous run are rendered, all other rows are reused from the state.
+
+    :returns: a list with the HTML of each package row
+    """
+    template_name = 'status/release_status_page_rows.html.em'
+    template_fingerprint = _get_fingerprint([
+        _get_file_fingerprint(get_template_path(template_name)),
+        data['has_repository_column'], data['has_status_column'],
+        data['has_maintainer_column']])
+
+    fingerprints = []
+    stale_pkgs = []
+    for pkg in data['ordered_pkgs']:
+        fingerprint = _get_row_fingerprint(data, pkg, template_fingerprint)
+        fingerprints.append(fingerprint)
+        if not state or state.get_row(pkg.name, fingerprint) is None:
+            stale_pkgs.append(pkg)
+
+    # render all stale rows at once, followed by a separator each
+    # which can't be part of the values (e.g. a multi-line description)
+    html = expand_template(
+        template_name,
+        dict(data, ordered_pkgs=stale_pkgs, row_separator=_ROW_SEPARATOR))
+    stale_rows = html.split(_ROW_SEPARATOR)
+    assert len(stale_rows) == len(stale_pkgs) + 1 and not stale_rows[-1], \
+        'The rows of the status page contain the row separator'
+    stale_rows.pop()
+    stale_rows = dict(zip([pkg.name for pkg in stale_pkgs], stale_rows))
+    if state:
+        print('Rendered %d of %d rows of the status page' %
+              (len(stale_pkgs), len(data['ordered_pkgs'])))
+
+    rows = []
+    for pkg, fingerprint in zip(data['ordered_pkgs'], fingerprints):
+        if pkg.name in stale_rows:
+            row = stale_rows[pkg.name]
+        else:
+            row = state.get_row(pkg.name, fingerprint)
+        if state:
+            state.set_row(pkg.name, fingerprint, row)
+        rows.append(row)
+    return rows
+
+
+def _get_row_fingerprint(data, pkg, template_fingerprint):
+    values = [
+        template_fingerprint, pkg.name, pkg.debian_name, pkg.version,
+        pkg.url, pkg.repository_name, pkg.repository_url, pkg.status,
+        pkg.status_description,
+        [(m.name, m.email) for m in pkg.maintainers],
+        data['homogeneous'][pkg.name],
+        data['blocked_by'][pkg.name] if data['blocked_by'] else None,
+        pkg.name in data['root_causes'] if data['root_causes'] else None]
+    for target in data['targets']:
+        values.append([
+            data['affected_by_sync'][pkg.name][target]
+            if data['affected_by_sync'] else None,
+            data['regressions'][pkg.name][target]
+            if data['regressions'] else None,
+            data['version_status'][pkg.name][target],
+            [repo_data.get(target, {}).get(pkg.debian_name)
+             for repo_data in data['repos_data']]])
+    return _get_fingerprint(values)
+
+
+def _get_fingerprint(values):
+    return hashlib.sha256(
+        json.dumps(values, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def _get_repos_data_fingerprint(repos_data, targets):
+    return _get_fingerprint([
+        [sorted(repo_data.get(target, {}).items()) for target in targets]
+        for repo_data in repos_data])
+
+
+# the modules besides this one which affect the content of the status pages
+_STATUS_PAGE_CODE_FILES = [
+    'blocked_packages.py',
+    'debian_repo.py',
+    'debian_version.py',
+    'status_page_input.py',
+]
+
+
+def _get_file_fingerprint(path):
+    with open(path, 'rb') as h:
+        return hashlib.sha256(h.read()).hexdigest()
+
+
+def _get_url_fingerprint(url):
+    return hashlib.sha256(load_url(url)).hexdigest()
+
+
+class _StatusPageState(object):
+    """
+    The fingerprints of the inputs of a status page and its rendered rows.
+
+    The state is persisted in a JSON file between runs.
+    Besides the passed input data the fingerprint covers the code, the
+    templates and the resources generating the page.
+    """
+
+    def __init__(self, state_dir, output_name, inputs):
+        self.filename = os.path.join(state_dir, '%s.json' % output_name)
+        self.output_name = output_name
+        template_path = get_template_path('status')
+        code_files = [__file__] + [
+            os.path.join(os.path.dirname(__file__), filename)
+            for filename in _STATUS_PAGE_CODE_FILES] + [
+            os.path.join(dirpath, filename)
+            for dirpath, _, filenames in os.walk(template_path)
+            for filename in filenames]
+        self.fingerprint = _get_fingerprint([
+            __version__, inputs,
+            [_get_file_fingerprint(f) for f in sorted(code_files)]])
+        self._previous = {}
+        if os.path.exists(self.filename):
+            try:
+                with open(self.filename, 'r') as h:
+                    self._previous = json.load(h)
+            except ValueError as e:
+                print("Ignoring invalid state file '%s': %s" %
+                      (self.filename, e), file=sys.stderr)
+        self._rows = {}
+
+    def is_unchanged(self, output_dir):
+        if self._previous.get('fingerprint') != self.fingerprint:
+            return False
+        return all(
+            os.path.exists(os.path.join(output_dir, filename))
+            for filename in self._previous.get('output_files', []))
+
+    def get_row(self, pkg_name, fingerprint):
+        fingerprint_and_row = self._previous.get('rows', {}).get(pkg_name)
+        if fingerprint_and_row and fingerprint_and_row[0] == fingerprint:
+            return fingerprint_and_row[1]
+        return None
+
+    def set_row(self, pkg_name, fingerprint, row):
+        self._rows[pkg_name] = [fingerprint, row]
+
+    def save(self, output_files):
+        if not os.path.exists(os.path.dirname(self.filename)):
+            os.makedirs(os.path.dirname(self.filename))
+        # replace the file atomically to not leave a truncated state behind
+        tmp_filename = '%s.%d' % (self.filename, os.getpid())
+        with open(tmp_filename, 'w') as h:
+            json.dump({
+                'fingerprint': self.fingerprint,
+                'output_files': output_files,
+                'rows': self._rows,
+            }, h)
+        os.rename(tmp_filename, self.filename)
+
+
+# the flags of a package in the status page data
+STATUS_PAGE_FLAG_DIFF = 1
+STATUS_PAGE_FLAG_SYNC = 2
+STATUS_PAGE_FLAG_REGRESSION = 4
+STATUS_PAGE_FLAG_BLOCKED = 8
+STATUS_PAGE_FLAG_ROOT_CAUSE = 16
+
+
+def get_status_page_data(data):
+    """
+    Get the rows of a status page in a compact columnar form.
+
+    The cells of a package are encoded in a string with one character for
+    each repository and target (ordered by target first).
+    ``_`` represents the same version as the reference version, the other
+    characters are the first letter of the version status.
+    The versions of all cells except ``_``, ``i`` and ``m`` are listed in the
+    same order in ``cell_versions``.
+
+    :param data: the data passed to the status page template
+    :returns: a dict which can be serialized as JSON
+    """
+    targets = data['targets']
+    repos_data = data['repos_data']
+    homogeneous = data['homogeneous']
+    affected_by_sync = data['affected_by_sync']
+    regressions = data['regressions']
+    blocked_by = data['blocked_by']
+    root_causes = data['root_causes']
+    version_status = data['version_status']
+
+    columns = [
+        'name', 'url', 'version', 'flags', 'cells', 'cell_versions',
+        'blocked_by']
+    if data['has_repository_column']:
+        columns += ['repository_name', 'repository_url']
+    if data['has_status_column']:
+        columns += ['status', 'status_description']
+    if data['has_maintainer_column']:
+        columns += ['maintainers']
+    packages = dict((c, []) for c in columns)
+
+    for pkg in data['ordered_pkgs']:
+        flags = 0
+        if not homogeneous[pkg.name]:
+            flags |= STATUS_PAGE_FLAG_DIFF
+        if affected_by_sync and True in affected_by_sync[pkg.name].values():
+            flags |= STATUS_PAGE_FLAG_SYNC
+        if regressions and True in regressions[pkg.name].values():
+            flags |= STATUS_PAGE_FLAG_REGRESSION
+        if blocked_by and blocked_by[pkg.name]:
+            flags |= STATUS_PAGE_FLAG_BLOCKED
+        if root_causes and pkg.name in root_causes:
+            flags |= STATUS_PAGE_FLAG_ROOT_CAUSE
+
+        cells = []
+        cell_versions = []
+        for target in targets:
+            for i, status in enumerate(version_status[pkg.name][target]):
+                version = repos_data[i].get(target, {}).get(pkg.debian_name)
+                if status == 'equal' and version == pkg.version:
+                    cells.append('_')
+                    continue
+                cells.append(status[0])
+                if status not in ['ignore', 'missing']:
+                    cell_versions.append(version)
+
+        packages['name'].append(pkg.name)
+        packages['url'].append(pkg.url)
+        packages['version'].append(pkg.version)
+        packages['flags'].append(flags)
+        packages['cells'].append(''.join(cells))
+        packages['cell_versions'].append(cell_versions)
+        packages['blocked_by'].append(
+            blocked_by[pkg.name] if blocked_by else [])
+        if data['has_repository_column']:
+            packages['repository_name'].append(pkg.repository_name)
+            packages['repository_url'].append(pkg.repository_url)
+        if data['has_status_column']:
+            packages['status'].append(pkg.status)
+            packages['status_description'].append(pkg.status_description)
+        if data['has_maintainer_column']:
+            packages['maintainers'].append(
+                [[m.name, m.email] for m in pkg.maintainers])
+
+    return {
+        'start_time': data['start_time'],
+        'repo_names': data['repo_names'],
+        'targets': [list(t) for t in targets],
+        'package_count': len(data['ordered_pkgs']),
+        'packages': packages,
+    }
 
 
 PackageDescriptor = namedtuple(
@@ -337,15 +896,64 @@ def get_regressions(
             main_version = \
                 main_repo_data.get(target, {}).get(debian_pkg_name, None)
             if main_version is not None:
-                main_ver_loose = LooseVersion(main_version)
+                main_debian_version = get_debian_version(main_version)
                 for repo_data in [building_repo_data, testing_repo_data]:
                     version = \
                         repo_data.get(target, {}).get(debian_pkg_name, None)
-                    if not version or main_ver_loose > LooseVersion(version):
+                    if not version or \
+                            main_debian_version > get_debian_version(version):
                         regressions[pkg_name][target] = True
     return regressions
 
 
+def get_blocked_by(
+        package_descriptors, targets, building_repo_data, dependencies):
+    """
+    For each package get the missing packages blocking it.
+
+    A package is blocked on a target if its binary is missing in the
+    building repo as well as the binary of any of its dependencies.
+    The root causes are the missing dependencies which are not blocked
+    themselves.
+
+    :param dependencies: a dict indexed by package names containing
+      the names of their dependencies
+    :return: a dict indexed by package names containing
+      a sorted list of the names of the root causes on any target
+    """
+    order = get_topological_order(dependencies)
+    root_causes = dict(
+        (pkg_name, set([])) for pkg_name in package_descriptors.keys())
+    for target in targets:
+        if target.arch == 'source':
+            continue
+        repo_index = building_repo_data.get(target, {})
+        missing_pkg_names = set([
+            d.pkg_name for d in package_descriptors.values()
+            if d.debian_pkg_name not in repo_index])
+        blocked = get_blocked_packages(
+            dependencies, missing_pkg_names, order=order)
+        for pkg_name, pkg_root_causes in blocked.items():
+            root_causes[pkg_name].update(pkg_root_causes)
+    return dict(
+        (pkg_name, sorted(pkg_root_causes))
+        for pkg_name, pkg_root_causes in root_causes.items())
+
+
+def get_root_causes(blocked_by):
+    """
+    Get the packages blocking other packages.
+
+    :return: a dict indexed by the names of the root causes containing
+      the number of packages blocked by them
+    """
+    counts = {}
+    for pkg_root_causes in blocked_by.values():
+        for pkg_name in pkg_root_causes:
+            counts[pkg_name] = counts.get(pkg_name, 0) + 1
+    return counts
+
+
 def get_version_status(
         package_descriptors, targets, repos_data,
         strip_version=False, strip_os_code_name=False):
@@ -499,56 +1107,141 @@ def get_jenkins_job_urls(
 
 
 def additional_resources(output_dir, copy_resources=False):
-    for subfolder in ['css', 'js']:
+    """
+    Provide the static resources referenced by the pages in the output dir.
+
+    Each resource is available under its plain name as well as under its
+    fingerprinted name (see :func:`get_resource_urls`) next to the pre-
+    compressed siblings.
+    Since the fingerprinted names change with the content the web server can
+    let browsers cache them indefinitely.
+    """
+    for subfolder in _RESOURCE_SUBFOLDERS:
+        src = get_template_path(os.path.join('status', subfolder))
         dst = os.path.join(output_dir, subfolder)
-        if not os.path.exists(dst):
-            src = get_template_path(os.path.join('status', subfolder))
-            if copy_resources:
-                shutil.copytree(src, dst)
-            else:
-                os.symlink(os.path.abspath(src), dst)
+        # remove the resources of a previous run including the symlinked
+        # folder created by older versions and outdated fingerprinted files
+        if os.path.islink(dst):
+            os.remove(dst)
+        elif os.path.exists(dst):
+            shutil.rmtree(dst)
+        os.makedirs(dst)
+
+        hashes = get_resource_hashes()
+        for filename in sorted(os.listdir(src)):
+            src_filename = os.path.join(src, filename)
+            dst_filenames = [filename]
+            if filename in hashes:
+                dst_filenames.append(
+                    _get_fingerprinted_filename(filename, hashes[filename]))
+            for dst_filename in dst_filenames:
+                dst_filename = os.path.join(dst, dst_filename)
+                if copy_resources:
+                    shutil.copyfile(src_filename, dst_filename)
+                else:
+                    os.symlink(os.path.abspath(src_filename), dst_filename)
+                _write_compressed_files(dst_filename)
+
+
+_RESOURCE_SUBFOLDERS = ['css', 'js']
+
+_resource_hashes = None
 
 
 def get_resource_hashes():
-    hashes = {}
-    for subfolder in ['css', 'js']:
-        path = get_template_path(os.path.join('status', subfolder))
-        for filename in os.listdir(path):
-            if filename.endswith('.%s' % subfolder):
-                with open(os.path.join(path, filename)) as f:
-                    hashes[filename] = hash(tuple(f.read()))
-    return hashes
+    """
+    Get the content digests of the static resources.
 
+    The digests are computed once per process and are stable across
+    processes.
+
+    :returns: a dict mapping the resource filename to its digest
+    """
+    global _resource_hashes
+    if _resource_hashes is None:
+        hashes = {}
+        for subfolder in _RESOURCE_SUBFOLDERS:
+            path = get_template_path(os.path.join('status', subfolder))
+            for filename in os.listdir(path):
+                if filename.endswith('.%s' % subfolder):
+                    with open(os.path.join(path, filename), 'rb') as f:
+                        hashes[filename] = \
+                            hashlib.sha256(f.read()).hexdigest()[:16]
+        _resource_hashes = hashes
+    return _resource_hashes
+
+
+def get_resource_urls():
+    """
+    Get the relative urls of the fingerprinted static resources.
+
+    :returns: a dict mapping the resource filename to the url, e.g.
+      ``setup.js`` to ``js/setup.0123456789abcdef.js``
+    """
+    urls = {}
+    for filename, digest in get_resource_hashes().items():
+        subfolder = os.path.splitext(filename)[1][1:]
+        urls[filename] = '%s/%s' % (
+            subfolder, _get_fingerprinted_filename(filename, digest))
+    return urls
+
+
+def _get_fingerprinted_filename(filename, digest):
+    base, ext = os.path.splitext(filename)
+    return '%s.%s%s' % (base, digest, ext)
+
+
+def _write_compressed_files(filename):
+    """
+    Write pre-compressed siblings of a file for the web server to serve.
+
+    A ``.gz`` sibling is always written, a ``.br`` sibling only if the
+    ``brotli`` module is available.
+    The gzip header doesn't contain a timestamp or filename so that unchanged
+    content results in identical files.
+
+    :returns: a list of the written filenames relative to the directory of
+      the passed file
+    """
+    with open(filename, 'rb') as h:
+        content = h.read()
+
+    compressed_filenames = [filename + '.gz']
+    with open(filename + '.gz', 'wb') as h:
+        with gzip.GzipFile(
+            filename='', mode='wb', compresslevel=9, fileobj=h, mtime=0
+        ) as g:
+            g.write(content)
 
-def _version_is_gt_other(version, other_version):
     try:
-        # might raise TypeError: http://bugs.python.org/issue14894
-        return LooseVersion(version) > LooseVersion(other_version)
-    except TypeError:
-        loose_version, other_loose_version = \
-            _get_comparable_loose_versions(version, other_version)
-        return loose_version < other_loose_version
-
-
-def _get_comparable_loose_versions(version_str1, version_str2):
-    loose_version1 = LooseVersion(version_str1)
-    loose_version2 = LooseVersion(version_str2)
-    if sys.version_info[0] > 2:
-        # might raise TypeError in Python 3: http://bugs.python.org/issue14894
-        version_parts1 = loose_version1.version
-        version_parts2 = loose_version2.version
-        for i in range(min(len(version_parts1), len(version_parts2))):
-            try:
-                version_parts1[i] < version_parts2[i]
-            except TypeError:
-                version_parts1[i] = str(version_parts1[i])
-                version_parts2[i] = str(version_parts2[i])
-    return loose_version1, loose_version2
+        import brotli
+    except ImportError:
+        pass
+    else:
+        compressed_filenames.append(filename + '.br')
+        with open(filename + '.br', 'wb') as h:
+            h.write(brotli.compress(content))
+
+    return [os.path.basename(f) for f in compressed_filenames]
+
+
+def _version_is_gt_other(version, other_version):
+    return get_debian_version(version) > get_debian_version(other_version)
 
 
 def build_release_compare_page(
         config_url, rosdistro_names,
-        output_dir, copy_resources=False):
+        output_dir, copy_resources=False, jobs=None):
+    """
+    Generate the page comparing the repository versions of ROS distributions.
+
+    The distributions and the maintainers parsed from the package manifests
+    are kept in memory to be reused by further compare pages generated in
+    the same process.
+
+    :param jobs: The number of processes to parse the package manifests in
+      parallel, by default the number of CPUs
+    """
     from rosdistro import get_cached_distribution
     from rosdistro import get_index
 
@@ -559,14 +1252,27 @@ def build_release_compare_page(
     index = get_index(config.rosdistro_index_url)
 
     # get all input data
-    distros = [get_cached_distribution(index, d) for d in rosdistro_names]
+    distros = []
+    for rosdistro_name in rosdistro_names:
+        # reuse the distributions loaded for previous compare pages
+        key = (config.rosdistro_index_url, rosdistro_name)
+        if key not in _compared_distributions:
+            _compared_distributions[key] = get_cached_distribution(
+                index, rosdistro_name)
+        distros.append(_compared_distributions[key])
+
+    # consider every repository only once even if it is part of
+    # multiple distributions
+    repo_names = set([])
+    for distro in distros:
+        repo_names.update(distro.repositories.keys())
 
-    repo_names = [d.repositories.keys() for d in distros]
-    repo_names = [x for y in repo_names for x in y]
+    maintainers = _get_maintainers_by_package_xml(
+        distros, repo_names, jobs=jobs)
 
     repos_data = {}
-    for repo_name in repo_names:
-        repo_data = _compare_repo_version(distros, repo_name)
+    for repo_name in sorted(repo_names):
+        repo_data = _compare_repo_version(distros, repo_name, maintainers)
         if repo_data:
             repos_data[repo_name] = repo_data
 
@@ -578,7 +1284,7 @@ def build_release_compare_page(
         'start_time': start_time,
         'start_time_local_str': time.strftime('%Y-%m-%d %H:%M:%S %z', time.localtime(start_time)),
 
-        'resource_hashes': get_resource_hashes(),
+        'resource_urls': get_resource_urls(),
 
         'rosdistro_names': rosdistro_names,
 
@@ -590,6 +1296,7 @@ def build_release_compare_page(
     print("Generating compare page: '%s'" % output_filename)
     with open(output_filename, 'w') as h:
         h.write(html)
+    _write_compressed_files(output_filename)
 
     additional_resources(output_dir, copy_resources=copy_resources)
 
@@ -619,7 +1326,8 @@ class CompareRow(object):
         return ' '.join([self.maintainers[k] for k in sorted(self.maintainers.keys())])
 
     def get_labels(self, distros):
-        all_versions = [LooseVersion(v) if v else v for v in self.versions]
+        all_versions = [
+            _get_upstream_version_parts(v) if v else v for v in self.versions]
         valid_versions = [v for v in all_versions if v]
         labels = []
         if any([
@@ -640,14 +1348,18 @@ class CompareRow(object):
         return labels
 
 
+def _get_upstream_version_parts(version):
+    # the major, minor and patch version of the upstream version
+    upstream_version = get_debian_version(version).upstream_version
+    return [get_debian_version(p) for p in upstream_version.split('.')]
+
+
 def _is_only_patch_is_different(a, b):
-    return a.version[0] == b.version[0] and \
-        a.version[1] == b.version[1] and a.version[2] != b.version[2]
+    return a[0] == b[0] and a[1] == b[1] and a[2] != b[2]
 
 
 def _is_greater(a, b):
-    return a.version[0] > b.version[0] or \
-        (a.version[0] == b.version[0] and a.version[1] > b.version[1])
+    return a[0] > b[0] or (a[0] == b[0] and a[1] > b[1])
 
 
 def _is_same_version_but_different_branch(version_a, version_b, branch_a, branch_b):
@@ -657,12 +1369,66 @@ def _is_same_version_but_different_branch(version_a, version_b, branch_a, branch
     # skip when any branch is unknown or they are equal
     if not branch_a or not branch_b or branch_a == branch_b:
         return False
-    return version_a.version[0] == version_b.version[0] and \
-        version_a.version[1] == version_b.version[1]
+    return version_a[0] == version_b[0] and version_a[1] == version_b[1]
 
 
-def _compare_repo_version(distros, repo_name):
+# the distributions and the maintainers of already parsed package manifests,
+# shared between all compare pages generated in the same process
+_compared_distributions = {}
+_maintainers_by_package_xml = {}
+
+
+def _get_maintainers_by_package_xml(distros, repo_names, jobs=None):
+    """
+    Parse the maintainers of all released packages of the repositories.
+
+    Each distinct manifest is only parsed once, manifests which haven't been
+    parsed before are parsed in parallel.
+
+    :returns: A dict mapping the package manifests to a list of
+      (name, email) tuples or None if the manifest is invalid
+    """
+    pkg_xmls = set([])
+    for distro in distros:
+        for repo_name in repo_names:
+            if repo_name not in distro.repositories:
+                continue
+            rel_repo = distro.repositories[repo_name].release_repository
+            if not rel_repo:
+                continue
+            for pkg_name in rel_repo.package_names:
+                pkg_xml = distro.get_release_package_xml(pkg_name)
+                if pkg_xml is not None:
+                    pkg_xmls.add(pkg_xml)
+
+    pkg_xmls_to_parse = sorted(pkg_xmls - set(_maintainers_by_package_xml))
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    if jobs > 1 and len(pkg_xmls_to_parse) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(pkg_xmls_to_parse)))
+        try:
+            parsed = pool.map(
+                _get_package_maintainers, pkg_xmls_to_parse,
+                chunksize=max(1, len(pkg_xmls_to_parse) // (4 * jobs)))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        parsed = [_get_package_maintainers(x) for x in pkg_xmls_to_parse]
+    _maintainers_by_package_xml.update(zip(pkg_xmls_to_parse, parsed))
+    return _maintainers_by_package_xml
+
+
+def _get_package_maintainers(pkg_xml):
     from catkin_pkg.package import InvalidPackage, parse_package_string
+    try:
+        pkg = parse_package_string(pkg_xml)
+    except InvalidPackage:
+        return None
+    return [(m.name, m.email) for m in pkg.maintainers]
+
+
+def _compare_repo_version(distros, repo_name, maintainers):
     row = CompareRow(repo_name)
     for distro in distros:
         repo_url = None
@@ -677,12 +1443,12 @@ def _compare_repo_version(distros, repo_name):
                 for pkg_name in rel_repo.package_names:
                     pkg_xml = distro.get_release_package_xml(pkg_name)
                     if pkg_xml is not None:
-                        try:
-                            pkg = parse_package_string(pkg_xml)
-                            for m in pkg.maintainers:
-                                row.maintainers[m.name] = '<a href="mailto:%s">%s</a>' % \
-                                    (m.email, m.name)
-                        except InvalidPackage:
+                        pkg_maintainers = maintainers[pkg_xml]
+                        if pkg_maintainers is not None:
+                            for name, email in pkg_maintainers:
+                                row.maintainers[name] = '<a href="mailto:%s">%s</a>' % \
+                                    (email, name)
+                        else:
                             row.maintainers['zzz'] = '<b>invalid package.xml in %s</b>' % \
                                 distro.name
 
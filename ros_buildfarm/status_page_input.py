@@ -15,6 +15,7 @@
 from collections import namedtuple
 
 from .common import get_debian_package_name
+from .common import get_release_dependency_names
 
 MaintainerDescriptor = namedtuple('Maintainer', 'name email')
 
@@ -31,6 +32,7 @@ class RosPackage(object):
         'status',
         'status_description',
         'maintainers',
+        'dependencies',
     ]
 
     def __init__(self, name):
@@ -80,9 +82,10 @@ def get_rosdistro_info(dist, build_file):
             ros_pkg.status_description = \
                 dist.repositories[pkg.repository_name].status_description
 
-        # maintainers and package url from manifest
+        # maintainers, package url and dependencies from manifest
         ros_pkg.maintainers = []
         ros_pkg.url = None
+        ros_pkg.dependencies = set([])
         pkg_xml = dist.get_release_package_xml(pkg_name)
         if pkg_xml is not None:
             from catkin_pkg.package import InvalidPackage, parse_package_string
@@ -95,6 +98,8 @@ def get_rosdistro_info(dist, build_file):
                     if u.type == 'website':
                         ros_pkg.url = u.url
                         break
+                ros_pkg.dependencies = get_release_dependency_names(
+                    pkg_manifest)
             except InvalidPackage:
                 pass
 
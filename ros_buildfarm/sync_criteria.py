@@ -0,0 +1,134 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+from collections import OrderedDict
+import sys
+
+from rosdistro import get_distribution_file
+from rosdistro import get_index
+
+from .common import get_debian_package_name
+from .common import Target
+from .config import get_index as get_config_index
+from .config import get_release_build_files
+from .debian_repo import DebianRepoIndexStore
+
+
+def check_sync_criteria(
+        config_url, rosdistro_name, release_build_name, os_code_name, arch,
+        cache_dir):
+    target = Target('ubuntu', os_code_name, arch)
+    results = check_sync_criteria_for_targets(
+        config_url, rosdistro_name, release_build_name, [target], cache_dir)
+    return results[target]
+
+
+def check_sync_criteria_for_targets(
+        config_url, rosdistro_name, release_build_name, targets, cache_dir,
+        repo_index_store=None):
+    """
+    Check the sync criteria of multiple targets of a release build file.
+
+    The configuration, the distribution file and the Debian package names
+    are only determined once for all targets.
+
+    :param targets: A list of ``Target`` tuples, if ``None`` all binary
+      targets of the build file are checked
+    :param repo_index_store: A ``DebianRepoIndexStore`` to share the parsed
+      repository indices with other callers
+    :returns: An ordered dict mapping each target to a boolean whether the
+      sync criteria are matched
+    """
+    # fetch debian package list
+    config = get_config_index(config_url)
+    index = get_index(config.rosdistro_index_url)
+    dist_file = get_distribution_file(index, rosdistro_name)
+    build_files = get_release_build_files(config, rosdistro_name)
+    build_file = build_files[release_build_name]
+
+    if targets is None:
+        targets = get_sync_criteria_targets(build_file)
+    if repo_index_store is None:
+        repo_index_store = DebianRepoIndexStore(cache_dir)
+
+    # for each release package which matches the release build file
+    # the binary package must exist
+    all_pkg_names = dist_file.release_packages.keys()
+    pkg_names = build_file.filter_packages(all_pkg_names)
+    debian_pkg_names = OrderedDict(
+        (pkg_name, get_debian_package_name(rosdistro_name, pkg_name))
+        for pkg_name in sorted(pkg_names))
+
+    results = OrderedDict()
+    for target in targets:
+        if len(targets) > 1:
+            print("Checking the sync criteria for '%s %s %s':" % target)
+        repo_index = repo_index_store.get_debian_repo_index(
+            build_file.target_repository, target)
+        results[target] = _check_sync_criteria(
+            build_file, debian_pkg_names, repo_index)
+    return results
+
+
+def get_sync_criteria_targets(build_file):
+    targets = []
+    for os_name in sorted(build_file.targets.keys()):
+        if os_name != 'ubuntu':
+            continue
+        for os_code_name in sorted(build_file.targets[os_name].keys()):
+            for arch in sorted(build_file.targets[os_name][os_code_name]):
+                targets.append(Target(os_name, os_code_name, arch))
+    return targets
+
+
+def _check_sync_criteria(build_file, debian_pkg_names, repo_index):
+    # check if a binary package exists for each release package
+    binary_packages = {}
+    for pkg_name, debian_pkg_name in debian_pkg_names.items():
+        binary_packages[pkg_name] = debian_pkg_name in repo_index
+
+    # check that all elements from whitelist are present
+    if build_file.sync_packages:
+        missing_binary_packages = [
+            pkg_name
+            for pkg_name in build_file.sync_packages
+            if pkg_name not in binary_packages or not binary_packages[pkg_name]]
+        if missing_binary_packages:
+            print('The following binary packages are missing to sync:',
+                  file=sys.stderr)
+            for pkg_name in sorted(missing_binary_packages):
+                print('-', pkg_name, file=sys.stderr)
+            return False
+        print('All required binary packages are available:')
+        for pkg_name in sorted(build_file.sync_packages):
+            print('-', pkg_name)
+
+    # check that count is satisfied
+    if build_file.sync_package_count is not None:
+        binary_package_count = len([
+            pkg_name
+            for pkg_name, has_binary_package in binary_packages.items()
+            if has_binary_package])
+        if binary_package_count < build_file.sync_package_count:
+            print('Only %d binary packages available ' % binary_package_count +
+                  '(at least %d are required to sync)' %
+                  build_file.sync_package_count, file=sys.stderr)
+            return False
+        print('%d binary packages available ' % binary_package_count +
+              '(more or equal then the configured sync limit of %d)' %
+              build_file.sync_package_count)
+
+    return True
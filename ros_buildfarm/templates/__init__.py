@@ -160,12 +160,22 @@ def create_dockerfile(template_name, data, dockerfile_dir):
 
 def get_wrapper_scripts():
     wrapper_scripts = {}
-    for filename in ['apt.py', 'git.py']:
-        wrapper_script_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), 'wrapper')
-        abs_file_path = os.path.join(
-            wrapper_script_path, filename)
+    for filename in ['apt.py', 'binary_package_versions.py', 'git.py']:
+        abs_file_path = _get_wrapper_script_path(filename)
         with open(abs_file_path, 'r') as h:
             content = h.read()
             wrapper_scripts[filename] = content
     return wrapper_scripts
+
+
+def get_wrapper_script_command(filename):
+    """Get the command invoking a wrapper script outside of a container."""
+    module_name = os.path.splitext(filename)[0]
+    return 'python3 -m ros_buildfarm.wrapper.%s' % module_name
+
+
+def _get_wrapper_script_path(filename):
+    wrapper_script_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        'wrapper')
+    return os.path.join(wrapper_script_path, filename)
@@ -49,6 +49,10 @@ RUN python3 -u /tmp/wrapper_scripts/apt.py update-install-clean -q -y git python
 RUN echo "@now_str"
 RUN python3 -u /tmp/wrapper_scripts/apt.py update
 
+# the task generators read the versions of the binary packages from a
+# snapshot instead of loading the apt cache
+RUN python3 -u /tmp/wrapper_scripts/binary_package_versions.py /tmp/binary_package_versions.txt
+
 ENV ROSDISTRO_INDEX_URL @rosdistro_index_url
 
 @(TEMPLATE(
@@ -75,7 +79,14 @@ cmd = \
     ' --os-code-name ' + os_code_name + \
     ' --arch ' + arch + \
     ' --distribution-repository-urls ' + ' '.join(distribution_repository_urls) + \
-    ' --distribution-repository-key-files ' + ' ' .join(['/tmp/keys/%d.key' % i for i in range(len(distribution_repository_keys))])
+    ' --distribution-repository-key-files ' + ' ' .join(['/tmp/keys/%d.key' % i for i in range(len(distribution_repository_keys))]) + \
+    ' --binary-package-versions-file /tmp/binary_package_versions.txt' + \
+    ' --rosdep-cache-dir /tmp/rosdep_cache'
+if common_dependencies:
+    cmd += ' --common-dependencies ' + ' '.join(common_dependencies)
+if base_image:
+    cmd += ' --base-image ' + base_image + \
+        ' --base-image-packages ' + ' '.join(base_image_packages)
 cmds += [
     cmd +
     ' --dockerfile-dir /tmp/docker_build_and_install',
@@ -44,6 +44,10 @@ RUN python3 -u /tmp/wrapper_scripts/apt.py update-install-clean -q -y git mercur
 RUN echo "@now_str"
 RUN python3 -u /tmp/wrapper_scripts/apt.py update
 
+# the task generators read the versions of the binary packages from a
+# snapshot instead of loading the apt cache
+RUN python3 -u /tmp/wrapper_scripts/binary_package_versions.py /tmp/binary_package_versions.txt
+
 ENV ROSDISTRO_INDEX_URL @rosdistro_index_url
 RUN rosdep init
 
@@ -70,9 +74,14 @@ cmds = [
     ' --vcs-info "%s"' % vcs_info + \
     ' --distribution-repository-urls ' + ' '.join(distribution_repository_urls) + \
     ' --distribution-repository-key-files ' + ' ' .join(['/tmp/keys/%d.key' % i for i in range(len(distribution_repository_keys))]) + \
+    ' --binary-package-versions-file /tmp/binary_package_versions.txt' + \
     (' --force' if force else '') + \
     ' --output-dir /tmp/generated_documentation' + \
-    ' --dockerfile-dir /tmp/docker_doc',
+    ' --dockerfile-dir /tmp/docker_doc' + \
+    ' --changelog-cache-dir /tmp/changelog_cache' + \
+    ' --rosdep-cache-dir /tmp/rosdep_cache' + \
+    (' --common-dependencies ' + ' '.join(common_dependencies) if common_dependencies else '') + \
+    (' --base-image ' + base_image + ' --base-image-packages ' + ' '.join(base_image_packages) if base_image else ''),
 ]
 }@
 CMD ["@(' && '.join([c.replace('"', '\\"') for c in cmds]))"]
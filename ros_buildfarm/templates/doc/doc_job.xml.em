@@ -157,6 +157,7 @@ but disabled since the package is blacklisted (or not whitelisted) in the config
         ' ' + arch +
         ' --vcs-info "%s %s %s"' % (doc_repo_spec.type, doc_repo_spec.version if doc_repo_spec.version is not None else '', doc_repo_spec.url) +
         ' ' + ' '.join(repository_args) +
+        (' --base-image-registry ' + base_image_registry if base_image_registry else '') +
         ' $FORCE_FLAG' +
         ' --dockerfile-dir $WORKSPACE/docker_generating_docker',
         'echo "# END SECTION"',
@@ -170,6 +171,10 @@ but disabled since the package is blacklisted (or not whitelisted) in the config
         'echo "# BEGIN SECTION: Run Dockerfile - generating doc task"',
         'rm -fr $WORKSPACE/docker_doc',
         'mkdir -p $WORKSPACE/docker_doc',
+        '# persistent cache of the html generated from CHANGELOG.rst files',
+        'mkdir -p ~/.ros_buildfarm/changelog_cache',
+        '# persistent cache of resolved rosdep keys',
+        'mkdir -p ~/.ros_buildfarm/rosdep_cache',
         'docker run' +
         ' --rm ' +
         ' --cidfile=$WORKSPACE/docker_generating_docker/docker.cid' +
@@ -181,6 +186,8 @@ but disabled since the package is blacklisted (or not whitelisted) in the config
         ' -v $WORKSPACE/catkin_workspace:/tmp/catkin_workspace' +
         ' -v $WORKSPACE/generated_documentation:/tmp/generated_documentation' +
         ' -v $WORKSPACE/docker_doc:/tmp/docker_doc' +
+        ' -v ~/.ros_buildfarm/changelog_cache:/tmp/changelog_cache' +
+        ' -v ~/.ros_buildfarm/rosdep_cache:/tmp/rosdep_cache' +
         ' doc_task_generation.%s_%s' % (rosdistro_name, doc_repo_spec.name.lower()),
         'echo "# END SECTION"',
     ]),
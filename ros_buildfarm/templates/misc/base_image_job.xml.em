@@ -0,0 +1,133 @@
+<project>
+  <actions/>
+  <description>Generated at @ESCAPE(now_str) from template '@ESCAPE(template_name)'</description>
+  <keepDependencies>false</keepDependencies>
+  <properties>
+@(SNIPPET(
+    'property_log-rotator',
+    days_to_keep=30,
+    num_to_keep=30,
+))@
+@(SNIPPET(
+    'property_job-priority',
+    priority=10,
+))@
+@(SNIPPET(
+    'property_requeue-job',
+))@
+  </properties>
+@(SNIPPET(
+    'scm_null',
+))@
+  <assignedNode>@(node_label)</assignedNode>
+  <canRoam>false</canRoam>
+  <disabled>false</disabled>
+  <blockBuildWhenDownstreamBuilding>false</blockBuildWhenDownstreamBuilding>
+  <blockBuildWhenUpstreamBuilding>false</blockBuildWhenUpstreamBuilding>
+  <triggers>
+@(SNIPPET(
+    'trigger_timer',
+    spec='H 3 * * *',
+))@
+  </triggers>
+  <concurrentBuild>false</concurrentBuild>
+  <builders>
+@(SNIPPET(
+    'builder_system-groovy_check-free-disk-space',
+))@
+@(SNIPPET(
+    'builder_shell_docker-info',
+))@
+@(SNIPPET(
+    'builder_check-docker',
+    os_name=os_name,
+    os_code_name=os_code_name,
+    arch=arch,
+))@
+@(SNIPPET(
+    'builder_shell_clone-ros-buildfarm',
+    ros_buildfarm_repository=ros_buildfarm_repository,
+    wrapper_scripts=wrapper_scripts,
+))@
+@(SNIPPET(
+    'builder_shell_key-files',
+    script_generating_key_files=script_generating_key_files,
+))@
+@(SNIPPET(
+    'builder_shell',
+    script='\n'.join([
+        'rm -fr $WORKSPACE/docker_generating_docker',
+        'mkdir -p $WORKSPACE/docker_generating_docker',
+        '',
+        '# monitor all subprocesses and enforce termination',
+        'python3 -u $WORKSPACE/ros_buildfarm/scripts/subprocess_reaper.py $$ --cid-file $WORKSPACE/docker_generating_docker/docker.cid > $WORKSPACE/docker_generating_docker/subprocess_reaper.log 2>&1 &',
+        '# sleep to give python time to startup',
+        'sleep 1',
+        '',
+        '# generate Dockerfile, build and run it',
+        '# generating the Dockerfile for the base image',
+        'echo "# BEGIN SECTION: Generate Dockerfile - base image task"',
+        'export TZ="%s"' % timezone,
+        'export PYTHONPATH=$WORKSPACE/ros_buildfarm:$PYTHONPATH',
+        'python3 -u $WORKSPACE/ros_buildfarm/scripts/misc/run_base_image_job.py' +
+        ' ' + config_url +
+        ' ' + rosdistro_name +
+        ' ' + os_name +
+        ' ' + os_code_name +
+        ' ' + arch +
+        ' ' + ' '.join(repository_args) +
+        ' --dockerfile-dir $WORKSPACE/docker_generating_docker',
+        'echo "# END SECTION"',
+        '',
+        'echo "# BEGIN SECTION: Build Dockerfile - generate base image"',
+        'cd $WORKSPACE/docker_generating_docker',
+        'python3 -u $WORKSPACE/ros_buildfarm/scripts/misc/docker_pull_baseimage.py',
+        'docker build --force-rm -t base_image_task_generation.%s_%s_%s_%s .' % (rosdistro_name, os_name, os_code_name, arch),
+        'echo "# END SECTION"',
+        '',
+        'echo "# BEGIN SECTION: Run Dockerfile - generate base image"',
+        'rm -fr $WORKSPACE/docker_base_image',
+        'mkdir -p $WORKSPACE/docker_base_image',
+        '# persistent cache of resolved rosdep keys',
+        'mkdir -p ~/.ros_buildfarm/rosdep_cache',
+        'docker run' +
+        ' --rm ' +
+        ' --cidfile=$WORKSPACE/docker_generating_docker/docker.cid' +
+        ' -e=HOME=/home/buildfarm' +
+        ' -v $WORKSPACE/ros_buildfarm:/tmp/ros_buildfarm:ro' +
+        ' -v $WORKSPACE/docker_base_image:/tmp/docker_base_image' +
+        ' -v ~/.ros_buildfarm/rosdep_cache:/tmp/rosdep_cache' +
+        ' base_image_task_generation.%s_%s_%s_%s' % (rosdistro_name, os_name, os_code_name, arch),
+        'echo "# END SECTION"',
+    ]),
+))@
+@(SNIPPET(
+    'builder_shell',
+    script='\n'.join([
+        'echo "# BEGIN SECTION: Build Dockerfile - base image"',
+        'cd $WORKSPACE/docker_base_image',
+        'python3 -u $WORKSPACE/ros_buildfarm/scripts/misc/docker_pull_baseimage.py',
+        'docker build --force-rm -t %s .' % base_image,
+        'echo "# END SECTION"',
+    ] + ([
+        '',
+        'echo "# BEGIN SECTION: Push base image"',
+        'docker push %s' % base_image,
+        'echo "# END SECTION"',
+    ] if base_image_registry else [])),
+))@
+  </builders>
+  <publishers>
+@(SNIPPET(
+    'publisher_mailer',
+    recipients=notification_emails,
+    dynamic_recipients=[],
+    send_to_individuals=False,
+))@
+  </publishers>
+  <buildWrappers>
+@(SNIPPET(
+    'build-wrapper_timestamper',
+))@
+  </buildWrappers>
+</project>
@@ -0,0 +1,63 @@
+# generated from @template_name
+
+@(TEMPLATE(
+    'snippet/from_base_image.Dockerfile.em',
+    os_name=os_name,
+    os_code_name=os_code_name,
+    arch=arch,
+))@
+MAINTAINER Dirk Thomas dthomas+buildfarm@@osrfoundation.org
+
+ENV DEBIAN_FRONTEND noninteractive
+
+@(TEMPLATE(
+    'snippet/old_release_set.Dockerfile.em',
+    os_name=os_name,
+    os_code_name=os_code_name,
+))@
+
+@(TEMPLATE(
+    'snippet/add_distribution_repositories.Dockerfile.em',
+    distribution_repository_keys=distribution_repository_keys,
+    distribution_repository_urls=distribution_repository_urls,
+    os_code_name=os_code_name,
+    add_source=False,
+))@
+
+@[if os_name == 'ubuntu']@
+# Enable multiverse
+RUN sed -i "/^# deb.*multiverse/ s/^# //" /etc/apt/sources.list
+@[else if os_name == 'debian']@
+# Add contrib and non-free to debian images
+RUN echo deb http://http.debian.net/debian @os_code_name contrib non-free | tee -a /etc/apt/sources.list
+@[end if]@
+
+@(TEMPLATE(
+    'snippet/add_wrapper_scripts.Dockerfile.em',
+    wrapper_scripts=wrapper_scripts,
+))@
+
+# automatic invalidation once every day
+RUN echo "@today_str"
+
+@(TEMPLATE(
+    'snippet/install_python3.Dockerfile.em',
+    os_name=os_name,
+    os_code_name=os_code_name,
+))@
+
+@(TEMPLATE(
+    'snippet/install_dependencies.Dockerfile.em',
+    dependencies=dependencies,
+    dependency_versions=dependency_versions,
+    stable_dependency_count=len(dependencies),
+))@
+
+# the jobs using this image setup the repositories and scripts again
+RUN rm -fr /tmp/keys /tmp/wrapper_scripts /etc/apt/sources.list.d/buildfarm.list
+@[if os_name == 'debian']@
+RUN sed -i "/^deb .* contrib non-free$/d" /etc/apt/sources.list
+@[end if]@
+
+LABEL @base_image_packages_label="@(' '.join(dependencies))"
+LABEL @base_image_common_dependencies_label="@(' '.join(common_dependencies))"
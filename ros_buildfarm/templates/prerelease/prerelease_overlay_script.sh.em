@@ -13,4 +13,5 @@ fi
     'devel/devel_script_clone.sh.em',
     workspace_path='catkin_workspace_overlay',
     scms=scms,
+    git_wrapper_command=git_wrapper_command,
 ))@
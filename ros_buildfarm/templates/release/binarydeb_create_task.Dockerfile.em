@@ -33,8 +33,7 @@ RUN useradd -u @uid -m buildfarm
     distribution_repository_keys=distribution_repository_keys,
     distribution_repository_urls=distribution_repository_urls,
     os_code_name=os_code_name,
-    add_source=True,
-    target_repository=target_repository,
+    add_source=False,
 ))@
 
 @(TEMPLATE(
@@ -57,6 +56,10 @@ RUN python3 -u /tmp/wrapper_scripts/apt.py update-install-clean -q -y devscripts
 RUN echo "@now_str"
 RUN python3 -u /tmp/wrapper_scripts/apt.py update
 
+# the task generators read the versions of the binary packages from a
+# snapshot instead of loading the apt cache
+RUN python3 -u /tmp/wrapper_scripts/binary_package_versions.py /tmp/binary_package_versions.txt
+
 USER buildfarm
 ENTRYPOINT ["sh", "-c"]
 @{
@@ -67,7 +70,10 @@ cmds = [
     ' ' + rosdistro_name +
     ' ' + package_name +
     ' --sourcedeb-dir ' + binarydeb_dir +
-    (' --skip-download-sourcedeb' if skip_download_sourcedeb else ''),
+    (' --skip-download-sourcedeb' if skip_download_sourcedeb else '') +
+    ' --target-repository ' + target_repository +
+    ' --sources-os-code-name ' + os_code_name +
+    ' --sources-cache-dir /tmp/debian_repo_cache',
 ]
 
 if append_timestamp:
@@ -89,7 +95,10 @@ cmds.append(
     ' ' + arch +
     ' --distribution-repository-urls ' + ' '.join(distribution_repository_urls) +
     ' --distribution-repository-key-files ' + ' ' .join(['/tmp/keys/%d.key' % i for i in range(len(distribution_repository_keys))]) +
+    ' --binary-package-versions-file /tmp/binary_package_versions.txt' +
     ' --binarydeb-dir ' + binarydeb_dir +
-    ' --dockerfile-dir ' + dockerfile_dir)
+    ' --dockerfile-dir ' + dockerfile_dir +
+    (' --common-dependencies ' + ' '.join(common_dependencies) if common_dependencies else '') +
+    (' --base-image ' + base_image + ' --base-image-packages ' + ' '.join(base_image_packages) if base_image else ''))
 }@
 CMD ["@(' && '.join(cmds))"]
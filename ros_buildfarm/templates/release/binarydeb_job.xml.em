@@ -102,6 +102,7 @@ but disabled since the package is blacklisted (or not whitelisted) in the config
         ' ' + os_code_name +
         ' ' + arch +
         ' ' + ' '.join(repository_args) +
+        (' --base-image-registry ' + base_image_registry if base_image_registry else '') +
         ' --binarydeb-dir $WORKSPACE/binarydeb' +
         ' --dockerfile-dir $WORKSPACE/docker_generating_docker' +
         (' --append-timestamp' if append_timestamp else ''),
@@ -120,13 +121,16 @@ but disabled since the package is blacklisted (or not whitelisted) in the config
         'rm -fr $WORKSPACE/docker_build_binarydeb',
         'mkdir -p $WORKSPACE/binarydeb',
         'mkdir -p $WORKSPACE/docker_build_binarydeb',
+        '# persistent cache of the Sources index of the target repository',
+        'mkdir -p ~/.ros_buildfarm/debian_repo_cache',
         'docker run' +
         ' --rm ' +
         ' --cidfile=$WORKSPACE/docker_generating_docker/docker.cid' +
         ' -v $WORKSPACE/ros_buildfarm:/tmp/ros_buildfarm:ro' +
         ' -v $WORKSPACE/binarydeb:/tmp/binarydeb' +
         ' -v $WORKSPACE/docker_build_binarydeb:/tmp/docker_build_binarydeb' +
-        ' -v ~/.ccache:/home/buildfarm/.ccache' + \
+        ' -v ~/.ccache:/home/buildfarm/.ccache' +
+        ' -v ~/.ros_buildfarm/debian_repo_cache:/tmp/debian_repo_cache' +
         ' binarydeb_task_generation.%s_%s_%s_%s_%s' % (rosdistro_name, os_name, os_code_name, arch, pkg_name),
         'echo "# END SECTION"',
     ]),
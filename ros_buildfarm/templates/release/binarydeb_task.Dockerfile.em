@@ -1,12 +1,16 @@
 # generated from @template_name
 
 
+@[if base_image]@
+FROM @base_image
+@[else]@
 @(TEMPLATE(
     'snippet/from_base_image.Dockerfile.em',
     os_name=os_name,
     os_code_name=os_code_name,
     arch=arch,
 ))@
+@[end if]@
 MAINTAINER Dirk Thomas dthomas+buildfarm@@osrfoundation.org
 
 VOLUME ["/var/cache/apt/archives"]
@@ -60,6 +64,7 @@ RUN echo "@today_str"
     'snippet/install_dependencies.Dockerfile.em',
     dependencies=dependencies,
     dependency_versions=dependency_versions,
+    stable_dependency_count=stable_dependency_count,
 ))@
 
 USER buildfarm
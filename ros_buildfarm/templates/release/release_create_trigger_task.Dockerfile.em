@@ -48,6 +48,8 @@ cmd = \
     ' --cache-dir ' + cache_dir
 if missing_only:
     cmd += ' --missing-only'
+if roots_only:
+    cmd += ' --roots-only'
 if source_only:
     cmd += ' --source-only'
 }@
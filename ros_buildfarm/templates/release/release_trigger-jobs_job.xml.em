@@ -24,6 +24,7 @@
             <a class="string-array">
               <string>--missing-only --source-only</string>
               <string>--missing-only</string>
+              <string>--roots-only</string>
               <string>--source-only</string>
               <string> </string>
             </a>
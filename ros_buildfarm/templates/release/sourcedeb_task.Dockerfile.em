@@ -57,7 +57,8 @@ cmds = [
     ' ' + package_name +
     ' ' + os_name +
     ' ' + os_code_name +
-    ' --source-dir /tmp/sourcedeb/source',
+    ' --source-dir /tmp/sourcedeb/source' +
+    ' --git-mirror-cache-dir /tmp/git_mirror_cache',
 
     'PYTHONPATH=/tmp/ros_buildfarm:$PYTHONPATH python3 -u' +
     ' /tmp/ros_buildfarm/scripts/release/build_sourcedeb.py' +
@@ -10,15 +10,22 @@
 #
 # if there are more dependencies then the limit
 # the folding will generate exactly the number of lines as allowed by the limit
+#
+# the first stable dependencies are shared by many jobs
+# and are always installed in separate lines to reuse the same layers
+# (at most half of the lines)
 import math
 max_lines = 80
-fold_factor = 1.0 * len(dependencies) / max_lines
+stable_lines = min(stable_dependency_count, len(dependencies), max_lines // 2)
+remaining_dependencies = len(dependencies) - stable_lines
+remaining_lines = max_lines - stable_lines
+fold_factor = 1.0 * remaining_dependencies / remaining_lines
 # can be zero if no folding is necessary
 begin_entries_for_line = int(math.floor(fold_factor))
 # can be zero if there are no dependencies
 end_entries_for_line = int(math.ceil(fold_factor))
-number_of_begin_blocks = int(round((end_entries_for_line - fold_factor) * max_lines))
-switch_index = number_of_begin_blocks * begin_entries_for_line
+number_of_begin_blocks = int(round((end_entries_for_line - fold_factor) * remaining_lines))
+switch_index = stable_lines + number_of_begin_blocks * begin_entries_for_line
 
 def get_run_command(indices, dependencies, dependency_versions):
     cmds = []
@@ -33,8 +40,11 @@ def get_run_command(indices, dependencies, dependency_versions):
 @[if fold_factor > 1]@
 # to prevent exceeding the docker layer limit several lines have been folded
 @[end if]@
+@[for i in range(stable_lines)]@
+RUN @(get_run_command([i], dependencies, dependency_versions))
+@[end for]@
 @[if begin_entries_for_line]@
-@[for i in range(0, switch_index, begin_entries_for_line)]@
+@[for i in range(stable_lines, switch_index, begin_entries_for_line)]@
 @{
 indices = []
 for j in range(begin_entries_for_line):
@@ -0,0 +1,342 @@
+/* Render the status page from the separate data file.
+ *
+ * Only the rows which are currently visible are added to the DOM (plus a few
+ * rows above and below). Spacer rows keep the height of the table so that the
+ * scrollbar reflects all matching rows. Filtering and sorting only operate on
+ * the in-memory arrays. */
+
+var ROW_OVERSCAN = 20;
+
+var FLAG_DIFF = 1;
+var FLAG_SYNC = 2;
+var FLAG_REGRESSION = 4;
+var FLAG_BLOCKED = 8;
+var FLAG_ROOT_CAUSE = 16;
+
+var FLAG_QUERIES = {
+  'DIFF': FLAG_DIFF,
+  'SYNC': FLAG_SYNC,
+  'REGRESSION': FLAG_REGRESSION,
+  'BLOCKED': FLAG_BLOCKED,
+  'ROOT_CAUSE': FLAG_ROOT_CAUSE
+};
+
+var CELL_QUERIES = {
+  'BLUE': 'l',
+  'ORANGE': 'h',
+  'RED': 'm',
+  'YELLOW': 'o',
+  'GRAY': 'i'
+};
+
+function escape_html(text) {
+  return String(text)
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+window.load_status_page_data = function(url) {
+  var request = new XMLHttpRequest();
+  request.open('GET', url);
+  request.onload = function() {
+    if (request.status != 200 && request.status !== 0) {
+      $('#search-count').text('failed to load the data: ' + request.status);
+      return;
+    }
+    init_status_page(JSON.parse(request.responseText));
+  };
+  request.onerror = function() {
+    $('#search-count').text('failed to load the data');
+  };
+  request.send();
+};
+
+function init_status_page(data) {
+  var page = window.status_page = {
+    data: data,
+    packages: data.packages,
+    repo_count: data.repo_names.length,
+    target_count: data.targets.length,
+    row_height: null,
+    rows: [],
+    last_range: null
+  };
+
+  // the text of the meta columns used for searching and sorting
+  var pkgs = page.packages;
+  page.meta_texts = [];
+  for (var i = 0; i < data.package_count; i++) {
+    var texts = [pkgs.name[i]];
+    if (window.has_repository_column) texts.push(pkgs.repository_name[i] || '');
+    texts.push(pkgs.version[i] || '');
+    if (window.has_status_column) texts.push(pkgs.status[i] || '');
+    if (window.has_maintainer_column) {
+      texts.push($.map(pkgs.maintainers[i], function(m) { return m[0]; }).join(' '));
+    }
+    page.meta_texts.push(texts);
+  }
+  // name and version columns plus the optional columns
+  page.meta_column_count = 2 + window.has_repository_column +
+    window.has_status_column + window.has_maintainer_column;
+
+  // Populate the input box in the form.
+  if (window.queries) {
+    $('.search form input').val(decodeURIComponent(window.queries.replace(/\+/g, ' ')));
+  }
+
+  $('.search form input').on('input', function() {
+    var queries = $(this).val();
+    window.filter_timeout && clearTimeout(window.filter_timeout);
+    window.filter_timeout = setTimeout(function() {
+      window.queries = queries;
+      filter_rows();
+    }, 100);
+  });
+
+  // Disable submitting the form (eg, with an enter press).
+  $('.search form').on('submit', function() { return false; });
+
+  // Hook up click handlers to the keyword shortcuts.
+  $('.search a').on('click', function(e) {
+    e.preventDefault();
+    var url_parts = $(this).attr('href').split('?');
+    if (url_parts[1]) {
+      $.each(url_parts[1].split('&'), function(i, query_part) {
+        var key_val = query_part.split('=');
+        if (key_val[0] == 'q') {
+          window.queries = key_val[1];
+        }
+      });
+    }
+    $('.search form input').val(window.queries);
+    filter_rows();
+  });
+
+  // Hook up sort logic on click to table headers.
+  $('table.virtual thead th.sortable').on('click', function() {
+    var sort = $.inArray(this, $(this).parent().children()) + 1;
+    if (window.sort == sort) {
+      window.reverse = window.reverse ? 0 : 1;
+    } else {
+      window.sort = sort;
+      delete window.reverse;
+    }
+    filter_rows();
+  });
+
+  $(window).on('scroll', function() { render_rows(false); });
+  $(window).on('resize', function() { render_rows(true); });
+
+  filter_rows();
+}
+
+function get_query_terms() {
+  if (!window.queries) return [];
+  var terms = decodeURIComponent(String(window.queries)).split(/[+ ]/);
+  // Disregard short terms.
+  return $.grep(terms, function(term) { return term.length >= 3; });
+}
+
+function get_row_matcher(terms) {
+  var page = window.status_page;
+  var pkgs = page.packages;
+  var matchers = $.map(terms, function(term) {
+    if (term in FLAG_QUERIES) {
+      var flag = FLAG_QUERIES[term];
+      return [function(i) { return (pkgs.flags[i] & flag) !== 0; }];
+    }
+    if (term in CELL_QUERIES) {
+      var cell = CELL_QUERIES[term];
+      return [function(i) { return pkgs.cells[i].indexOf(cell) != -1; }];
+    }
+    var blocked_by = /^BLOCKED_BY:(.+)$/.exec(term);
+    if (blocked_by) {
+      // blocked by a specific missing package
+      return [function(i) { return $.inArray(blocked_by[1], pkgs.blocked_by[i]) != -1; }];
+    }
+    var match = /^RED([1-9])$/.exec(term);
+    if (match && parseInt(match[1]) <= page.repo_count) {
+      // missing in a specific repository
+      var repo_index = parseInt(match[1]) - 1;
+      return [function(i) {
+        var cells = pkgs.cells[i];
+        for (var j = repo_index; j < cells.length; j += page.repo_count) {
+          if (cells[j] == 'm') return true;
+        }
+        return false;
+      }];
+    }
+    var lower_term = term.toLowerCase();
+    return [function(i) {
+      var texts = page.meta_texts[i];
+      for (var j = 0; j < texts.length; j++) {
+        if (texts[j].indexOf(term) != -1) return true;
+      }
+      return texts[0].toLowerCase().indexOf(lower_term) != -1;
+    }];
+  });
+  return function(i) {
+    for (var j = 0; j < matchers.length; j++) {
+      if (!matchers[j](i)) return false;
+    }
+    return true;
+  };
+}
+
+function filter_rows() {
+  var page = window.status_page;
+  var terms = get_query_terms();
+  var matcher = get_row_matcher(terms);
+  var rows = [];
+  for (var i = 0; i < page.data.package_count; i++) {
+    if (matcher(i)) rows.push(i);
+  }
+
+  if (window.sort) {
+    var column = parseInt(window.sort) - 1;
+    var order = window.reverse == 1 ? -1 : 1;
+    if (column >= 0 && column < page.meta_column_count) {
+      rows.sort(function(a, b) {
+        var text_a = page.meta_texts[a][column];
+        var text_b = page.meta_texts[b][column];
+        if (text_a > text_b) return order;
+        if (text_a < text_b) return -order;
+        return a - b;
+      });
+    }
+  }
+
+  page.rows = rows;
+  $('#search-count').text(
+    'showing ' + rows.length + ' of ' + page.data.package_count + ' total');
+  render_rows(true);
+  update_url();
+}
+
+function render_rows(force) {
+  var page = window.status_page;
+  if (!page) return;
+  var tbody = $('table.virtual tbody');
+  var row_height = page.row_height || 27;
+  var top = tbody.offset().top;
+  var first = Math.floor(($(window).scrollTop() - top) / row_height) - ROW_OVERSCAN;
+  // keep the alternating row colors stable while scrolling
+  first = Math.max(0, first - first % 2);
+  var count = Math.ceil($(window).height() / row_height) + 2 * ROW_OVERSCAN;
+  var last = Math.min(page.rows.length, first + count);
+  if (!force && page.last_range &&
+      page.last_range[0] == first && page.last_range[1] == last) {
+    return;
+  }
+  page.last_range = [first, last];
+
+  var column_count = page.meta_column_count + page.target_count;
+  // the top spacer row is always present to keep the alternating row colors
+  var html = ['<tr class="spacer"><td colspan="' + column_count +
+    '" style="height: ' + first * row_height + 'px"></td></tr>'];
+  for (var i = first; i < last; i++) {
+    html.push(render_row(page.rows[i]));
+  }
+  if (last < page.rows.length) {
+    html.push('<tr class="spacer"><td colspan="' + column_count +
+      '" style="height: ' + (page.rows.length - last) * row_height + 'px"></td></tr>');
+  }
+  tbody.html(html.join(''));
+
+  if (!page.row_height && last > first) {
+    // measure the actual row height once and render again if it differs
+    var measured = $('tr:not(.spacer)', tbody).first().height();
+    if (measured) {
+      page.row_height = measured;
+      if (measured != row_height) render_rows(true);
+    }
+  }
+}
+
+function render_row(i) {
+  var page = window.status_page;
+  var pkgs = page.packages;
+  var name = pkgs.name[i];
+  var html = ['<tr><td><div>'];
+  if (pkgs.url[i]) {
+    html.push('<a href="' + escape_html(pkgs.url[i]) + '">' + escape_html(name) + '</a>');
+  } else {
+    html.push(escape_html(name));
+  }
+  html.push('</div></td>');
+  if (window.has_repository_column) {
+    html.push('<td><div class="repo">');
+    var repository_name = escape_html(pkgs.repository_name[i] || '');
+    if (pkgs.repository_url[i]) {
+      html.push('<a href="' + escape_html(pkgs.repository_url[i]) + '">' + repository_name + '</a>');
+    } else {
+      html.push(repository_name);
+    }
+    html.push('</div></td>');
+  }
+  html.push('<td><span>' + escape_html(pkgs.version[i] || '') + '</span></td>');
+  if (window.has_status_column) {
+    html.push('<td><span class="' + escape_html(pkgs.status[i] || '') + '"');
+    if (pkgs.status_description[i]) {
+      html.push(' title="' + escape_html(pkgs.status_description[i]) + '"');
+    }
+    html.push('></span></td>');
+  }
+  if (window.has_maintainer_column) {
+    html.push('<td class="main"><div>');
+    $.each(pkgs.maintainers[i], function(j, m) {
+      html.push('<a href="mailto:' + escape_html(m[1]) + '">' + escape_html(m[0]) + '</a>');
+    });
+    html.push('</div></td>');
+  }
+
+  var cells = pkgs.cells[i];
+  var versions = pkgs.cell_versions[i];
+  var version_index = 0;
+  for (var t = 0; t < page.target_count; t++) {
+    html.push('<td>');
+    for (var r = 0; r < page.repo_count; r++) {
+      var cell = cells.charAt(t * page.repo_count + r);
+      var version = pkgs.version[i];
+      var css_class = '';
+      if (cell == 'm' || cell == 'i') {
+        version = 'None';
+        css_class = cell;
+      } else if (cell != '_') {
+        version = versions[version_index++];
+        css_class = cell;
+      }
+      html.push('<a');
+      if (css_class) html.push(' class="' + css_class + '"');
+      html.push(' title="' + escape_html(window.repos[r] + ': ' + version) + '"');
+      if (r === 0 && t < window.job_url_templates.length && cell != 'i') {
+        html.push(' href="' + escape_html(window.job_url_templates[t].replace('{pkg}', name)) + '"');
+      }
+      html.push('>');
+      if (cell != '_' && cell != 'm' && cell != 'i') html.push(escape_html(version));
+      html.push('</a>');
+    }
+    html.push('</td>');
+  }
+  html.push('</tr>');
+  return html.join('');
+}
+
+function update_url() {
+  if (!window.history || !window.history.replaceState) return;
+  var qs = [];
+  if (window.queries) qs.push('q=' + window.queries);
+  if (window.sort) qs.push('s=' + window.sort);
+  if (window.reverse) qs.push('r=' + window.reverse);
+  var url = document.location.origin + document.location.pathname;
+  if (qs.length > 0) {
+    url += '?' + qs.join('&');
+  }
+  try {
+    window.history.replaceState({}, document.title, url);
+  } catch (e) {
+    // ignore potential SecurityError when using file:// url
+  }
+}
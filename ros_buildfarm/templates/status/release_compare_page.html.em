@@ -4,15 +4,15 @@
   <title>@title - @start_time_local_str</title>
   <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>
 
-  <script type="text/javascript" src="js/moment.min.js"></script>
-  <script type="text/javascript" src="js/zepto.min.js"></script>
+  <script type="text/javascript" src="@(resource_urls['moment.min.js'])"></script>
+  <script type="text/javascript" src="@(resource_urls['zepto.min.js'])"></script>
   <script type="text/javascript">
     window.META_COLUMNS = 2;
   </script>
-  <script type="text/javascript" src="js/setup.js?@(resource_hashes['setup.js'])"></script>
+  <script type="text/javascript" src="@(resource_urls['setup.js'])"></script>
 
-  <link rel="stylesheet" type="text/css" href="css/status_page.css?@(resource_hashes['status_page.css'])" />
-  <link rel="stylesheet" type="text/css" href="css/compare_page.css?@(resource_hashes['compare_page.css'])" />
+  <link rel="stylesheet" type="text/css" href="@(resource_urls['status_page.css'])" />
+  <link rel="stylesheet" type="text/css" href="@(resource_urls['compare_page.css'])" />
 </head>
 <body>
   <script type="text/javascript">
@@ -0,0 +1,70 @@
+<!DOCTYPE html>
+<html>
+<head>
+  <title>@title - @start_time_local_str</title>
+  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>
+
+  <script type="text/javascript" src="@(resource_urls['moment.min.js'])"></script>
+  <script type="text/javascript" src="@(resource_urls['zepto.min.js'])"></script>
+  <script type="text/javascript">
+    window.META_COLUMNS = 6;
+  </script>
+  <script type="text/javascript" src="@(resource_urls['setup.js'])"></script>
+
+  <link rel="stylesheet" type="text/css" href="@(resource_urls['status_page.css'])" />
+  <link rel="stylesheet" type="text/css" href="@(resource_urls['changes_page.css'])" />
+</head>
+<body>
+  <script type="text/javascript">
+    window.body_ready_with_age(moment.duration(moment() - moment("@start_time", "X")));
+  </script>
+  <div class="top logo search">
+    <h1><img src="http://wiki.ros.org/custom/images/ros_org.png" alt="ROS.org" width="150" height="32" /></h1>
+    <h2>@title</h2>
+    <p>Quick filter:
+      <a href="?q=" title="Show all changes">*</a>,
+      <a href="?q=ADDED" title="Filter packages which have been added to a repository">ADDED</a>,
+      <a href="?q=REMOVED" title="Filter packages which have been removed from a repository">REMOVED</a>,
+      <a href="?q=UPGRADED" title="Filter packages which have a higher version">UPGRADED</a>,
+      <a href="?q=DOWNGRADED" title="Filter packages which have a lower version">DOWNGRADED</a>
+    </p>
+    <form action="?">
+      <input type="text" name="q" id="q" />
+      <p id="search-count"></p>
+    </form>
+  </div>
+  <div class="top runs">
+    <p>
+@[if previous_run]@
+      Changes between @(previous_run_local_str) and @(start_time_local_str).
+@[else]@
+      This is the first recorded run, the next run will show the changes.
+@[end if]@
+    </p>
+    <p><a href="@(status_page_name).html">Back to the status page</a></p>
+  </div>
+  <div class="top age">
+    <p>This should show the age of the page...</p>
+  </div>
+  <table>
+    <caption></caption>
+    <thead>
+      <tr>
+        <th class="sortable"><div>Name</div></th>
+        <th class="sortable"><div>Target</div></th>
+        <th class="sortable"><div>Repo</div></th>
+        <th class="sortable"><div>Old version</div></th>
+        <th class="sortable"><div>New version</div></th>
+        <th class="sortable"><div>Change</div></th>
+      </tr>
+    </thead>
+    <tbody>
+      <script type="text/javascript">window.tbody_ready();</script>
+@[for change, change_type in changes]@
+      <tr><td><div>@(change.package)</div></td><td><div>@(change.target.os_code_name) @(change.target.arch)</div></td><td><div>@(change.repository)</div></td><td><span>@(change.old_version or '')</span></td><td><span>@(change.new_version or '')</span></td><td><div class="@(change_type)">@(change_type.upper())</div></td></tr>
+@[end for]@
+    </tbody>
+  </table>
+  <script type="text/javascript">window.body_done();</script>
+</body>
+</html>
@@ -4,8 +4,8 @@
   <title>@title - @start_time_local_str</title>
   <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>
 
-  <script type="text/javascript" src="js/moment.min.js"></script>
-  <script type="text/javascript" src="js/zepto.min.js"></script>
+  <script type="text/javascript" src="@(resource_urls['moment.min.js'])"></script>
+  <script type="text/javascript" src="@(resource_urls['zepto.min.js'])"></script>
   <script type="text/javascript">
     window.VERSION_COLUMN = 2;
 @[if has_repository_column]@
@@ -35,9 +35,9 @@
 @[end if]@
     ];
   </script>
-  <script type="text/javascript" src="js/setup.js?@(resource_hashes['setup.js'])"></script>
+  <script type="text/javascript" src="@(resource_urls['setup.js'])"></script>
 
-  <link rel="stylesheet" type="text/css" href="css/status_page.css?@(resource_hashes['status_page.css'])" />
+  <link rel="stylesheet" type="text/css" href="@(resource_urls['status_page.css'])" />
 </head>
 <body>
   <script type="text/javascript">
@@ -53,6 +53,10 @@
 @[end if]@
 @[if regressions]@
       <a href="?q=REGRESSION" title="Filter packages which disappear by a sync from testing / shadow-fixed to main / ros / public">REGRESSION</a>,
+@[end if]@
+@[if root_causes]@
+      <a href="?q=BLOCKED" title="Filter packages which are missing because a dependency is missing">BLOCKED</a>,
+      <a href="?q=ROOT_CAUSE" title="Filter missing packages which block other packages without being blocked themselves">ROOT_CAUSE</a>,
 @[end if]@
       <a href="?q=DIFF" title="Filter packages which are different between architectures">DIFF</a>,
       <a href="?q=BLUE">BLUE</a>,
@@ -82,6 +86,16 @@
       <li><a class="i"></a> intentionally missing</li>
     </ul>
   </div>
+@[if root_causes]@
+  <div class="top blocked">
+    <p>Missing packages blocking the most packages:</p>
+    <ul>
+@[for root_cause, count in sorted(root_causes.items(), key=lambda item: (-item[1], item[0]))[:10]]@
+      <li><a href="?q=BLOCKED_BY:@(root_cause)" title="Filter packages blocked by @(root_cause)">@(root_cause)</a> (@(count))</li>
+@[end for]@
+    </ul>
+  </div>
+@[end if]@
   <div class="top age">
     <p>This should show the age of the page...</p>
   </div>
@@ -112,95 +126,7 @@
     <tbody @(' class="longversion"' if not has_repository_column and not has_status_column and not has_maintainer_column else '')>
       <script type="text/javascript">window.tbody_ready();</script>
 
-@[for pkg in ordered_pkgs]@
-<tr>@
-@
-@# package name and hidden keywords
-@
-<td>@
-@ <div>@
-@ @ @[if pkg.url]@
-@ @ <a href="@pkg.url">@
-@ @ @[end if]@
-@ @ @pkg.name@
-@ @ @[if pkg.url]@
-@ @ </a>@
-@ @ @[end if]@
-@ </div>@
-@{
-hidden_texts = []
-if not homogeneous[pkg.name]:
-    hidden_texts.append('DIFF')
-if affected_by_sync and True in affected_by_sync[pkg.name].values():
-    hidden_texts.append('SYNC')
-if regressions and True in regressions[pkg.name].values():
-    hidden_texts.append('REGRESSION')
-}@
-@ @[if hidden_texts]@
-@ @  <span class="ht">@(' '.join(hidden_texts))</span>@
-@ @[end if]@
-</td>@
-@
-@# repository name
-@
-@[if has_repository_column]@
-<td>@
-@ <div class="repo">@
-@ @ @[if pkg.repository_url]@
-@ @ @ <a href="@pkg.repository_url">@
-@ @ @[end if]@
-@ @ @ @pkg.repository_name@
-@ @ @[if pkg.repository_url]@
-@ @ @ </a>@
-@ @ @[end if]@
-@ </div>@
-</td>@
-@[end if]@
-@
-@# package version
-@
-<td><span>@pkg.version</span></td>@
-@
-@# package status
-@
-@[if has_status_column]@
-<td><span class="@pkg.status"@((' title="%s"' % pkg.status_description) if pkg.status_description else '')/></td>@
-@[end if]@
-@
-@# package maintainers
-@
-@[if has_maintainer_column]@
-<td class="main">@
-@ <div>@
-@ @ @[for m in pkg.maintainers]@
-@ @ @ <a href="mailto:@m.email">@m.name</a>@
-@ @ @[end for]@
-@ </div>@
-</td>@
-@[end if]@
-@
-@[for target in targets]@
-@
-@# a column for each target
-@
-<td>@
-@ @[for i, status in enumerate(version_status[pkg.name][target])]@
-@
-@ @# a square for each repo
-@
-@ @ @[if status == 'equal' and repos_data[i][target][pkg.debian_name] == pkg.version]@
-@ @ @ <a/>@
-@ @ @[elif status in ['ignore', 'missing']]@
-@ @ @ <a class="@status[0]"/>@
-@ @ @[else]@
-@ @ @ <a class="@status[0]">@repos_data[i][target][pkg.debian_name]</a>@
-@ @ @[end if]@
-@ @[end for]@
-</td>@
-@[end for]@
-@
-</tr>
-@[end for]@
+@(''.join(rows))@
 
     </tbody>
   </table>
@@ -76,9 +76,9 @@
         '',
         'echo "# BEGIN SECTION: Run Dockerfile - status page"',
         'rm -fr $WORKSPACE/debian_repo_cache',
-        'rm -fr $WORKSPACE/status_page',
         'mkdir -p $WORKSPACE/debian_repo_cache',
         'mkdir -p $WORKSPACE/status_page',
+        'mkdir -p $WORKSPACE/status_page_state',
         'docker run' +
         ' --rm ' +
         ' --cidfile=$WORKSPACE/docker_generate_status_page/docker.cid' +
@@ -86,6 +86,7 @@
         ' -v $WORKSPACE/ros_buildfarm:/tmp/ros_buildfarm:ro' +
         ' -v $WORKSPACE/debian_repo_cache:/tmp/debian_repo_cache' +
         ' -v $WORKSPACE/status_page:/tmp/status_page' +
+        ' -v $WORKSPACE/status_page_state:/tmp/status_page_state' +
         ' status_page_generation',
         'echo "# END SECTION"',
     ]),
@@ -0,0 +1,95 @@
+@[for pkg in ordered_pkgs]@
+<tr>@
+@
+@# package name and hidden keywords
+@
+<td>@
+@ <div>@
+@ @ @[if pkg.url]@
+@ @ <a href="@pkg.url">@
+@ @ @[end if]@
+@ @ @pkg.name@
+@ @ @[if pkg.url]@
+@ @ </a>@
+@ @ @[end if]@
+@ </div>@
+@{
+hidden_texts = []
+if not homogeneous[pkg.name]:
+    hidden_texts.append('DIFF')
+if affected_by_sync and True in affected_by_sync[pkg.name].values():
+    hidden_texts.append('SYNC')
+if regressions and True in regressions[pkg.name].values():
+    hidden_texts.append('REGRESSION')
+if blocked_by and blocked_by[pkg.name]:
+    hidden_texts.append('BLOCKED')
+    hidden_texts += ['BLOCKED_BY:%s' % name for name in blocked_by[pkg.name]]
+if root_causes and pkg.name in root_causes:
+    hidden_texts.append('ROOT_CAUSE')
+}@
+@ @[if hidden_texts]@
+@ @  <span class="ht">@(' '.join(hidden_texts))</span>@
+@ @[end if]@
+</td>@
+@
+@# repository name
+@
+@[if has_repository_column]@
+<td>@
+@ <div class="repo">@
+@ @ @[if pkg.repository_url]@
+@ @ @ <a href="@pkg.repository_url">@
+@ @ @[end if]@
+@ @ @ @pkg.repository_name@
+@ @ @[if pkg.repository_url]@
+@ @ @ </a>@
+@ @ @[end if]@
+@ </div>@
+</td>@
+@[end if]@
+@
+@# package version
+@
+<td><span>@pkg.version</span></td>@
+@
+@# package status
+@
+@[if has_status_column]@
+<td><span class="@pkg.status"@((' title="%s"' % pkg.status_description) if pkg.status_description else '')/></td>@
+@[end if]@
+@
+@# package maintainers
+@
+@[if has_maintainer_column]@
+<td class="main">@
+@ <div>@
+@ @ @[for m in pkg.maintainers]@
+@ @ @ <a href="mailto:@m.email">@m.name</a>@
+@ @ @[end for]@
+@ </div>@
+</td>@
+@[end if]@
+@
+@[for target in targets]@
+@
+@# a column for each target
+@
+<td>@
+@ @[for i, status in enumerate(version_status[pkg.name][target])]@
+@
+@ @# a square for each repo
+@
+@ @ @[if status == 'equal' and repos_data[i][target][pkg.debian_name] == pkg.version]@
+@ @ @ <a/>@
+@ @ @[elif status in ['ignore', 'missing']]@
+@ @ @ <a class="@status[0]"/>@
+@ @ @[else]@
+@ @ @ <a class="@status[0]">@repos_data[i][target][pkg.debian_name]</a>@
+@ @ @[end if]@
+@ @[end for]@
+</td>@
+@[end for]@
+@
+</tr>
+@(row_separator)@
+@[end for]@
@@ -0,0 +1,121 @@
+<!DOCTYPE html>
+<html>
+<head>
+  <title>@title - @start_time_local_str</title>
+  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>
+
+  <script type="text/javascript" src="@(resource_urls['moment.min.js'])"></script>
+  <script type="text/javascript" src="@(resource_urls['zepto.min.js'])"></script>
+  <script type="text/javascript">
+    window.repos = [];
+@[for repo_name in repo_names]@
+    window.repos.push('@repo_name');
+@[end for]@
+
+    window.job_url_templates = [
+@[if jenkins_job_urls]@
+@[for target in targets]@
+      '@jenkins_job_urls[target]',
+@[end for]@
+@[end if]@
+    ];
+
+    window.has_repository_column = @('true' if has_repository_column else 'false');
+    window.has_status_column = @('true' if has_status_column else 'false');
+    window.has_maintainer_column = @('true' if has_maintainer_column else 'false');
+  </script>
+  <script type="text/javascript" src="@(resource_urls['setup.js'])"></script>
+  <script type="text/javascript" src="@(resource_urls['status_page_data.js'])"></script>
+
+  <link rel="stylesheet" type="text/css" href="@(resource_urls['status_page.css'])" />
+</head>
+<body>
+  <script type="text/javascript">
+    window.body_ready_with_age(moment.duration(moment() - moment("@start_time", "X")));
+  </script>
+  <div class="top logo search">
+    <h1><img src="http://wiki.ros.org/custom/images/ros_org.png" alt="ROS.org" width="150" height="32" /></h1>
+    <h2>@title</h2>
+    <p>Quick filter:
+      <a href="?q=" title="Show all packages">*</a>,
+@[if affected_by_sync]@
+      <a href="?q=SYNC" title="Filter packages which are affected by a sync from testing / shadow-fixed to main / ros / public">SYNC</a>,
+@[end if]@
+@[if regressions]@
+      <a href="?q=REGRESSION" title="Filter packages which disappear by a sync from testing / shadow-fixed to main / ros / public">REGRESSION</a>,
+@[end if]@
+@[if root_causes]@
+      <a href="?q=BLOCKED" title="Filter packages which are missing because a dependency is missing">BLOCKED</a>,
+      <a href="?q=ROOT_CAUSE" title="Filter missing packages which block other packages without being blocked themselves">ROOT_CAUSE</a>,
+@[end if]@
+      <a href="?q=DIFF" title="Filter packages which are different between architectures">DIFF</a>,
+      <a href="?q=BLUE">BLUE</a>,
+      <a href="?q=RED">RED</a>,
+      <a href="?q=ORANGE">ORANGE</a>,
+      <a href="?q=YELLOW">YELLOW</a>,
+      <a href="?q=GRAY">GRAY</a>
+    </p>
+    <form action="?">
+      <input type="text" name="q" id="q" />
+      <p id="search-count">loading...</p>
+    </form>
+  </div>
+  <div class="top legend">
+    <ul class="squares">
+      <li>
+@[for repo_name, repo_url in zip(repo_names, repo_urls)]@
+        <a class="w" href="@repo_url" title="@repo_name"></a>
+@[end for]@
+        the repositories
+      </li>
+      <li><a class=""></a> same version</li>
+      <li><a class="l"></a> lower version</li>
+      <li><a class="h"></a> higher version</li>
+      <li><a class="m"></a> missing</li>
+      <li><a class="o"></a> obsolete</li>
+      <li><a class="i"></a> intentionally missing</li>
+    </ul>
+  </div>
+@[if root_causes]@
+  <div class="top blocked">
+    <p>Missing packages blocking the most packages:</p>
+    <ul>
+@[for root_cause, count in sorted(root_causes.items(), key=lambda item: (-item[1], item[0]))[:10]]@
+      <li><a href="?q=BLOCKED_BY:@(root_cause)" title="Filter packages blocked by @(root_cause)">@(root_cause)</a> (@(count))</li>
+@[end for]@
+    </ul>
+  </div>
+@[end if]@
+  <div class="top age">
+    <p>This should show the age of the page...</p>
+  </div>
+  <table class="virtual">
+    <caption></caption>
+    <thead>
+      <tr>
+        <th class="sortable"><div>Name</div></th>
+@[if has_repository_column]@
+        <th class="sortable"><div>Repo</div></th>
+@[end if]@
+        <th class="sortable"><div>Version</div></th>
+@[if has_status_column]@
+        <th class="sortable"><div>Status</div></th>
+@[end if]@
+@[if has_maintainer_column]@
+        <th class="sortable"><div>Maintainer</div></th>
+@[end if]@
+@[for target in targets]@
+        <th><div>@(target.os_code_name[0].upper())@(short_arches[target.arch])</div>@
+@[for count in package_counts[target]]@
+<span class="sum">@count</span>@
+@[end for]@
+</th>
+@[end for]@
+      </tr>
+    </thead>
+    <tbody@(' class="longversion"' if not has_repository_column and not has_status_column and not has_maintainer_column else '')>
+    </tbody>
+  </table>
+  <script type="text/javascript">window.load_status_page_data('@data_filename?@(int(start_time))');</script>
+</body>
+</html>
@@ -45,6 +45,8 @@ cmd = \
     ' ' + release_build_name + \
     ' --cache-dir /tmp/debian_repo_cache' + \
     ' --output-dir /tmp/status_page' + \
+    ' --state-dir /tmp/status_page_state' + \
+    ' --history-file /tmp/status_page_state/history.sqlite3' + \
     ' --copy-resources'
 }@
 CMD ["@cmd"]
@@ -41,9 +41,9 @@
     'builder_shell',
     script='\n'.join([
         'rm -fr $WORKSPACE/debian_repo_cache',
-        'rm -fr $WORKSPACE/status_page',
         'mkdir -p $WORKSPACE/debian_repo_cache',
         'mkdir -p $WORKSPACE/status_page',
+        'mkdir -p $WORKSPACE/status_page_state',
     ]),
 ))@
 @[for status_page_name in sorted(status_pages.keys())]@
@@ -63,7 +63,9 @@ os_code_name_and_arch_tuples = status_page['os_code_name_and_arch_tuples']
         ' '.join(os_code_name_and_arch_tuples) +
         ' --cache-dir $WORKSPACE/debian_repo_cache' +
         ' --output-name %s_%s' % (rosdistro_name, status_page_name) +
-        ' --output-dir $WORKSPACE/status_page',
+        ' --output-dir $WORKSPACE/status_page' +
+        ' --state-dir $WORKSPACE/status_page_state' +
+        ' --history-file $WORKSPACE/status_page_state/history.sqlite3',
         'echo "# END SECTION"',
     ]),
 ))@
@@ -0,0 +1,204 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import json
+import os
+import sys
+import time
+
+# the environment variable naming a file to append timing records to
+TIMING_FILE_ENVIRONMENT_VARIABLE = 'ROS_BUILDFARM_TIMING_FILE'
+
+
+def get_resource_usage():
+    """
+    Get the current wall time, CPU time and peak memory usage.
+
+    The CPU time includes all terminated child processes.
+    The peak memory usage is the maximum resident set size of this process
+    and its largest child process so far.
+    """
+    cpu_time = sum(os.times()[:4])
+    peak_rss_kib = None
+    try:
+        import resource
+    except ImportError:
+        pass
+    else:
+        peak_rss_kib = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return {
+        'wall_time': time.time(),
+        'cpu_time': cpu_time,
+        'peak_rss_kib': peak_rss_kib,
+    }
+
+
+class PeakRssMeasurement(object):
+    """
+    Measure the peak memory usage of a section.
+
+    The peak resident set size of the process is reset when the measurement
+    starts (by writing to ``/proc/self/clear_refs``) and read from
+    ``VmHWM`` in ``/proc/self/status`` when it stops.
+    Child processes are included if one of them terminated during the
+    section with a higher peak than all previously terminated children.
+    Since resetting the peak affects all measurements of the process the
+    peak so far is carried over to the enclosing measurements.
+    If the peak can't be reset ``resettable`` is false and the result is the
+    peak over the whole lifetime of the process.
+    """
+
+    _active = []
+
+    def __init__(self):
+        self._children_start = _get_children_peak_rss_kib()
+        current_peak = _get_process_peak_rss_kib()
+        for measurement in PeakRssMeasurement._active:
+            measurement._peak = max(measurement._peak, current_peak or 0)
+        self.resettable = _reset_process_peak_rss()
+        self._peak = 0 if self.resettable else (current_peak or 0)
+        PeakRssMeasurement._active.append(self)
+
+    def stop(self):
+        """Get the peak memory usage in KiB or ``None`` if unknown."""
+        if self in PeakRssMeasurement._active:
+            PeakRssMeasurement._active.remove(self)
+        process_peak = _get_process_peak_rss_kib()
+        children_end = _get_children_peak_rss_kib()
+        if process_peak is None and children_end is None:
+            return None
+        peak = max(self._peak, process_peak or 0)
+        if children_end is not None and \
+                children_end > (self._children_start or 0):
+            peak = max(peak, children_end)
+        return peak
+
+
+def _reset_process_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as h:
+            h.write('5')
+    except (IOError, OSError):
+        return False
+    return True
+
+
+def _get_process_peak_rss_kib():
+    try:
+        with open('/proc/self/status', 'r') as h:
+            for line in h:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except (IOError, OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _get_children_peak_rss_kib():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+
+def write_timing_record(filename, record):
+    # a single write of a short line is atomic when appending
+    # so that concurrent processes can share the same file
+    line = json.dumps(record, sort_keys=True) + '\n'
+    try:
+        with open(filename, 'a') as h:
+            h.write(line)
+    except (IOError, OSError) as e:
+        print("Failed to write timing record to '%s': %s" % (filename, e),
+              file=sys.stderr)
+
+
+def read_timing_records(filenames):
+    """
+    Read the timing records from multiple JSON lines files.
+
+    Lines which can't be parsed (e.g. truncated by a killed job) are skipped.
+    """
+    records = []
+    for filename in filenames:
+        with open(filename, 'r') as h:
+            for line in h:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def aggregate_timing_records(records, group_by_script=True):
+    """
+    Aggregate timing records per phase.
+
+    :param group_by_script: The flag if phases with the same name from
+      different scripts should be reported separately
+    :returns: A list of dicts with the statistics of every phase ordered by
+      descending total wall time
+    """
+    groups = {}
+    for record in records:
+        key = (record.get('script') if group_by_script else None,
+               record.get('phase', record.get('description')))
+        groups.setdefault(key, []).append(record)
+
+    report = []
+    for (script, phase), group in groups.items():
+        wall_times = sorted(r['wall_time'] for r in group)
+        peak_rss = [
+            r['peak_rss_kib'] for r in group
+            if r.get('peak_rss_kib') is not None]
+        report.append({
+            'script': script,
+            'phase': phase,
+            'count': len(group),
+            'failed': len([r for r in group if r.get('failed')]),
+            'total_wall_time': sum(wall_times),
+            'mean_wall_time': sum(wall_times) / len(wall_times),
+            'median_wall_time': _get_percentile(wall_times, 50),
+            'p90_wall_time': _get_percentile(wall_times, 90),
+            'max_wall_time': wall_times[-1],
+            'total_cpu_time': sum(r.get('cpu_time', 0) for r in group),
+            'max_peak_rss_kib': max(peak_rss) if peak_rss else None,
+        })
+    report.sort(key=lambda p: (-p['total_wall_time'], p['phase']))
+    return report
+
+
+def _get_percentile(sorted_values, percentile):
+    # nearest rank
+    index = int(round(percentile / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def format_duration(seconds):
+    if seconds < 60:
+        return '%.1fs' % seconds
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return '%dmin %ds' % (minutes, seconds)
+    hours, minutes = divmod(minutes, 60)
+    return '%dh %dmin' % (hours, minutes)
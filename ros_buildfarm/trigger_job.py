@@ -17,8 +17,11 @@ from rosdistro import get_index
 from ros_buildfarm.jenkins import connect
 from ros_buildfarm.jenkins import invoke_job
 
+from .blocked_packages import get_blocked_packages
+from .blocked_packages import get_topological_order
 from .common import get_binarydeb_job_name
 from .common import get_debian_package_name
+from .common import get_release_dependency_names
 from .common import get_sourcedeb_job_name
 from .common import Target
 from rosdistro import get_cached_distribution
@@ -31,7 +34,20 @@ from .templates import expand_template
 
 def trigger_release_jobs(
         config_url, rosdistro_name, release_build_name,
-        missing_only, source_only, cache_dir, cause=None, groovy_script=None):
+        missing_only, source_only, cache_dir, cause=None, groovy_script=None,
+        roots_only=False):
+    """
+    Trigger the release jobs of a build file.
+
+    :param missing_only: only trigger jobs whose artifacts are missing or
+      outdated in the repository
+    :param roots_only: additionally skip binary jobs whose artifacts are
+      missing because the artifacts of any of their dependencies are missing
+      too, they are triggered as downstream jobs once their root causes have
+      been built (implies ``missing_only``)
+    """
+    if roots_only:
+        missing_only = True
     config = get_config_index(config_url)
     build_files = get_release_build_files(config, rosdistro_name)
     build_file = build_files[release_build_name]
@@ -68,6 +84,11 @@ def trigger_release_jobs(
     pkg_names = dist_file.release_packages.keys()
     pkg_names = build_file.filter_packages(pkg_names)
 
+    blocked_by_target = {}
+    if roots_only:
+        blocked_by_target = _get_blocked_packages_by_target(
+            rosdistro_name, dist_file, pkg_names, targets, repo_data)
+
     triggered_jobs = []
     skipped_jobs = []
     for pkg_name in sorted(pkg_names):
@@ -111,6 +132,13 @@ def trigger_release_jobs(
                                "already up-to-date") % job_name)
                         continue
 
+            blocked = blocked_by_target.get(target, {})
+            if pkg_name in blocked:
+                print(("  Skipping job '%s' since it is blocked by the " +
+                       "missing packages: %s") %
+                      (job_name, ', '.join(sorted(blocked[pkg_name]))))
+                continue
+
             if groovy_script is None:
                 success = invoke_job(jenkins, job_name, cause=cause)
             else:
@@ -132,3 +160,40 @@ def trigger_release_jobs(
         content = expand_template('release/trigger_jobs.groovy.em', data)
         with open(groovy_script, 'w') as h:
             h.write(content)
+
+
+def _get_blocked_packages_by_target(
+        rosdistro_name, dist_file, pkg_names, targets, repo_data):
+    from catkin_pkg.package import InvalidPackage, parse_package_string
+    pkg_names = set(pkg_names)
+    dependencies = {}
+    for pkg_name in pkg_names:
+        dependencies[pkg_name] = set([])
+        pkg_xml = dist_file.get_release_package_xml(pkg_name)
+        if pkg_xml is None:
+            continue
+        try:
+            pkg = parse_package_string(pkg_xml)
+        except InvalidPackage:
+            continue
+        dependencies[pkg_name] = set([
+            name for name in get_release_dependency_names(pkg)
+            if name in pkg_names])
+
+    order = get_topological_order(dependencies)
+    blocked_by_target = {}
+    for target in targets:
+        if target.arch == 'source':
+            continue
+        repo_index = repo_data[target]
+        missing_pkg_names = set([
+            pkg_name for pkg_name in pkg_names
+            if get_debian_package_name(rosdistro_name, pkg_name)
+            not in repo_index])
+        blocked_by_target[target] = get_blocked_packages(
+            dependencies, missing_pkg_names, order=order)
+        print("Found %d missing packages for '%s %s %s', %d of them are "
+              'blocked by missing dependencies' %
+              (len(missing_pkg_names), target.os_name, target.os_code_name,
+               target.arch, len(blocked_by_target[target])))
+    return blocked_by_target
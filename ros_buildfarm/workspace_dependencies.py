@@ -0,0 +1,167 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+def get_run_dependencies(pkg):
+    return pkg.build_export_depends + pkg.buildtool_export_depends + \
+        pkg.exec_depends
+
+
+class WorkspaceDependencies(object):
+    """
+    Index of the run dependencies between the packages of a workspace.
+
+    The recursive run dependencies within the workspace are computed once per
+    strongly connected component of the run dependency graph and memoized
+    instead of traversing the graph again for every package.
+    """
+
+    def __init__(self, pkgs):
+        self._pkgs_by_name = dict([(pkg.name, pkg) for pkg in pkgs])
+        self._run_depends_in_workspace = {}
+        for pkg in self._pkgs_by_name.values():
+            self._run_depends_in_workspace[pkg.name] = sorted(set([
+                d.name for d in get_run_dependencies(pkg)
+                if d.name in self._pkgs_by_name]))
+        self._closures = None
+
+    def get_recursive_run_depends_in_workspace(self, pkg_name):
+        """
+        Get the workspace packages reachable through run dependencies.
+
+        :returns: A ``frozenset`` of package names including the passed one
+        """
+        if self._closures is None:
+            self._closures = self._compute_closures()
+        return self._closures[pkg_name][0]
+
+    def get_build_and_recursive_run_dependency_names(self, pkg):
+        """
+        Get the build dependencies and recursive run dependencies of a package.
+
+        If a package A in the workspace build depends on a package B in the
+        workspace then the recursive run dependencies of B need to be
+        installed in order to build the workspace.
+        The package itself is not traversed, matching the behavior of
+        ``get_build_and_recursive_run_dependencies_uncached``.
+
+        :returns: A set of dependency names
+        """
+        if self._closures is None:
+            self._closures = self._compute_closures()
+        depend_names = set([
+            d.name for d in pkg.build_depends + pkg.buildtool_depends])
+        reached = set([])
+        run_depend_names = set([])
+        for name in depend_names:
+            if name in self._pkgs_by_name and name != pkg.name:
+                closure, closure_run_depend_names = self._closures[name]
+                reached |= closure
+                run_depend_names |= closure_run_depend_names
+        if pkg.name in reached:
+            # the package is part of a run dependency cycle
+            # and the memoized closures would traverse it
+            return set([
+                d.name for d in
+                get_build_and_recursive_run_dependencies_uncached(
+                    pkg, self._pkgs_by_name.values())])
+        return depend_names | run_depend_names
+
+    def _compute_closures(self):
+        # iterative Tarjan algorithm to avoid the recursion limit
+        # for long dependency chains
+        index_counter = [0]
+        indices = {}
+        lowlinks = {}
+        stack = []
+        on_stack = set([])
+        closures = {}
+
+        for root in sorted(self._pkgs_by_name.keys()):
+            if root in indices:
+                continue
+            work = [(root, 0)]
+            while work:
+                name, child_index = work.pop()
+                if child_index == 0:
+                    indices[name] = index_counter[0]
+                    lowlinks[name] = index_counter[0]
+                    index_counter[0] += 1
+                    stack.append(name)
+                    on_stack.add(name)
+                children = self._run_depends_in_workspace[name]
+                recurse = False
+                while child_index < len(children):
+                    child = children[child_index]
+                    child_index += 1
+                    if child not in indices:
+                        work.append((name, child_index))
+                        work.append((child, 0))
+                        recurse = True
+                        break
+                    elif child in on_stack:
+                        lowlinks[name] = min(lowlinks[name], indices[child])
+                if recurse:
+                    continue
+
+                if lowlinks[name] == indices[name]:
+                    # pop the strongly connected component
+                    # all successor components have already been computed
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    closure = set(component)
+                    run_depend_names = set([])
+                    for member in component:
+                        run_depend_names.update([
+                            d.name for d in get_run_dependencies(
+                                self._pkgs_by_name[member])])
+                        for child in self._run_depends_in_workspace[member]:
+                            if child in closures:
+                                closure |= closures[child][0]
+                                run_depend_names |= closures[child][1]
+                    value = (frozenset(closure), frozenset(run_depend_names))
+                    for member in component:
+                        closures[member] = value
+
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[name])
+        return closures
+
+
+def get_build_and_recursive_run_dependencies_uncached(pkg, pkgs):
+    depends = pkg.build_depends + pkg.buildtool_depends
+    # include recursive run dependencies on other pkgs in the workspace
+    other_pkgs_by_names = dict([(p.name, p) for p in pkgs if p.name != pkg.name])
+    run_depends_in_pkgs = set([d.name for d in depends if d.name in other_pkgs_by_names])
+    while run_depends_in_pkgs:
+        # pick first element from sorted order to ensure deterministic results
+        pkg_name = sorted(run_depends_in_pkgs).pop(0)
+        pkg = other_pkgs_by_names[pkg_name]
+        other_pkgs_by_names.pop(pkg_name)
+        run_depends_in_pkgs.remove(pkg_name)
+
+        # append run dependencies
+        run_depends = get_run_dependencies(pkg)
+        depends += run_depends
+
+        # consider recursive dependencies
+        run_depends_in_pkgs.update([d.name for d in run_depends if d.name in other_pkgs_by_names])
+
+    return depends
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+from apt import Cache
+
+
+def main(argv=sys.argv[1:]):
+    if len(argv) != 1:
+        print('usage: %s SNAPSHOT_FILE' % sys.argv[0], file=sys.stderr)
+        return 1
+    snapshot_file = argv[0]
+
+    # the format is read by ros_buildfarm.common.load_binary_package_versions
+    versions = []
+    for pkg in Cache():
+        if pkg.versions:
+            versions.append((pkg.name, max(pkg.versions).version))
+    with open(snapshot_file, 'w') as h:
+        for name, version in sorted(versions):
+            h.write('%s %s\n' % (name, version))
+    print("Wrote the versions of %d binary packages to '%s'" %
+          (len(versions), snapshot_file))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,10 +14,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
+import hashlib
+import os
+import re
 import subprocess
 import sys
 from time import sleep
 
+# the environment variable pointing to a persistent directory
+# which is used to cache mirrors of the cloned repositories
+CACHE_DIR_ENVIRONMENT_VARIABLE = 'ROS_BUILDFARM_GIT_CACHE_DIR'
+
+# the options of 'git clone' which are followed by a separate value
+CLONE_OPTIONS_WITH_VALUE = [
+    '-b', '--branch',
+    '-c', '--config',
+    '--depth',
+    '-o', '--origin',
+    '--reference',
+    '--separate-git-dir',
+    '--template',
+    '-u', '--upload-pack',
+]
+
+# the minimum version of git supporting 'clone --dissociate'
+MIN_DISSOCIATE_GIT_VERSION = (2, 3)
+
 
 def main(argv=sys.argv[1:]):
     max_tries = 10
@@ -27,6 +50,10 @@ def main(argv=sys.argv[1:]):
 
     command = argv[0]
     if command == 'clone':
+        cache_dir = os.environ.get(CACHE_DIR_ENVIRONMENT_VARIABLE)
+        if cache_dir:
+            argv = get_cached_clone_argv(
+                argv, cache_dir, known_error_strings, max_tries)
         rc, _, _ = call_git_repeatedly(
             argv, known_error_strings, max_tries)
         return rc
@@ -34,6 +61,80 @@ def main(argv=sys.argv[1:]):
         assert "Command '%s' not implemented" % command
 
 
+def get_cached_clone_argv(argv, cache_dir, known_error_strings, max_tries):
+    """
+    Update the cached mirror of the cloned repository.
+
+    :returns: The clone arguments extended to borrow the objects from the
+      mirror and only fetch the missing objects from the remote repository
+    """
+    url = get_clone_url(argv)
+    if url is None or '--reference' in argv:
+        return argv
+    git_version = get_git_version()
+    if git_version is None or git_version < MIN_DISSOCIATE_GIT_VERSION:
+        print("The git version doesn't support 'clone --dissociate', "
+              'cloning without the cached mirror')
+        return argv
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    mirror_path = os.path.join(
+        cache_dir, hashlib.sha256(url.encode()).hexdigest()[:16] + '.git')
+    with _lock(mirror_path):
+        if os.path.exists(mirror_path):
+            mirror_argv = [
+                '--git-dir', mirror_path, 'remote', 'update', '--prune']
+        else:
+            mirror_argv = ['clone', '--mirror', url, mirror_path]
+        rc, _, _ = call_git_repeatedly(
+            mirror_argv, known_error_strings, max_tries)
+    if rc:
+        print("Failed to update the cached mirror '%s', " % mirror_path +
+              'cloning without it')
+        return argv
+    # stop borrowing the objects from the mirror after the clone
+    # so that the clone stays valid when the mirror is updated or removed
+    return [argv[0], '--reference', mirror_path, '--dissociate'] + argv[1:]
+
+
+def get_clone_url(argv):
+    positional_args = []
+    skip_next = False
+    for arg in argv[1:]:
+        if skip_next:
+            skip_next = False
+        elif arg in CLONE_OPTIONS_WITH_VALUE:
+            skip_next = True
+        elif arg == '--':
+            continue
+        elif not arg.startswith('-'):
+            positional_args.append(arg)
+    return positional_args[0] if positional_args else None
+
+
+def get_git_version():
+    try:
+        output = subprocess.check_output(['git', '--version'])
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    # e.g. 'git version 2.7.4'
+    match = re.search(r'(\d+)\.(\d+)', output.decode())
+    if not match:
+        return None
+    return tuple(int(part) for part in match.groups())
+
+
+@contextmanager
+def _lock(path):
+    import fcntl
+    with open(path + '.lock', 'a') as h:
+        fcntl.flock(h, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(h, fcntl.LOCK_UN)
+
+
 def call_git_repeatedly(argv, known_error_strings, max_tries):
     command = argv[0]
     for i in range(1, max_tries + 1):
@@ -18,20 +18,26 @@ import argparse
 import os
 import sys
 
-from apt import Cache
 from catkin_pkg.packages import find_packages
+from ros_buildfarm.argument import add_argument_base_image
+from ros_buildfarm.argument import add_argument_binary_package_versions_file
+from ros_buildfarm.argument import add_argument_common_dependencies
 from ros_buildfarm.argument import \
     add_argument_distribution_repository_key_files
 from ros_buildfarm.argument import add_argument_distribution_repository_urls
 from ros_buildfarm.argument import add_argument_dockerfile_dir
-from ros_buildfarm.common import get_binary_package_versions
+from ros_buildfarm.argument import add_argument_rosdep_cache_dir
+from ros_buildfarm.base_image import select_base_image
+from ros_buildfarm.common import get_binary_package_versions_source
 from ros_buildfarm.common import get_debian_package_name
 from ros_buildfarm.common import get_distribution_repository_keys
 from ros_buildfarm.common import get_user_id
+from ros_buildfarm.common import lookup_binary_package_versions
+from ros_buildfarm.dependency_layers import order_dependencies_in_tiers
+from ros_buildfarm.rosdep_resolution import RosdepResolver
 from ros_buildfarm.templates import create_dockerfile
-from rosdep2 import create_default_installer_context
-from rosdep2.catkin_support import get_catkin_view
-from rosdep2.catkin_support import resolve_for_os
+from ros_buildfarm.workspace_dependencies import get_run_dependencies
+from ros_buildfarm.workspace_dependencies import WorkspaceDependencies
 
 
 def main(argv=sys.argv[1:]):
@@ -61,6 +67,10 @@ def main(argv=sys.argv[1:]):
     add_argument_distribution_repository_urls(parser)
     add_argument_distribution_repository_key_files(parser)
     add_argument_dockerfile_dir(parser)
+    add_argument_binary_package_versions_file(parser)
+    add_argument_rosdep_cache_dir(parser)
+    add_argument_common_dependencies(parser)
+    add_argument_base_image(parser)
     parser.add_argument(
         '--testing',
         action='store_true',
@@ -88,10 +98,12 @@ def main(argv=sys.argv[1:]):
         print('Package maintainer emails: %s' %
               ' '.join(sorted(maintainer_emails)))
 
-    context = initialize_resolver(
-        args.rosdistro_name, args.os_name, args.os_code_name)
+    resolver = RosdepResolver(
+        args.rosdistro_name, args.os_name, args.os_code_name,
+        cache_dir=args.rosdep_cache_dir)
 
-    apt_cache = Cache()
+    apt_cache = get_binary_package_versions_source(
+        args.binary_package_versions_file)
 
     debian_pkg_names = [
         'build-essential',
@@ -104,30 +116,38 @@ def main(argv=sys.argv[1:]):
     for debian_pkg_name in sorted(debian_pkg_names):
         print('  -', debian_pkg_name)
 
-    debian_pkg_versions = {}
-
     # get build dependencies and map them to binary packages
     build_depends = get_dependencies(
         pkgs.values(), 'build', _get_build_and_recursive_run_dependencies)
-    debian_pkg_names_building = resolve_names(build_depends, **context)
+    debian_pkg_names_building = resolve_names(build_depends, resolver)
     debian_pkg_names_building -= set(debian_pkg_names)
-    debian_pkg_names += order_dependencies(debian_pkg_names_building)
-    debian_pkg_versions.update(
-        get_binary_package_versions(apt_cache, debian_pkg_names))
+    ordered_names, common_count = order_dependencies(
+        debian_pkg_names_building, args.common_dependencies)
+    # the generic and common dependencies are shared by many jobs
+    stable_dependency_count = len(debian_pkg_names) + common_count
+    debian_pkg_names += ordered_names
 
     # get run and test dependencies and map them to binary packages
     run_and_test_depends = get_dependencies(
         pkgs.values(), 'run and test', _get_run_and_test_dependencies)
     debian_pkg_names_testing = resolve_names(
-        run_and_test_depends, **context)
+        run_and_test_depends, resolver)
     # all additional run/test dependencies
     # are added after the build dependencies
     # in order to reuse existing images in the docker container
     debian_pkg_names_testing -= set(debian_pkg_names)
-    debian_pkg_versions.update(
-        get_binary_package_versions(apt_cache, debian_pkg_names_testing))
+
+    # look up the versions of all dependencies at once
+    debian_pkg_versions, missing_debian_pkg_names = \
+        lookup_binary_package_versions(
+            apt_cache, debian_pkg_names + sorted(debian_pkg_names_testing))
+    if missing_debian_pkg_names:
+        raise RuntimeError(
+            'Could not find the following binary packages: %s' %
+            ', '.join(missing_debian_pkg_names))
     if args.testing:
-        debian_pkg_names += order_dependencies(debian_pkg_names_testing)
+        debian_pkg_names += order_dependencies(
+            debian_pkg_names_testing, args.common_dependencies)[0]
 
     # generate Dockerfile
     data = {
@@ -146,6 +166,10 @@ def main(argv=sys.argv[1:]):
 
         'dependencies': debian_pkg_names,
         'dependency_versions': debian_pkg_versions,
+        'stable_dependency_count': stable_dependency_count,
+
+        'base_image': select_base_image(
+            args.base_image, args.base_image_packages, debian_pkg_names),
 
         'testing': args.testing,
         'prerelease_overlay': len(args.workspace_root) > 1,
@@ -162,12 +186,13 @@ def main(argv=sys.argv[1:]):
 
 
 def get_dependencies(pkgs, label, get_dependencies_callback):
-    pkg_names = [pkg.name for pkg in pkgs]
+    pkg_names = set([pkg.name for pkg in pkgs])
+    # index the workspace once for all packages
+    workspace = WorkspaceDependencies(pkgs)
     depend_names = set([])
     for pkg in pkgs:
         depend_names.update(
-            [d.name for d in get_dependencies_callback(pkg, pkgs)
-             if d.name not in pkg_names])
+            get_dependencies_callback(pkg, workspace) - pkg_names)
     print('Identified the following %s dependencies ' % label +
           '(ignoring packages available from source):')
     for depend_name in sorted(depend_names):
@@ -175,73 +200,41 @@ def get_dependencies(pkgs, label, get_dependencies_callback):
     return depend_names
 
 
-def _get_build_and_recursive_run_dependencies(pkg, pkgs):
-    depends = pkg.build_depends + pkg.buildtool_depends
+def _get_build_and_recursive_run_dependencies(pkg, workspace):
     # include recursive run dependencies on other pkgs in the workspace
     # if pkg A in the workspace build depends on pkg B in the workspace
     # then the recursive run dependencies of pkg B need to be installed
     # in order to build the workspace
-    other_pkgs_by_names = dict([(p.name, p) for p in pkgs if p.name != pkg.name])
-    run_depends_in_pkgs = set([d.name for d in depends if d.name in other_pkgs_by_names])
-    while run_depends_in_pkgs:
-        # pick first element from sorted order to ensure deterministic results
-        pkg_name = sorted(run_depends_in_pkgs).pop(0)
-        pkg = other_pkgs_by_names[pkg_name]
-        other_pkgs_by_names.pop(pkg_name)
-        run_depends_in_pkgs.remove(pkg_name)
-
-        # append run dependencies
-        run_depends = pkg.build_export_depends + \
-            pkg.buildtool_export_depends + pkg.exec_depends
-        depends += run_depends
+    return workspace.get_build_and_recursive_run_dependency_names(pkg)
 
-        # consider recursive dependencies
-        run_depends_in_pkgs.update([d.name for d in run_depends if d.name in other_pkgs_by_names])
 
-    return depends
+def _get_run_and_test_dependencies(pkg, workspace):
+    return set([
+        d.name for d in get_run_dependencies(pkg) + pkg.test_depends])
 
 
-def _get_run_and_test_dependencies(pkg, pkgs):
-    return pkg.build_export_depends + pkg.buildtool_export_depends + \
-        pkg.exec_depends + pkg.test_depends
-
-
-def initialize_resolver(rosdistro_name, os_name, os_code_name):
-    # resolve rosdep keys into binary package names
-    ctx = create_default_installer_context()
-    try:
-        installer_key = ctx.get_default_os_installer_key(os_name)
-    except KeyError:
+def resolve_names(rosdep_keys, resolver):
+    resolved_names, unresolved_keys = resolver.resolve(rosdep_keys)
+    if unresolved_keys:
         raise RuntimeError(
-            "Could not determine the rosdep installer for '%s'" % os_name)
-    installer = ctx.get_installer(installer_key)
-    view = get_catkin_view(rosdistro_name, os_name, os_code_name, update=False)
-    return {
-        'os_name': os_name,
-        'os_code_name': os_code_name,
-        'installer': installer,
-        'view': view,
-    }
-
-
-def resolve_names(rosdep_keys, os_name, os_code_name, view, installer):
+            "Could not resolve the rosdep key '%s'" % unresolved_keys[0])
     debian_pkg_names = set([])
-    for rosdep_key in sorted(rosdep_keys):
-        try:
-            resolved_names = resolve_for_os(
-                rosdep_key, view, installer, os_name, os_code_name)
-        except KeyError:
-            raise RuntimeError(
-                "Could not resolve the rosdep key '%s'" % rosdep_key)
-        debian_pkg_names.update(resolved_names)
+    for names in resolved_names.values():
+        debian_pkg_names.update(names)
     print('Resolved the dependencies to the following binary packages:')
     for debian_pkg_name in sorted(debian_pkg_names):
         print('  -', debian_pkg_name)
     return debian_pkg_names
 
 
-def order_dependencies(binary_package_names):
-    return sorted(binary_package_names)
+def order_dependencies(binary_package_names, common_binary_package_names):
+    ordered_names, common_count = order_dependencies_in_tiers(
+        binary_package_names, common_binary_package_names)
+    if common_count:
+        print('Install the following common dependencies first:')
+        for debian_pkg_name in ordered_names[:common_count]:
+            print('  -', debian_pkg_name)
+    return ordered_names, common_count
 
 
 if __name__ == '__main__':
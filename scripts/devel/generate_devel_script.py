@@ -29,6 +29,7 @@ from ros_buildfarm.argument import add_argument_rosdistro_name
 from ros_buildfarm.common import get_devel_job_name
 from ros_buildfarm.devel_job import configure_devel_job
 from ros_buildfarm.templates import expand_template
+from ros_buildfarm.templates import get_wrapper_script_command
 
 
 def main(argv=sys.argv[1:]):
@@ -78,7 +79,8 @@ def main(argv=sys.argv[1:]):
         'devel/devel_script.sh.em', {
             'devel_job_name': devel_job_name,
             'scms': hook.scms,
-            'scripts': hook.scripts},
+            'scripts': hook.scripts,
+            'git_wrapper_command': get_wrapper_script_command('git.py')},
         options={BANGPATH_OPT: False})
     value = value.replace('python3', sys.executable)
     print(value)
@@ -19,6 +19,7 @@ import copy
 import sys
 
 from ros_buildfarm.argument import add_argument_arch
+from ros_buildfarm.argument import add_argument_base_image_registry
 from ros_buildfarm.argument import add_argument_build_name
 from ros_buildfarm.argument import add_argument_custom_rosdep_urls
 from ros_buildfarm.argument import \
@@ -30,6 +31,7 @@ from ros_buildfarm.argument import add_argument_os_name
 from ros_buildfarm.argument import add_argument_repository_name
 from ros_buildfarm.argument import add_argument_rosdistro_index_url
 from ros_buildfarm.argument import add_argument_rosdistro_name
+from ros_buildfarm.base_image import get_base_image_data
 from ros_buildfarm.common import get_distribution_repository_keys
 from ros_buildfarm.common import get_user_id
 from ros_buildfarm.templates import create_dockerfile
@@ -48,6 +50,7 @@ def main(argv=sys.argv[1:]):
     add_argument_distribution_repository_urls(parser)
     add_argument_distribution_repository_key_files(parser)
     add_argument_custom_rosdep_urls(parser)
+    add_argument_base_image_registry(parser)
     parser.add_argument(
         '--prerelease-overlay',
         action='store_true',
@@ -64,6 +67,9 @@ def main(argv=sys.argv[1:]):
         'custom_rosdep_urls': args.custom_rosdep_urls,
         'uid': get_user_id(),
     })
+    data.update(get_base_image_data(
+        args.rosdistro_name, args.os_name, args.os_code_name, args.arch,
+        registry=args.base_image_registry))
     create_dockerfile(
         'devel/devel_create_tasks.Dockerfile.em', data, args.dockerfile_dir)
 
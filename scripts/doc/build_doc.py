@@ -15,9 +15,12 @@
 # limitations under the License.
 
 import argparse
+import multiprocessing
 import os
+import shutil
 import subprocess
 import sys
+import time
 import yaml
 
 from ros_buildfarm.argument import add_argument_output_dir
@@ -92,7 +95,9 @@ def main(argv=sys.argv[1:]):
     source_space = os.path.join(args.workspace_root, 'src')
     for pkg_tuple in args.pkg_tuples:
         pkg_name, pkg_subfolder, pkg_rosdoc_config = pkg_tuple.split(':', 2)
-        with Scope('SUBSECTION', 'rosdoc_lite - %s' % pkg_name):
+        with Scope(
+                'SUBSECTION', 'rosdoc_lite - %s' % pkg_name,
+                phase='rosdoc_lite'):
             pkg_path = os.path.join(source_space, pkg_subfolder)
 
             pkg_doc_path = os.path.join(
@@ -178,27 +183,94 @@ def main(argv=sys.argv[1:]):
     return rc
 
 
-def add_canonical_link(base_path, base_link):
+def add_canonical_link(base_path, base_link, jobs=None):
     print("add canonical link '%s' to all html files under '%s'" %
           (base_link, base_path))
+    start_time = time.time()
+    tasks = []
     for path, dirs, files in os.walk(base_path):
         for filename in [f for f in files if f.endswith('.html')]:
             filepath = os.path.join(path, filename)
-            try:
-                with open(filepath, 'rb') as h:
-                    data = h.read()
-            except Exception:
-                print("error reading file '%s'" % filepath)
-                raise
-            if data.find(b'rel="canonical"') != -1:
-                continue
             rel_path = os.path.relpath(filepath, base_path)
-            link = os.path.join(base_link, rel_path)
-            data = data.replace(
-                b'</head>', b'<link rel="canonical" href="' + link.encode() +
-                b'" />\n</head>', 1)
-            with open(filepath, 'wb') as h:
-                h.write(data)
+            tasks.append((filepath, os.path.join(base_link, rel_path)))
+
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    if jobs > 1 and len(tasks) > 1:
+        # small chunks keep the workers balanced
+        # while avoiding the overhead of dispatching single files
+        chunksize = max(1, len(tasks) // (jobs * 16))
+        pool = multiprocessing.Pool(min(jobs, len(tasks)))
+        try:
+            results = pool.map(
+                _add_canonical_link_to_file, tasks, chunksize=chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_add_canonical_link_to_file(t) for t in tasks]
+
+    duration = time.time() - start_time
+    print('  processed %d files (%d updated) in %.2fs (%.1f files/s)' %
+          (len(tasks), results.count(True), duration,
+           len(tasks) / duration if duration > 0 else float(len(tasks))))
+
+
+_CANONICAL_MARKER = b'rel="canonical"'
+_HEAD_END_MARKER = b'</head>'
+_READ_CHUNK_SIZE = 8192
+
+
+def _add_canonical_link_to_file(task):
+    filepath, link = task
+    try:
+        with open(filepath, 'rb') as h:
+            head = _read_head(h)
+            if head is None:
+                # no head section to add the link to
+                return False
+            if head.find(_CANONICAL_MARKER) != -1:
+                return False
+            index = head.find(_HEAD_END_MARKER)
+            tmp_filepath = filepath + '.canonical'
+            with open(tmp_filepath, 'wb') as tmp:
+                tmp.write(head[:index])
+                tmp.write(
+                    b'<link rel="canonical" href="' + link.encode() +
+                    b'" />\n')
+                tmp.write(head[index:])
+                # stream the remaining body without loading it into memory
+                shutil.copyfileobj(h, tmp)
+    except Exception:
+        print("error reading file '%s'" % filepath)
+        raise
+    shutil.copymode(filepath, tmp_filepath)
+    os.rename(tmp_filepath, filepath)
+    return True
+
+
+def _read_head(h):
+    """
+    Read the file only up to the end of the head section.
+
+    The first chunk doubles as a cheap prefix check since the canonical link
+    of already stamped files is always located in the head section.
+
+    :returns: the read bytes containing the closing head tag or ``None`` if
+      the file doesn't contain a head section
+    """
+    data = b''
+    while True:
+        chunk = h.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            return None
+        # the marker might span across the chunk boundary
+        offset = max(0, len(data) - len(_HEAD_END_MARKER) + 1)
+        data += chunk
+        if data.find(_CANONICAL_MARKER) != -1:
+            return data
+        if data.find(_HEAD_END_MARKER, offset) != -1:
+            return data
 
 
 if __name__ == '__main__':
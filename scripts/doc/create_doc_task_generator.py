@@ -14,24 +14,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from apt import Cache
 import argparse
 import copy
 import os
-import re
 import subprocess
 import sys
 import time
 import yaml
 
 from catkin_pkg.packages import find_packages
-from rosdep2 import create_default_installer_context
-from rosdep2.catkin_support import get_catkin_view
-from rosdep2.catkin_support import resolve_for_os
 from rosdistro import get_distribution_file
 from rosdistro import get_index
 
+from ros_buildfarm.argument import add_argument_base_image
+from ros_buildfarm.argument import add_argument_binary_package_versions_file
 from ros_buildfarm.argument import add_argument_build_name
+from ros_buildfarm.argument import add_argument_common_dependencies
 from ros_buildfarm.argument import \
     add_argument_distribution_repository_key_files
 from ros_buildfarm.argument import add_argument_config_url
@@ -40,15 +38,21 @@ from ros_buildfarm.argument import add_argument_dockerfile_dir
 from ros_buildfarm.argument import add_argument_force
 from ros_buildfarm.argument import add_argument_output_dir
 from ros_buildfarm.argument import add_argument_repository_name
+from ros_buildfarm.argument import add_argument_rosdep_cache_dir
 from ros_buildfarm.argument import add_argument_vcs_information
+from ros_buildfarm.base_image import select_base_image
+from ros_buildfarm.changelog_html import ChangelogHtmlCache
+from ros_buildfarm.changelog_html import DEFAULT_MAX_CACHE_SIZE
+from ros_buildfarm.changelog_html import get_changelog_htmls
 from ros_buildfarm.common import find_executable
-from ros_buildfarm.common import get_binary_package_versions
+from ros_buildfarm.common import get_binary_package_versions_source
 from ros_buildfarm.common import get_debian_package_name
 from ros_buildfarm.common import get_devel_job_urls
 from ros_buildfarm.common import get_distribution_repository_keys
 from ros_buildfarm.common import get_doc_job_url
 from ros_buildfarm.common import get_release_job_urls
 from ros_buildfarm.common import get_user_id
+from ros_buildfarm.common import lookup_binary_package_versions
 from ros_buildfarm.common import Scope
 from ros_buildfarm.common import topological_order_packages
 from ros_buildfarm.config import get_distribution_file as \
@@ -57,9 +61,11 @@ from ros_buildfarm.config import get_doc_build_files
 from ros_buildfarm.config import get_index as get_config_index
 from ros_buildfarm.config import get_release_build_files
 from ros_buildfarm.config import get_source_build_files
+from ros_buildfarm.dependency_layers import order_dependencies_in_tiers
 from ros_buildfarm.git import get_hash as get_git_hash
 from ros_buildfarm.rosdoc_index import RosdocIndex
 from ros_buildfarm.rosdoc_lite import get_generator_output_folders
+from ros_buildfarm.rosdep_resolution import RosdepResolver
 from ros_buildfarm.templates import create_dockerfile
 from ros_buildfarm.templates import expand_template
 
@@ -109,6 +115,20 @@ def main(argv=sys.argv[1:]):
     add_argument_force(parser)
     add_argument_output_dir(parser, required=True)
     add_argument_dockerfile_dir(parser)
+    add_argument_binary_package_versions_file(parser)
+    add_argument_rosdep_cache_dir(parser)
+    add_argument_common_dependencies(parser)
+    add_argument_base_image(parser)
+    parser.add_argument(
+        '--changelog-cache-dir',
+        help='The path of a persistent directory to cache the html '
+             'generated from CHANGELOG.rst files')
+    parser.add_argument(
+        '--changelog-cache-size',
+        type=int,
+        default=DEFAULT_MAX_CACHE_SIZE // (1024 * 1024),
+        help='The maximum size of the changelog cache in MiB '
+             '(default: %(default)s)')
     args = parser.parse_args(argv)
 
     config = get_config_index(args.config_url)
@@ -243,6 +263,7 @@ def main(argv=sys.argv[1:]):
     # generate changelog html from rst
     package_names_with_changelogs = set([])
     with Scope('SUBSECTION', 'generate changelog html from rst'):
+        rst_codes = {}
         for pkg_path, pkg in pkgs.items():
             abs_pkg_path = os.path.join(source_space, pkg_path)
             assert os.path.exists(os.path.join(abs_pkg_path, 'package.xml'))
@@ -253,23 +274,22 @@ def main(argv=sys.argv[1:]):
                 package_names_with_changelogs.add(pkg.name)
 
                 with open(changelog_file, 'r') as h:
-                    rst_code = h.read()
-                from docutils.core import publish_string
-                html_code = publish_string(rst_code, writer_name='html')
-                html_code = html_code.decode()
-
-                # strip system message from html output
-                open_tag = re.escape('<div class="first system-message">')
-                close_tag = re.escape('</div>')
-                pattern = '(' + open_tag + '.+?' + close_tag + ')'
-                html_code = re.sub(pattern, '', html_code, flags=re.DOTALL)
-
-                pkg_changelog_doc_path = os.path.join(
-                    args.output_dir, 'changelogs', pkg.name)
-                os.makedirs(pkg_changelog_doc_path)
-                with open(os.path.join(
-                        pkg_changelog_doc_path, 'changelog.html'), 'w') as h:
-                    h.write(html_code)
+                    rst_codes[pkg.name] = h.read()
+
+        changelog_cache = None
+        if args.changelog_cache_dir:
+            changelog_cache = ChangelogHtmlCache(
+                args.changelog_cache_dir,
+                max_size=args.changelog_cache_size * 1024 * 1024)
+        html_codes = get_changelog_htmls(rst_codes, cache=changelog_cache)
+
+        for pkg_name in sorted(html_codes.keys()):
+            pkg_changelog_doc_path = os.path.join(
+                args.output_dir, 'changelogs', pkg_name)
+            os.makedirs(pkg_changelog_doc_path)
+            with open(os.path.join(
+                    pkg_changelog_doc_path, 'changelog.html'), 'w') as h:
+                h.write(html_codes[pkg_name])
 
     ordered_pkg_tuples = topological_order_packages(pkgs)
 
@@ -492,11 +512,13 @@ def main(argv=sys.argv[1:]):
         'SUBSECTION',
         'determine dependencies and generate Dockerfile'
     ):
-        # initialize rosdep view
-        context = initialize_resolver(
-            args.rosdistro_name, args.os_name, args.os_code_name)
+        # the rosdep view is only initialized for keys missing in the cache
+        resolver = RosdepResolver(
+            args.rosdistro_name, args.os_name, args.os_code_name,
+            cache_dir=args.rosdep_cache_dir)
 
-        apt_cache = Cache()
+        apt_cache = get_binary_package_versions_source(
+            args.binary_package_versions_file)
 
         debian_pkg_names = [
             'build-essential',
@@ -525,21 +547,18 @@ def main(argv=sys.argv[1:]):
         for debian_pkg_name in sorted(debian_pkg_names):
             print('  -', debian_pkg_name)
 
-        debian_pkg_versions = {}
-
         # get build, run and doc dependencies and map them to binary packages
         depends = get_dependencies(
             pkgs.values(), 'build, run and doc', _get_build_run_doc_dependencies)
-        debian_pkg_names_depends = resolve_names(depends, **context)
+        debian_pkg_names_depends = resolve_names(depends, resolver)
         debian_pkg_names_depends -= set(debian_pkg_names)
-        debian_pkg_names += order_dependencies(debian_pkg_names_depends)
-        missing_debian_pkg_names = []
-        for debian_pkg_name in debian_pkg_names:
-            try:
-                debian_pkg_versions.update(
-                    get_binary_package_versions(apt_cache, [debian_pkg_name]))
-            except KeyError:
-                missing_debian_pkg_names.append(debian_pkg_name)
+        ordered_names, common_count = order_dependencies(
+            debian_pkg_names_depends, args.common_dependencies)
+        # the generic and common dependencies are shared by many jobs
+        stable_dependency_count = len(debian_pkg_names) + common_count
+        debian_pkg_names += ordered_names
+        debian_pkg_versions, missing_debian_pkg_names = \
+            lookup_binary_package_versions(apt_cache, debian_pkg_names)
         if missing_debian_pkg_names:
             # we allow missing dependencies to support basic documentation
             # of packages which use not released dependencies
@@ -547,6 +566,9 @@ def main(argv=sys.argv[1:]):
             for debian_pkg_name in missing_debian_pkg_names:
                 print("Could not find apt package '%s', skipping dependency" %
                       debian_pkg_name)
+                if debian_pkg_names.index(debian_pkg_name) < \
+                        stable_dependency_count:
+                    stable_dependency_count -= 1
                 debian_pkg_names.remove(debian_pkg_name)
             print('# END SUBSECTION')
 
@@ -570,6 +592,10 @@ def main(argv=sys.argv[1:]):
 
             'dependencies': debian_pkg_names,
             'dependency_versions': debian_pkg_versions,
+            'stable_dependency_count': stable_dependency_count,
+
+            'base_image': select_base_image(
+                args.base_image, args.base_image_packages, debian_pkg_names),
 
             'canonical_base_url': build_file.canonical_base_url,
 
@@ -636,43 +662,29 @@ def _get_run_dependencies(pkg):
         pkg.exec_depends
 
 
-def initialize_resolver(rosdistro_name, os_name, os_code_name):
-    # resolve rosdep keys into binary package names
-    ctx = create_default_installer_context()
-    try:
-        installer_key = ctx.get_default_os_installer_key(os_name)
-    except KeyError:
-        raise RuntimeError(
-            "Could not determine the rosdep installer for '%s'" % os_name)
-    installer = ctx.get_installer(installer_key)
-    view = get_catkin_view(rosdistro_name, os_name, os_code_name, update=False)
-    return {
-        'os_name': os_name,
-        'os_code_name': os_code_name,
-        'installer': installer,
-        'view': view,
-    }
-
-
-def resolve_names(rosdep_keys, os_name, os_code_name, view, installer):
-    debian_pkg_names = set([])
-    for rosdep_key in sorted(rosdep_keys):
-        try:
-            resolved_names = resolve_for_os(
-                rosdep_key, view, installer, os_name, os_code_name)
-        except KeyError:
+def resolve_names(rosdep_keys, resolver):
+    resolved_names, unresolved_keys = resolver.resolve(rosdep_keys)
+    if unresolved_keys:
+        for rosdep_key in unresolved_keys:
             print(("Could not resolve the rosdep key '%s', ignoring " +
                    "dependency") % rosdep_key, file=sys.stderr)
-            continue
-        debian_pkg_names.update(resolved_names)
+    debian_pkg_names = set([])
+    for names in resolved_names.values():
+        debian_pkg_names.update(names)
     print('Resolved the dependencies to the following binary packages:')
     for debian_pkg_name in sorted(debian_pkg_names):
         print('  -', debian_pkg_name)
     return debian_pkg_names
 
 
-def order_dependencies(binary_package_names):
-    return sorted(binary_package_names)
+def order_dependencies(binary_package_names, common_binary_package_names):
+    ordered_names, common_count = order_dependencies_in_tiers(
+        binary_package_names, common_binary_package_names)
+    if common_count:
+        print('Install the following common dependencies first:')
+        for debian_pkg_name in ordered_names[:common_count]:
+            print('  -', debian_pkg_name)
+    return ordered_names, common_count
 
 
 if __name__ == '__main__':
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import argparse
+import multiprocessing
 import os
 import sys
 import time
@@ -68,43 +69,78 @@ def main(argv=sys.argv[1:]):
 
     print("Generate 'manifest.yaml' files for the following packages:")
     api_path = os.path.join(args.output_dir, 'api')
+    # the devel job urls only depend on the repository
+    devel_job_urls_by_repo = {}
+    tasks = []
     for pkg_name in sorted(filtered_pkg_names):
         print('- %s' % pkg_name)
+        rel_pkg = distribution.release_packages[pkg_name]
+        repo_name = rel_pkg.repository_name
+        repo = distribution.repositories[repo_name]
         try:
-            data = get_metadata(distribution, pkg_name)
+            xml = distribution.get_release_package_xml(pkg_name)
         except Exception:
             print('Could not extract meta data:', file=sys.stderr)
             traceback.print_exc(file=sys.stderr)
             continue
 
         # add devel job urls
-        rel_pkg = distribution.release_packages[pkg_name]
-        repo_name = rel_pkg.repository_name
-        repo = distribution.repositories[repo_name]
+        devel_job_urls = None
         if repo.source_repository and repo.source_repository.version:
-            build_files = {}
-            for build_name in source_build_files.keys():
-                build_files[build_name] = source_build_files[build_name]
-            devel_job_urls = get_devel_job_urls(
-                config.jenkins_url, build_files, args.rosdistro_name, repo_name)
-            if devel_job_urls:
-                data['devel_jobs'] = devel_job_urls
+            if repo_name not in devel_job_urls_by_repo:
+                devel_job_urls_by_repo[repo_name] = get_devel_job_urls(
+                    config.jenkins_url, source_build_files,
+                    args.rosdistro_name, repo_name)
+            devel_job_urls = devel_job_urls_by_repo[repo_name]
 
         # add release job urls
-        build_files = {}
-        for build_name in release_build_files.keys():
-            build_files[build_name] = release_build_files[build_name]
         release_job_urls = get_release_job_urls(
-            config.jenkins_url, build_files, args.rosdistro_name, pkg_name)
-        if release_job_urls:
-            data['release_jobs'] = release_job_urls
+            config.jenkins_url, release_build_files, args.rosdistro_name,
+            pkg_name)
 
         manifest_yaml = os.path.join(api_path, pkg_name, 'manifest.yaml')
-        write_manifest_yaml(manifest_yaml, data)
+        tasks.append((
+            pkg_name, xml, repo_name, _get_status_data(repo, pkg_name),
+            devel_job_urls, release_job_urls, manifest_yaml))
+
+    # parse the manifests and write the yaml files in parallel
+    if len(tasks) > 1:
+        pool = multiprocessing.Pool(
+            min(multiprocessing.cpu_count(), len(tasks)))
+        try:
+            results = pool.map(_generate_manifest_yaml, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_generate_manifest_yaml(t) for t in tasks]
+
+    for pkg_name, error in results:
+        if error is not None:
+            print("Could not extract meta data of package '%s':" % pkg_name,
+                  file=sys.stderr)
+            print(error, file=sys.stderr)
 
     return 0
 
 
+def _generate_manifest_yaml(task):
+    pkg_name, xml, repo_name, status_data, devel_job_urls, \
+        release_job_urls, manifest_yaml = task
+    try:
+        data = _get_metadata(xml, repo_name, status_data)
+    except Exception:
+        return pkg_name, traceback.format_exc()
+
+    if devel_job_urls:
+        data['devel_jobs'] = devel_job_urls
+    if release_job_urls:
+        data['release_jobs'] = release_job_urls
+
+    write_manifest_yaml(manifest_yaml, data)
+    return pkg_name, None
+
+
 def get_repo_names_with_release_but_no_doc(distribution):
     repo_names = []
     for repo in distribution.repositories.values():
@@ -128,17 +164,16 @@ def get_metadata(distribution, pkg_name):
     repository = distribution.repositories[repo_name]
 
     xml = distribution.get_release_package_xml(pkg_name)
-    pkg = parse_package_string(xml)
+    return _get_metadata(
+        xml, repo_name, _get_status_data(repository, pkg_name))
 
-    data = {}
-    data['repo_name'] = repo_name
-    data['timestamp'] = time.time()
 
+def _get_status_data(repository, pkg_name):
     pkg_status = None
     pkg_status_description = None
     # package level status information
-    if pkg.name in repository.status_per_package:
-        pkg_status_data = repository.status_per_package[pkg.name]
+    if pkg_name in repository.status_per_package:
+        pkg_status_data = repository.status_per_package[pkg_name]
         pkg_status = pkg_status_data.get('status', None)
         pkg_status_description = pkg_status_data.get(
             'status_description', None)
@@ -147,6 +182,17 @@ def get_metadata(distribution, pkg_name):
         pkg_status = repository.status
     if pkg_status_description is None:
         pkg_status_description = repository.status_description
+    return pkg_status, pkg_status_description
+
+
+def _get_metadata(xml, repo_name, status_data):
+    pkg = parse_package_string(xml)
+
+    data = {}
+    data['repo_name'] = repo_name
+    data['timestamp'] = time.time()
+
+    pkg_status, pkg_status_description = status_data
     if pkg_status is not None:
         data['maintainer_status'] = pkg_status
     if pkg_status_description is not None:
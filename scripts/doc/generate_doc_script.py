@@ -30,6 +30,7 @@ from ros_buildfarm.argument import add_argument_rosdistro_name
 from ros_buildfarm.common import get_doc_job_name
 from ros_buildfarm.doc_job import configure_doc_job
 from ros_buildfarm.templates import expand_template
+from ros_buildfarm.templates import get_wrapper_script_command
 
 
 def main(argv=sys.argv[1:]):
@@ -107,7 +108,8 @@ def main(argv=sys.argv[1:]):
         'doc/doc_script.sh.em', {
             'doc_job_name': doc_job_name,
             'scms': hook.scms,
-            'scripts': scripts},
+            'scripts': scripts,
+            'git_wrapper_command': get_wrapper_script_command('git.py')},
         options={BANGPATH_OPT: False})
     value = value.replace('python3', sys.executable)
     print(value)
@@ -44,6 +44,11 @@ def main(argv=sys.argv[1:]):
         '--skip-rosdistro-cache-job',
         action='store_true',
         help='Skip generating the rosdistro-cache jobs')
+    parser.add_argument(
+        '--base-image-jobs',
+        action='store_true',
+        help='Generate the base-image jobs even if no base image registry ' +
+             'is configured')
     parser.add_argument(
         '--commit',
         action='store_true',
@@ -92,6 +97,12 @@ def main(argv=sys.argv[1:]):
             generate_rosdistro_cache_job(
                 args.config_url, ros_distro_name, dry_run=not args.commit)
 
+        # without a registry the base images are only available on the
+        # slave building them
+        if args.base_image_jobs or config.base_image_registry:
+            generate_base_image_jobs(
+                args.config_url, ros_distro_name, dry_run=not args.commit)
+
         release_build_files = get_release_build_files(config, ros_distro_name)
         for release_build_name in release_build_files.keys():
             generate_release_status_page_job(
@@ -163,6 +174,17 @@ def generate_rosdistro_cache_job(config_url, ros_distro_name, dry_run=False):
     _check_call(cmd)
 
 
+def generate_base_image_jobs(config_url, ros_distro_name, dry_run=False):
+    cmd = [
+        _resolve_script('misc', 'generate_base_image_jobs.py'),
+        config_url,
+        ros_distro_name,
+    ]
+    if dry_run:
+        cmd.append('--dry-run')
+    _check_call(cmd)
+
+
 def generate_release_status_page_job(
         config_url, ros_distro_name, release_build_name, dry_run=False):
     cmd = [
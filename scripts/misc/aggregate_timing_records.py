@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import sys
+
+from ros_buildfarm.timing import aggregate_timing_records
+from ros_buildfarm.timing import format_duration
+from ros_buildfarm.timing import read_timing_records
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Merge timing records of multiple jobs into a report of '
+                    'the duration of each phase')
+    parser.add_argument(
+        'timing_files', nargs='+',
+        help='The JSON lines files containing the timing records')
+    parser.add_argument(
+        '--merge-scripts', action='store_true',
+        help='Merge phases with the same name from different scripts')
+    parser.add_argument(
+        '--output-file',
+        help='The path of a JSON file to write the report to')
+    args = parser.parse_args(argv)
+
+    records = read_timing_records(args.timing_files)
+    report = aggregate_timing_records(
+        records, group_by_script=not args.merge_scripts)
+    print('Aggregated %d timing records into %d phases' %
+          (len(records), len(report)))
+
+    print('')
+    print('%-10s %6s %10s %10s %10s %10s %10s %10s  %s' % (
+        'total', 'count', 'mean', 'median', 'p90', 'max', 'cpu',
+        'peak rss', 'phase'))
+    for phase in report:
+        name = phase['phase']
+        if phase['script']:
+            name = '%s: %s' % (phase['script'], name)
+        if phase['failed']:
+            name += ' (%d failed)' % phase['failed']
+        peak_rss = '-'
+        if phase['max_peak_rss_kib'] is not None:
+            peak_rss = '%d MiB' % (phase['max_peak_rss_kib'] // 1024)
+        print('%-10s %6d %10s %10s %10s %10s %10s %10s  %s' % (
+            format_duration(phase['total_wall_time']), phase['count'],
+            format_duration(phase['mean_wall_time']),
+            format_duration(phase['median_wall_time']),
+            format_duration(phase['p90_wall_time']),
+            format_duration(phase['max_wall_time']),
+            format_duration(phase['total_cpu_time']),
+            peak_rss, name))
+
+    if args.output_file:
+        with open(args.output_file, 'w') as h:
+            json.dump(report, h, indent=2, sort_keys=True)
+        print('')
+        print("Wrote report to '%s'" % args.output_file)
+
+
+if __name__ == '__main__':
+    main()
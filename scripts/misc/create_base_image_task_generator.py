@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+
+from rosdistro import get_distribution_cache
+from rosdistro import get_index
+
+from ros_buildfarm.argument import add_argument_arch
+from ros_buildfarm.argument import add_argument_config_url
+from ros_buildfarm.argument import \
+    add_argument_distribution_repository_key_files
+from ros_buildfarm.argument import add_argument_distribution_repository_urls
+from ros_buildfarm.argument import add_argument_dockerfile_dir
+from ros_buildfarm.argument import add_argument_os_code_name
+from ros_buildfarm.argument import add_argument_os_name
+from ros_buildfarm.argument import add_argument_rosdep_cache_dir
+from ros_buildfarm.argument import add_argument_rosdistro_name
+from ros_buildfarm.base_image import BASE_IMAGE_COMMON_DEPENDENCIES_LABEL
+from ros_buildfarm.base_image import BASE_IMAGE_PACKAGES_LABEL
+from ros_buildfarm.base_image import get_base_image_dependencies
+from ros_buildfarm.base_image import get_base_image_platforms
+from ros_buildfarm.common import get_binary_package_versions_source
+from ros_buildfarm.common import get_distribution_repository_keys
+from ros_buildfarm.common import lookup_binary_package_versions
+from ros_buildfarm.config import get_index as get_config_index
+from ros_buildfarm.rosdep_resolution import RosdepResolver
+from ros_buildfarm.templates import create_dockerfile
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description="Generate a 'Dockerfile' for the base image")
+    add_argument_config_url(parser)
+    add_argument_rosdistro_name(parser)
+    add_argument_os_name(parser)
+    add_argument_os_code_name(parser)
+    add_argument_arch(parser)
+    add_argument_distribution_repository_urls(parser)
+    add_argument_distribution_repository_key_files(parser)
+    add_argument_rosdep_cache_dir(parser)
+    add_argument_dockerfile_dir(parser)
+    args = parser.parse_args(argv)
+
+    config = get_config_index(args.config_url)
+    platforms = get_base_image_platforms(config, args.rosdistro_name)
+    build_files = platforms.get(
+        (args.os_name, args.os_code_name, args.arch), [])
+
+    index = get_index(config.rosdistro_index_url)
+    dist_cache = get_distribution_cache(index, args.rosdistro_name)
+
+    # the dependencies needed by most jobs on this platform
+    rosdep_keys, common_rosdep_keys = get_base_image_dependencies(
+        index, dist_cache, args.rosdistro_name, build_files)
+
+    resolver = RosdepResolver(
+        args.rosdistro_name, args.os_name, args.os_code_name,
+        cache_dir=args.rosdep_cache_dir)
+    resolved_names, unresolved_keys = resolver.resolve(
+        rosdep_keys + common_rosdep_keys)
+    if unresolved_keys:
+        print('Skipping the following unresolvable dependencies: ' +
+              ', '.join(unresolved_keys))
+
+    debian_pkg_names = get_debian_package_names(rosdep_keys, resolved_names)
+    common_debian_pkg_names = get_debian_package_names(
+        common_rosdep_keys, resolved_names)
+
+    apt_cache = get_binary_package_versions_source()
+    debian_pkg_versions, missing_debian_pkg_names = \
+        lookup_binary_package_versions(apt_cache, sorted(
+            set(debian_pkg_names) | set(common_debian_pkg_names)))
+    if missing_debian_pkg_names:
+        print('Skipping the following unavailable binary packages: ' +
+              ', '.join(missing_debian_pkg_names))
+        debian_pkg_names = [
+            n for n in debian_pkg_names if n not in missing_debian_pkg_names]
+        common_debian_pkg_names = [
+            n for n in common_debian_pkg_names
+            if n not in missing_debian_pkg_names]
+
+    print('Preinstall the following packages in the base image:')
+    for debian_pkg_name in debian_pkg_names:
+        print('  -', debian_pkg_name)
+    print('The following packages are needed by many jobs:')
+    for debian_pkg_name in common_debian_pkg_names:
+        print('  -', debian_pkg_name)
+
+    # generate Dockerfile
+    data = {
+        'os_name': args.os_name,
+        'os_code_name': args.os_code_name,
+        'arch': args.arch,
+
+        'distribution_repository_urls': args.distribution_repository_urls,
+        'distribution_repository_keys': get_distribution_repository_keys(
+            args.distribution_repository_urls,
+            args.distribution_repository_key_files),
+
+        'dependencies': debian_pkg_names,
+        'dependency_versions': debian_pkg_versions,
+
+        'common_dependencies': common_debian_pkg_names,
+
+        'base_image_packages_label': BASE_IMAGE_PACKAGES_LABEL,
+        'base_image_common_dependencies_label':
+        BASE_IMAGE_COMMON_DEPENDENCIES_LABEL,
+    }
+    create_dockerfile(
+        'misc/base_image_task.Dockerfile.em', data, args.dockerfile_dir)
+
+
+def get_debian_package_names(rosdep_keys, resolved_names):
+    # keep the order by descending frequency
+    debian_pkg_names = []
+    for rosdep_key in rosdep_keys:
+        for debian_pkg_name in resolved_names.get(rosdep_key, []):
+            if debian_pkg_name not in debian_pkg_names:
+                debian_pkg_names.append(debian_pkg_name)
+    return debian_pkg_names
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,9 @@ import subprocess
 import sys
 from time import sleep
 
+# keep in sync with ros_buildfarm/base_image.py
+LOCAL_BASE_IMAGE_PREFIX = 'ros_buildfarm_base:'
+
 
 def main(argv=sys.argv[1:]):
     assert len(argv) < 2
@@ -26,6 +29,10 @@ def main(argv=sys.argv[1:]):
     base_image = get_base_image_from_dockerfile(dockerfile)
     print(base_image)
 
+    if base_image.startswith(LOCAL_BASE_IMAGE_PREFIX):
+        print('Skip pulling the locally built base image')
+        return 0
+
     known_error_strings = [
         'Error pulling image',
         'Server error: Status 502 while fetching image layer',
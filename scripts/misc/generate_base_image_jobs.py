@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import copy
+import sys
+
+from ros_buildfarm.argument import add_argument_config_url
+from ros_buildfarm.argument import add_argument_dry_run
+from ros_buildfarm.argument import add_argument_rosdistro_name
+from ros_buildfarm.base_image import get_base_image_job_name
+from ros_buildfarm.base_image import get_base_image_name
+from ros_buildfarm.base_image import get_base_image_platforms
+from ros_buildfarm.base_image import get_merged_repositories_build_file
+from ros_buildfarm.common import get_default_node_label
+from ros_buildfarm.common import \
+    get_repositories_and_script_generating_key_files
+from ros_buildfarm.config import get_index
+from ros_buildfarm.git import get_repository
+from ros_buildfarm.jenkins import configure_job
+from ros_buildfarm.jenkins import configure_management_view
+from ros_buildfarm.jenkins import connect
+from ros_buildfarm.templates import expand_template
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description="Generate the 'base-image' jobs on Jenkins")
+    add_argument_config_url(parser)
+    add_argument_rosdistro_name(parser)
+    add_argument_dry_run(parser)
+    args = parser.parse_args(argv)
+
+    config = get_index(args.config_url)
+    platforms = get_base_image_platforms(config, args.rosdistro_name)
+
+    jenkins = connect(config.jenkins_url)
+
+    configure_management_view(jenkins, dry_run=args.dry_run)
+
+    for os_name, os_code_name, arch in sorted(platforms.keys()):
+        build_file = get_merged_repositories_build_file(
+            platforms[(os_name, os_code_name, arch)])
+        job_name = get_base_image_job_name(
+            args.rosdistro_name, os_name, os_code_name, arch)
+        job_config = get_job_config(
+            args, config, build_file, os_name, os_code_name, arch)
+        configure_job(jenkins, job_name, job_config, dry_run=args.dry_run)
+
+
+def get_job_config(args, config, build_file, os_name, os_code_name, arch):
+    template_name = 'misc/base_image_job.xml.em'
+
+    repository_args, script_generating_key_files = \
+        get_repositories_and_script_generating_key_files(
+            config=config, build_file=build_file)
+
+    job_data = copy.deepcopy(args.__dict__)
+    job_data.update({
+        'ros_buildfarm_repository': get_repository(),
+
+        'script_generating_key_files': script_generating_key_files,
+
+        'os_name': os_name,
+        'os_code_name': os_code_name,
+        'arch': arch,
+        'repository_args': repository_args,
+
+        'node_label': get_default_node_label(),
+
+        'base_image': get_base_image_name(
+            args.rosdistro_name, os_name, os_code_name, arch,
+            registry=config.base_image_registry),
+        'base_image_registry': config.base_image_registry,
+
+        'notification_emails':
+        config.distributions[args.rosdistro_name]['notification_emails'],
+    })
+    job_config = expand_template(template_name, job_data)
+    return job_config
+
+
+if __name__ == '__main__':
+    main()
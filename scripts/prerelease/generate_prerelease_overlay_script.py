@@ -37,6 +37,7 @@ from ros_buildfarm.config import get_index as get_config_index
 from ros_buildfarm.prerelease import add_overlay_arguments
 from ros_buildfarm.prerelease import get_overlay_package_names
 from ros_buildfarm.templates import expand_template
+from ros_buildfarm.templates import get_wrapper_script_command
 
 
 def main(argv=sys.argv[1:]):
@@ -100,7 +101,8 @@ def main(argv=sys.argv[1:]):
     if not args.json:
         value = expand_template(
             'prerelease/prerelease_overlay_script.sh.em', {
-                'scms': scms},
+                'scms': scms,
+                'git_wrapper_command': get_wrapper_script_command('git.py')},
             options={BANGPATH_OPT: False})
         print(value)
     else:
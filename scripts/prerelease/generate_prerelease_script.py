@@ -41,6 +41,7 @@ from ros_buildfarm.config import get_source_build_files
 from ros_buildfarm.devel_job import configure_devel_job
 from ros_buildfarm.prerelease import add_overlay_arguments
 from ros_buildfarm.templates import expand_template
+from ros_buildfarm.templates import get_wrapper_script_command
 
 
 def main(argv=sys.argv[1:]):
@@ -245,6 +246,7 @@ def main(argv=sys.argv[1:]):
         'ros_buildfarm_python_path': os.path.dirname(
             os.path.dirname(os.path.abspath(ros_buildfarm_file))),
         'python_executable': sys.executable,
+        'git_wrapper_command': get_wrapper_script_command('git.py'),
         'prerelease_script_path': os.path.dirname(os.path.abspath(__file__))})
 
     if not os.path.exists(args.output_dir):
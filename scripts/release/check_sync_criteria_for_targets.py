@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import sys
+
+from ros_buildfarm.argument import add_argument_build_name
+from ros_buildfarm.argument import add_argument_cache_dir
+from ros_buildfarm.argument import add_argument_config_url
+from ros_buildfarm.argument import \
+    add_argument_os_code_name_and_arch_tuples
+from ros_buildfarm.argument import add_argument_rosdistro_name
+from ros_buildfarm.common import Target
+from ros_buildfarm.sync_criteria import check_sync_criteria_for_targets
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Check if the sync criteria are matched to sync ' +
+                    'packages from the building to the testing repo ' +
+                    'for multiple targets at once')
+    add_argument_config_url(parser)
+    add_argument_rosdistro_name(parser)
+    add_argument_build_name(parser, 'release')
+    add_argument_os_code_name_and_arch_tuples(parser, required=False)
+    add_argument_cache_dir(parser, '/tmp/debian_repo_cache')
+    parser.add_argument(
+        '--report-file',
+        help='The path of a JSON file to write the result of each target to')
+    args = parser.parse_args(argv)
+
+    targets = None
+    if args.os_code_name_and_arch_tuples:
+        targets = []
+        for os_code_name_and_arch in args.os_code_name_and_arch_tuples:
+            assert os_code_name_and_arch.count(':') == 1, \
+                'The string (%s) does not contain single colon separating ' \
+                'an OS code name and an architecture' % os_code_name_and_arch
+            os_code_name, arch = os_code_name_and_arch.split(':')
+            targets.append(Target('ubuntu', os_code_name, arch))
+
+    results = check_sync_criteria_for_targets(
+        args.config_url, args.rosdistro_name, args.release_build_name,
+        targets, args.cache_dir)
+
+    print('')
+    print('Sync criteria of the targets:')
+    for target, success in results.items():
+        print('- %s %s %s: %s' % (target + ('pass' if success else 'fail', )))
+
+    if args.report_file:
+        with open(args.report_file, 'w') as h:
+            json.dump([{
+                'os_name': target.os_name,
+                'os_code_name': target.os_code_name,
+                'arch': target.arch,
+                'success': success,
+            } for target, success in results.items()], h, indent=2)
+
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,9 +23,11 @@ import sys
 from rosdistro import get_distribution_file
 from rosdistro import get_index
 
-from apt import Cache
 from ros_buildfarm.argument import add_argument_arch
+from ros_buildfarm.argument import add_argument_base_image
+from ros_buildfarm.argument import add_argument_binary_package_versions_file
 from ros_buildfarm.argument import add_argument_binarydeb_dir
+from ros_buildfarm.argument import add_argument_common_dependencies
 from ros_buildfarm.argument import \
     add_argument_distribution_repository_key_files
 from ros_buildfarm.argument import add_argument_distribution_repository_urls
@@ -35,10 +37,13 @@ from ros_buildfarm.argument import add_argument_os_name
 from ros_buildfarm.argument import add_argument_package_name
 from ros_buildfarm.argument import add_argument_rosdistro_index_url
 from ros_buildfarm.argument import add_argument_rosdistro_name
-from ros_buildfarm.common import get_binary_package_versions
+from ros_buildfarm.base_image import select_base_image
+from ros_buildfarm.common import get_binary_package_versions_source
 from ros_buildfarm.common import get_debian_package_name
 from ros_buildfarm.common import get_distribution_repository_keys
 from ros_buildfarm.common import get_user_id
+from ros_buildfarm.common import lookup_binary_package_versions
+from ros_buildfarm.dependency_layers import order_dependencies_in_tiers
 from ros_buildfarm.templates import create_dockerfile
 
 
@@ -55,6 +60,9 @@ def main(argv=sys.argv[1:]):
     add_argument_distribution_repository_key_files(parser)
     add_argument_binarydeb_dir(parser)
     add_argument_dockerfile_dir(parser)
+    add_argument_binary_package_versions_file(parser)
+    add_argument_common_dependencies(parser)
+    add_argument_base_image(parser)
     args = parser.parse_args(argv)
 
     debian_package_name = get_debian_package_name(
@@ -76,12 +84,21 @@ def main(argv=sys.argv[1:]):
     # add build dependencies from .dsc file
     dsc_file = get_dsc_file(
         args.binarydeb_dir, debian_package_name, debian_package_version)
-    debian_pkg_names += sorted(get_build_depends(dsc_file))
+    ordered_names, common_count = order_dependencies_in_tiers(
+        get_build_depends(dsc_file), args.common_dependencies)
+    # the generic and common dependencies are shared by many jobs
+    stable_dependency_count = len(debian_pkg_names) + common_count
+    debian_pkg_names += ordered_names
 
     # get versions for build dependencies
-    apt_cache = Cache()
-    debian_pkg_versions = get_binary_package_versions(
-        apt_cache, debian_pkg_names)
+    apt_cache = get_binary_package_versions_source(
+        args.binary_package_versions_file)
+    debian_pkg_versions, missing_debian_pkg_names = \
+        lookup_binary_package_versions(apt_cache, debian_pkg_names)
+    if missing_debian_pkg_names:
+        raise RuntimeError(
+            'Could not find the following build dependencies: %s' %
+            ', '.join(missing_debian_pkg_names))
 
     # generate Dockerfile
     data = {
@@ -98,6 +115,10 @@ def main(argv=sys.argv[1:]):
 
         'dependencies': debian_pkg_names,
         'dependency_versions': debian_pkg_versions,
+        'stable_dependency_count': stable_dependency_count,
+
+        'base_image': select_base_image(
+            args.base_image, args.base_image_packages, debian_pkg_names),
 
         'rosdistro_name': args.rosdistro_name,
         'package_name': args.package_name,
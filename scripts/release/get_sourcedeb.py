@@ -22,6 +22,8 @@ from ros_buildfarm.argument import add_argument_rosdistro_index_url
 from ros_buildfarm.argument import add_argument_rosdistro_name
 from ros_buildfarm.argument import add_argument_skip_download_sourcedeb
 from ros_buildfarm.argument import add_argument_sourcedeb_dir
+from ros_buildfarm.argument import add_argument_sources_index
+from ros_buildfarm.argument import add_argument_target_repository
 from ros_buildfarm.binarydeb_job import get_sourcedeb
 from ros_buildfarm.common import Scope
 
@@ -35,11 +37,16 @@ def main(argv=sys.argv[1:]):
         add_argument_package_name(parser)
         add_argument_sourcedeb_dir(parser)
         add_argument_skip_download_sourcedeb(parser)
+        add_argument_target_repository(parser)
+        add_argument_sources_index(parser)
         args = parser.parse_args(argv)
 
         return get_sourcedeb(
             args.rosdistro_index_url, args.rosdistro_name, args.package_name,
-            args.sourcedeb_dir, args.skip_download_sourcedeb)
+            args.sourcedeb_dir, args.skip_download_sourcedeb,
+            target_repository=args.target_repository,
+            os_code_name=args.sources_os_code_name,
+            cache_dir=args.sources_cache_dir)
 
 
 if __name__ == '__main__':
@@ -27,11 +27,13 @@ from ros_buildfarm.argument import add_argument_dockerfile_dir
 from ros_buildfarm.argument import add_argument_os_code_name
 from ros_buildfarm.argument import add_argument_os_name
 from ros_buildfarm.argument import add_argument_arch
+from ros_buildfarm.argument import add_argument_base_image_registry
 from ros_buildfarm.argument import add_argument_package_name
 from ros_buildfarm.argument import add_argument_rosdistro_index_url
 from ros_buildfarm.argument import add_argument_rosdistro_name
 from ros_buildfarm.argument import add_argument_skip_download_sourcedeb
 from ros_buildfarm.argument import add_argument_target_repository
+from ros_buildfarm.base_image import get_base_image_data
 from ros_buildfarm.common import get_distribution_repository_keys
 from ros_buildfarm.common import get_user_id
 from ros_buildfarm.templates import create_dockerfile
@@ -53,6 +55,7 @@ def main(argv=sys.argv[1:]):
     add_argument_dockerfile_dir(parser)
     add_argument_skip_download_sourcedeb(parser)
     add_argument_append_timestamp(parser)
+    add_argument_base_image_registry(parser)
     args = parser.parse_args(argv)
 
     data = copy.deepcopy(args.__dict__)
@@ -70,6 +73,9 @@ def main(argv=sys.argv[1:]):
         'binarydeb_dir': '/tmp/binarydeb',
         'dockerfile_dir': '/tmp/docker_build_binarydeb',
     })
+    data.update(get_base_image_data(
+        args.rosdistro_name, args.os_name, args.os_code_name, args.arch,
+        registry=args.base_image_registry))
     create_dockerfile(
         'release/binarydeb_create_task.Dockerfile.em',
         data, args.dockerfile_dir)
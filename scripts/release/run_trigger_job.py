@@ -27,6 +27,7 @@ from ros_buildfarm.argument import add_argument_distribution_repository_urls
 from ros_buildfarm.argument import add_argument_dockerfile_dir
 from ros_buildfarm.argument import add_argument_groovy_script
 from ros_buildfarm.argument import add_argument_missing_only
+from ros_buildfarm.argument import add_argument_roots_only
 from ros_buildfarm.argument import add_argument_rosdistro_name
 from ros_buildfarm.argument import add_argument_source_only
 from ros_buildfarm.common import get_distribution_repository_keys
@@ -43,6 +44,7 @@ def main(argv=sys.argv[1:]):
     add_argument_distribution_repository_urls(parser)
     add_argument_distribution_repository_key_files(parser)
     add_argument_missing_only(parser)
+    add_argument_roots_only(parser)
     add_argument_source_only(parser)
     add_argument_groovy_script(parser)
     add_argument_cache_dir(parser)
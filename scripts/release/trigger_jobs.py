@@ -23,6 +23,7 @@ from ros_buildfarm.argument import add_argument_cause
 from ros_buildfarm.argument import add_argument_config_url
 from ros_buildfarm.argument import add_argument_groovy_script
 from ros_buildfarm.argument import add_argument_missing_only
+from ros_buildfarm.argument import add_argument_roots_only
 from ros_buildfarm.argument import add_argument_rosdistro_name
 from ros_buildfarm.argument import add_argument_source_only
 from ros_buildfarm.trigger_job import trigger_release_jobs
@@ -36,6 +37,7 @@ def main(argv=sys.argv[1:]):
     add_argument_rosdistro_name(parser)
     add_argument_build_name(parser, 'release')
     add_argument_missing_only(parser)
+    add_argument_roots_only(parser)
     add_argument_source_only(parser)
     add_argument_cause(parser)
     add_argument_groovy_script(parser)
@@ -45,7 +47,7 @@ def main(argv=sys.argv[1:]):
     return trigger_release_jobs(
         args.config_url, args.rosdistro_name, args.release_build_name,
         args.missing_only, args.source_only, args.cache_dir, cause=args.cause,
-        groovy_script=args.groovy_script)
+        groovy_script=args.groovy_script, roots_only=args.roots_only)
 
 
 if __name__ == '__main__':
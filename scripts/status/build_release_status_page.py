@@ -37,11 +37,26 @@ def main(argv=sys.argv[1:]):
         '--copy-resources',
         action='store_true',
         help='Copy the resources instead of using symlinks')
+    parser.add_argument(
+        '--client-side-rendering',
+        action='store_true',
+        help='Write the package data into a separate JSON file which is '
+             'rendered by the browser')
+    parser.add_argument(
+        '--state-dir',
+        help='The directory to persist the fingerprints of the inputs in to '
+             'skip regenerating the page if nothing has changed')
+    parser.add_argument(
+        '--history-file',
+        help='The SQLite database to record the version changes of each run '
+             'in and to generate the changes page from')
     args = parser.parse_args(argv)
 
     return build_release_status_page(
         args.config_url, args.rosdistro_name, args.release_build_name,
-        args.cache_dir, args.output_dir, copy_resources=args.copy_resources)
+        args.cache_dir, args.output_dir, copy_resources=args.copy_resources,
+        client_side_rendering=args.client_side_rendering,
+        state_dir=args.state_dir, history_file=args.history_file)
 
 
 if __name__ == '__main__':
@@ -33,11 +33,26 @@ def main(argv=sys.argv[1:]):
     add_argument_cache_dir(parser, '/tmp/debian_repo_cache')
     add_argument_output_name(parser)
     add_argument_output_dir(parser)
+    parser.add_argument(
+        '--client-side-rendering',
+        action='store_true',
+        help='Write the package data into a separate JSON file which is '
+             'rendered by the browser')
+    parser.add_argument(
+        '--state-dir',
+        help='The directory to persist the fingerprints of the inputs in to '
+             'skip regenerating the page if nothing has changed')
+    parser.add_argument(
+        '--history-file',
+        help='The SQLite database to record the version changes of each run '
+             'in and to generate the changes page from')
     args = parser.parse_args(argv)
 
     return build_debian_repos_status_page(
         args.debian_repository_urls, args.os_code_name_and_arch_tuples,
-        args.cache_dir, args.output_name, args.output_dir)
+        args.cache_dir, args.output_name, args.output_dir,
+        client_side_rendering=args.client_side_rendering,
+        state_dir=args.state_dir, history_file=args.history_file)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+
+from ros_buildfarm.argument import add_argument_cache_dir
+from ros_buildfarm.argument import add_argument_config_url
+from ros_buildfarm.argument import add_argument_output_dir
+from ros_buildfarm.argument import add_argument_rosdistro_name
+from ros_buildfarm.status_page import build_status_pages
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Generate all status pages of a ROS distribution '
+                    'sharing the repository indices between them')
+    add_argument_config_url(parser)
+    add_argument_rosdistro_name(parser)
+    add_argument_cache_dir(parser, '/tmp/debian_repo_cache')
+    add_argument_output_dir(parser)
+    parser.add_argument(
+        '--copy-resources',
+        action='store_true',
+        help='Copy the resources instead of using symlinks')
+    parser.add_argument(
+        '--client-side-rendering',
+        action='store_true',
+        help='Write the package data into a separate JSON file which is '
+             'rendered by the browser')
+    parser.add_argument(
+        '--state-dir',
+        help='The directory to persist the fingerprints of the inputs in to '
+             'skip regenerating the page if nothing has changed')
+    parser.add_argument(
+        '--history-file',
+        help='The SQLite database to record the version changes of each run '
+             'in and to generate the changes page from')
+    parser.add_argument(
+        '--older-rosdistro-names',
+        nargs='*',
+        default=[],
+        metavar='OLDER_ROSDISTRO_NAME',
+        help='List of older rosdistro names to compare with')
+    parser.add_argument(
+        '--compare-pairwise',
+        action='store_true',
+        help='Additionally generate a compare page for each older ROS '
+             'distribution')
+    args = parser.parse_args(argv)
+
+    return build_status_pages(
+        args.config_url, args.rosdistro_name, args.cache_dir,
+        args.output_dir, copy_resources=args.copy_resources,
+        client_side_rendering=args.client_side_rendering,
+        state_dir=args.state_dir, history_file=args.history_file,
+        older_rosdistro_names=args.older_rosdistro_names,
+        compare_pairwise=args.compare_pairwise)
+
+
+if __name__ == '__main__':
+    main()
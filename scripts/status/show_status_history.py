@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+
+from ros_buildfarm.status_history import get_status_change_type
+from ros_buildfarm.status_history import StatusHistory
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Show the version changes recorded for a status page')
+    parser.add_argument(
+        'history_file',
+        help='The SQLite database containing the status history')
+    parser.add_argument(
+        'page_name',
+        help='The name of the status page (e.g. ros_kinetic_default)')
+    parser.add_argument(
+        '--since-run-id',
+        type=int,
+        help='Only show the changes of runs after this run id')
+    parser.add_argument(
+        '--package',
+        help='Only show the changes of this Debian package')
+    parser.add_argument(
+        '--runs',
+        action='store_true',
+        help='List the recorded runs instead of the changes')
+    args = parser.parse_args(argv)
+
+    history = StatusHistory(args.history_file)
+    try:
+        if args.runs:
+            for run in history.get_runs(args.page_name):
+                print('\t'.join([
+                    str(run.run_id), '%.0f' % run.time,
+                    'baseline' if run.baseline else str(run.change_count)]))
+            return 0
+
+        for change in history.get_changes(
+                args.page_name, since_run_id=args.since_run_id,
+                package=args.package):
+            print('\t'.join([
+                str(change.run_id), change.package,
+                change.target.os_code_name, change.target.arch,
+                change.repository, change.old_version or '-',
+                change.new_version or '-', get_status_change_type(change)]))
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
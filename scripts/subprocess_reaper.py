@@ -19,18 +19,51 @@ This scripts monitors a specific process and ensures that its child processes
 are terminated correctly.
 If any child process is a 'docker run' invocation it extracts the container id
 from the command line arguments and invokes 'docker kill' explicitly.
+
+Where available the script is event driven: the termination of the monitored
+process is detected through a pidfd and new child processes are reported by
+the proc connector (which requires the CAP_NET_ADMIN capability).
+Otherwise it falls back to polling the child processes periodically.
 """
 
 from __future__ import print_function
 
 import argparse
+import ctypes
+import errno
 import os
 import psutil
+import select
 import signal
+import socket
+import struct
 import subprocess
 import sys
 import time
 
+# the interval in seconds to poll the child processes
+# don't use small values like 0.25s since that results in a high CPU load
+POLLING_INTERVAL = 10.0
+
+# constants of the proc connector (linux/connector.h, linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+# struct nlmsghdr
+NLMSGHDR_FORMAT = '=IHHII'
+# struct cb_msg without the data
+CN_MSG_FORMAT = '=IIIIHH'
+# struct proc_event without the event data
+PROC_EVENT_FORMAT = '=IIQ'
+
+# the syscall number of pidfd_open is the same on all architectures
+SYS_PIDFD_OPEN = 434
+
 
 def main(argv=None):
     if argv is None:
@@ -59,31 +92,28 @@ def main(argv=None):
 
     # wait until monitored process has died
     print('Monitoring PID %i...' % args.pid)
-    children = []
     cid_files = set([])
-    while proc.is_running():
-        try:
-            children = proc.get_children(recursive=True)
-        except psutil.NoSuchProcess:
-            continue
-        # check for docker since the cmdline is unavailable after termination
-        for c in children:
-            try:
-                cmdline = c.cmdline
-            except psutil.NoSuchProcess:
-                continue
-            if cmdline[0] == 'docker' and cmdline[1] == 'run':
-                cid_prefix = '--cidfile='
-                for arg in cmdline[2:]:
-                    if arg.startswith(cid_prefix):
-                        cid_file = arg[len(cid_prefix):]
-                        if cid_file not in cid_files:
-                            print("- detected .cid file '%s'" % cid_file)
-                            cid_files.add(cid_file)
-                        break
-        # don't use small sleep values like 0.25s
-        # since that results in a high CPU load
-        time.sleep(10)
+    try:
+        connector = ProcConnector()
+    except (OSError, socket.error) as e:
+        print('Proc connector not available (%s), polling for child '
+              'processes' % e)
+        connector = None
+    pidfd = open_pidfd(args.pid)
+    if pidfd is None:
+        print('Pidfd not available, polling for the termination of the '
+              'process')
+    try:
+        if connector:
+            children = monitor_with_connector(
+                proc, connector, pidfd, cid_files)
+        else:
+            children = monitor_with_polling(proc, pidfd, cid_files)
+    finally:
+        if connector:
+            connector.close()
+        if pidfd is not None:
+            os.close(pidfd)
 
     # remove myself from list of children
     children = [c for c in children if c.pid != mypid]
@@ -152,6 +182,186 @@ def main(argv=None):
     return 0
 
 
+def monitor_with_polling(proc, pidfd, cid_files):
+    children = []
+    while proc.is_running():
+        children = get_children(proc, cid_files, children)
+        if pidfd is None:
+            time.sleep(POLLING_INTERVAL)
+            continue
+        # return immediately when the process terminates
+        readable, _, _ = select.select([pidfd], [], [], POLLING_INTERVAL)
+        if readable:
+            # the pidfd stays readable while psutil still considers the
+            # terminated process as running until it has been reaped
+            break
+    return children
+
+
+def monitor_with_connector(proc, connector, pidfd, cid_files):
+    # the events only report new processes, start with the existing ones
+    children = {c.pid: c for c in get_children(proc, cid_files, [])}
+    fds = [connector.fileno()]
+    if pidfd is not None:
+        fds.append(pidfd)
+    while proc.is_running():
+        # without a pidfd the exit event of the process wakes up the loop
+        readable, _, _ = select.select(fds, [], [])
+        if connector.fileno() in readable:
+            if handle_proc_events(proc, connector, cid_files, children):
+                break
+        if pidfd is not None and pidfd in readable:
+            # the pidfd stays readable while psutil still considers the
+            # terminated process as running until it has been reaped
+            break
+    return list(children.values())
+
+
+def handle_proc_events(proc, connector, cid_files, children):
+    """
+    Update the child processes from the pending proc connector events.
+
+    :returns: ``True`` if the monitored process has terminated
+    """
+    try:
+        events = connector.receive()
+    except (OSError, socket.error) as e:
+        if e.errno != errno.ENOBUFS:
+            raise
+        # events have been dropped, rescan all child processes
+        print('Proc connector events have been dropped, rescanning')
+        rescanned = get_children(proc, cid_files, list(children.values()))
+        children.clear()
+        children.update((c.pid, c) for c in rescanned)
+        return False
+    for event in events:
+        what, pid, parent_pid = event
+        if what == PROC_EVENT_FORK and \
+                (parent_pid == proc.pid or parent_pid in children):
+            try:
+                children[pid] = psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                pass
+        elif what == PROC_EVENT_EXEC and pid in children:
+            # check immediately since short lived processes are gone
+            # before the next poll
+            check_docker_run(children[pid], cid_files)
+        elif what == PROC_EVENT_EXIT and pid in children:
+            del children[pid]
+        elif what == PROC_EVENT_EXIT and pid == proc.pid:
+            return True
+    return False
+
+
+def get_children(proc, cid_files, previous_children):
+    try:
+        children = proc.get_children(recursive=True)
+    except psutil.NoSuchProcess:
+        return previous_children
+    # check for docker since the cmdline is unavailable after termination
+    for c in children:
+        check_docker_run(c, cid_files)
+    return children
+
+
+def check_docker_run(process, cid_files):
+    try:
+        cmdline = process.cmdline
+    except psutil.NoSuchProcess:
+        return
+    if cmdline[:2] == ['docker', 'run']:
+        cid_prefix = '--cidfile='
+        for arg in cmdline[2:]:
+            if arg.startswith(cid_prefix):
+                cid_file = arg[len(cid_prefix):]
+                if cid_file not in cid_files:
+                    print("- detected .cid file '%s'" % cid_file)
+                    cid_files.add(cid_file)
+                break
+
+
+def open_pidfd(pid):
+    """
+    Get a file descriptor which becomes readable when the process terminates.
+
+    :returns: The file descriptor or ``None`` if the kernel (Linux 5.3 and
+      newer) or Python doesn't support it
+    """
+    if hasattr(os, 'pidfd_open'):
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.syscall(SYS_PIDFD_OPEN, pid, 0)
+    except (AttributeError, OSError):
+        return None
+    return fd if fd >= 0 else None
+
+
+class ProcConnector(object):
+    """Receive fork, exec and exit events of all processes from the kernel."""
+
+    def __init__(self):
+        self._socket = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self._socket.bind((os.getpid(), CN_IDX_PROC))
+            self._send_op(PROC_CN_MCAST_LISTEN)
+        except (OSError, socket.error):
+            self._socket.close()
+            raise
+
+    def _send_op(self, op):
+        data = struct.pack('=I', op)
+        cn_msg = struct.pack(
+            CN_MSG_FORMAT, CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(data), 0)
+        length = struct.calcsize(NLMSGHDR_FORMAT) + len(cn_msg) + len(data)
+        nlmsghdr = struct.pack(
+            NLMSGHDR_FORMAT, length, NLMSG_DONE, 0, 0, os.getpid())
+        self._socket.send(nlmsghdr + cn_msg + data)
+
+    def fileno(self):
+        return self._socket.fileno()
+
+    def receive(self):
+        """
+        Receive the pending events.
+
+        :returns: A list of (event type, process id, parent process id)
+          tuples, the parent process id is only set for fork events
+        """
+        data = self._socket.recv(4096)
+        events = []
+        offset = 0
+        while offset + struct.calcsize(NLMSGHDR_FORMAT) <= len(data):
+            length = struct.unpack_from(NLMSGHDR_FORMAT, data, offset)[0]
+            if not length:
+                break
+            event_offset = offset + struct.calcsize(NLMSGHDR_FORMAT) + \
+                struct.calcsize(CN_MSG_FORMAT)
+            what = struct.unpack_from(
+                PROC_EVENT_FORMAT, data, event_offset)[0]
+            event_offset += struct.calcsize(PROC_EVENT_FORMAT)
+            if what == PROC_EVENT_FORK:
+                _, parent_tgid, child_pid, child_tgid = struct.unpack_from(
+                    '=IIII', data, event_offset)
+                # ignore new threads
+                if child_pid == child_tgid:
+                    events.append((what, child_tgid, parent_tgid))
+            elif what in (PROC_EVENT_EXEC, PROC_EVENT_EXIT):
+                pid, tgid = struct.unpack_from('=II', data, event_offset)
+                if pid == tgid:
+                    events.append((what, tgid, None))
+            # messages are aligned to 4 bytes
+            offset += (length + 3) & ~3
+        return events
+
+    def close(self):
+        self._socket.close()
+
+
 def wait_for_processes(processes, timeout=1.0):
     # wait until the processes are no longer running or the timeout has elapsed
     print('Waiting %is for processes to end:' % timeout)
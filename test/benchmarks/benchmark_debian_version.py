@@ -0,0 +1,128 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark comparing Debian versions the way the status pages do.
+
+Every package version is compared against the versions in the other
+repositories which results in the same version strings being compared many
+times.
+The previous implementation based on ``LooseVersion`` is measured as well if
+``distutils`` is available.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ros_buildfarm.debian_version import DebianVersion  # noqa: E402
+from ros_buildfarm.debian_version import get_debian_version  # noqa: E402
+
+
+def create_versions(package_count, seed):
+    rng = random.Random(seed)
+    versions = []
+    for _ in range(package_count):
+        version = '%d.%d.%d-%d' % (
+            rng.randint(0, 2), rng.randint(0, 20), rng.randint(0, 50),
+            rng.randint(0, 2))
+        # one entry per repository with slightly different versions
+        versions.append([
+            '%sxenial-2016%02d%02d-1200-+0000' % (
+                version, rng.randint(1, 12), rng.randint(1, 28))
+            for _ in range(3)])
+    return versions
+
+
+def compare_loose_versions(versions, repeat):
+    from distutils.version import LooseVersion
+    count = 0
+    for _ in range(repeat):
+        for repo_versions in versions:
+            for version in repo_versions:
+                for other_version in repo_versions:
+                    try:
+                        count += LooseVersion(version) > \
+                            LooseVersion(other_version)
+                    except TypeError:
+                        pass
+    return count
+
+
+def compare_uncached_debian_versions(versions, repeat):
+    count = 0
+    for _ in range(repeat):
+        for repo_versions in versions:
+            for version in repo_versions:
+                for other_version in repo_versions:
+                    count += DebianVersion(version) > \
+                        DebianVersion(other_version)
+    return count
+
+
+def compare_debian_versions(versions, repeat):
+    get_debian_version.cache_clear()
+    count = 0
+    for _ in range(repeat):
+        for repo_versions in versions:
+            for version in repo_versions:
+                for other_version in repo_versions:
+                    count += get_debian_version(version) > \
+                        get_debian_version(other_version)
+    return count
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--packages', type=int, default=5000,
+        help='The number of packages')
+    parser.add_argument(
+        '--repeat', type=int, default=10,
+        help='The number of times all versions are compared (e.g. the '
+             'number of targets)')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='The seed for the random number generator')
+    args = parser.parse_args(argv)
+
+    versions = create_versions(args.packages, args.seed)
+    benchmarks = [
+        ('DebianVersion (cached)', compare_debian_versions),
+        ('DebianVersion (uncached)', compare_uncached_debian_versions),
+    ]
+    try:
+        import distutils.version  # noqa: F401
+    except ImportError:
+        print('Skipping LooseVersion since distutils is not available')
+    else:
+        benchmarks.append(('LooseVersion', compare_loose_versions))
+
+    print('Comparing the versions of %d packages %d times' %
+          (args.packages, args.repeat))
+    for name, function in benchmarks:
+        start = time.time()
+        function(versions, args.repeat)
+        print('- %s: %.3fs' % (name, time.time() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the job generation and the status pages.
+
+A synthetic build farm (see ``synthetic_buildfarm.py``) is served from a
+local HTTP server.
+The jobs are generated in groovy script mode so that no Jenkins instance is
+needed.
+The results can be written to a JSON file and compared with the results of a
+previous run to detect regressions.
+"""
+
+from __future__ import print_function
+
+import argparse
+from contextlib import contextmanager
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from synthetic_buildfarm import BUILD_NAME  # noqa: E402
+from synthetic_buildfarm import OTHER_ROSDISTRO_NAME  # noqa: E402
+from synthetic_buildfarm import ROSDISTRO_NAME  # noqa: E402
+from synthetic_buildfarm import SyntheticBuildfarm  # noqa: E402
+
+from ros_buildfarm.timing import get_resource_usage  # noqa: E402
+
+
+def benchmark_configure_release_jobs(buildfarm, work_dir):
+    from ros_buildfarm.release_job import configure_release_jobs
+    configure_release_jobs(
+        buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME,
+        groovy_script=os.path.join(work_dir, 'reconfigure_jobs.groovy'))
+
+
+def benchmark_configure_devel_jobs(buildfarm, work_dir):
+    from ros_buildfarm.devel_job import configure_devel_jobs
+    configure_devel_jobs(
+        buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME,
+        groovy_script=os.path.join(work_dir, 'reconfigure_jobs.groovy'))
+
+
+def benchmark_configure_doc_jobs(buildfarm, work_dir):
+    from ros_buildfarm.doc_job import configure_doc_jobs
+    configure_doc_jobs(
+        buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME,
+        groovy_script=os.path.join(work_dir, 'reconfigure_jobs.groovy'))
+
+
+def benchmark_topological_order_packages(buildfarm, work_dir):
+    from catkin_pkg.package import parse_package_string
+    from rosdistro import get_distribution_cache
+    from rosdistro import get_index
+    from ros_buildfarm.common import topological_order_packages
+    index = get_index(buildfarm.rosdistro_index_url)
+    dist_cache = get_distribution_cache(index, ROSDISTRO_NAME)
+    pkgs = {}
+    for pkg_name, pkg_xml in dist_cache.release_package_xmls.items():
+        pkgs[pkg_name] = parse_package_string(pkg_xml)
+    topological_order_packages(pkgs)
+
+
+def benchmark_release_status_page(buildfarm, work_dir):
+    from ros_buildfarm.status_page import build_release_status_page
+    build_release_status_page(
+        buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME,
+        os.path.join(work_dir, 'cache'), work_dir)
+
+
+def benchmark_release_status_page_data(buildfarm, work_dir):
+    from ros_buildfarm.status_page import build_release_status_page
+    build_release_status_page(
+        buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME,
+        os.path.join(work_dir, 'cache'), work_dir,
+        client_side_rendering=True)
+
+
+def benchmark_debian_repos_status_page(buildfarm, work_dir):
+    from ros_buildfarm.status_page import build_debian_repos_status_page
+    build_debian_repos_status_page(
+        [buildfarm.get_debian_repository_url(name)
+         for name in ['building', 'testing', 'main']],
+        ['%s:%s' % target for target in buildfarm.targets],
+        os.path.join(work_dir, 'cache'), 'repos', work_dir)
+
+
+def benchmark_status_pages(buildfarm, work_dir):
+    from ros_buildfarm.status_page import build_status_pages
+    build_status_pages(
+        buildfarm.config_url, ROSDISTRO_NAME,
+        os.path.join(work_dir, 'cache'), work_dir)
+
+
+def benchmark_release_compare_page(buildfarm, work_dir):
+    from ros_buildfarm.status_page import build_release_compare_page
+    build_release_compare_page(
+        buildfarm.config_url, [ROSDISTRO_NAME, OTHER_ROSDISTRO_NAME],
+        work_dir)
+
+
+BENCHMARKS = [
+    ('configure_release_jobs', benchmark_configure_release_jobs),
+    ('configure_devel_jobs', benchmark_configure_devel_jobs),
+    ('configure_doc_jobs', benchmark_configure_doc_jobs),
+    ('topological_order_packages', benchmark_topological_order_packages),
+    ('release_status_page', benchmark_release_status_page),
+    ('release_status_page_data', benchmark_release_status_page_data),
+    ('debian_repos_status_page', benchmark_debian_repos_status_page),
+    ('release_compare_page', benchmark_release_compare_page),
+    ('status_pages', benchmark_status_pages),
+]
+
+
+@contextmanager
+def redirect_output(filename):
+    # the functions print a lot of output which would skew the timing
+    sys.stdout.flush()
+    sys.stderr.flush()
+    stdout_fd = os.dup(1)
+    stderr_fd = os.dup(2)
+    with open(filename, 'a') as h:
+        os.dup2(h.fileno(), 1)
+        os.dup2(h.fileno(), 2)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(stdout_fd, 1)
+            os.dup2(stderr_fd, 2)
+            os.close(stdout_fd)
+            os.close(stderr_fd)
+
+
+def run_benchmark(name, function, buildfarm, tmp_dir, repeat):
+    results = {'wall_time': [], 'cpu_time': []}
+    log_filename = os.path.join(tmp_dir, '%s.log' % name)
+    for i in range(repeat):
+        work_dir = os.path.join(tmp_dir, '%s_%d' % (name, i))
+        os.makedirs(work_dir)
+        with redirect_output(log_filename):
+            start = get_resource_usage()
+            function(buildfarm, work_dir)
+            end = get_resource_usage()
+        results['wall_time'].append(end['wall_time'] - start['wall_time'])
+        results['cpu_time'].append(end['cpu_time'] - start['cpu_time'])
+        results['peak_rss_kib'] = end['peak_rss_kib']
+        shutil.rmtree(work_dir)
+    results['min_wall_time'] = min(results['wall_time'])
+    results['median_wall_time'] = \
+        sorted(results['wall_time'])[len(results['wall_time']) // 2]
+    return results
+
+
+def get_environment():
+    environment = {
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    try:
+        environment['git_commit'] = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return environment
+
+
+def print_comparison(results, baseline):
+    print('')
+    print('Comparison with the baseline from %s:' % time.strftime(
+        '%Y-%m-%d %H:%M:%S', time.localtime(baseline['timestamp'])))
+    for name, result in sorted(results.items()):
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['min_wall_time']
+        after = result['min_wall_time']
+        print('- %s: %.3fs -> %.3fs (%+.1f%%)' % (
+            name, before, after,
+            (after - before) / before * 100 if before else 0))
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--packages', type=int, default=1000,
+        help='The number of packages in the distribution')
+    parser.add_argument(
+        '--targets', type=int, default=3,
+        help='The number of targets in the build files (at most 30)')
+    parser.add_argument(
+        '--max-depends', type=int, default=5,
+        help='The maximum number of dependencies per package')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='The seed for the random number generator')
+    parser.add_argument(
+        '--repeat', type=int, default=1,
+        help='The number of times each benchmark is run')
+    parser.add_argument(
+        '--benchmarks', nargs='*', metavar='NAME',
+        choices=[name for name, _ in BENCHMARKS],
+        help='The benchmarks to run (default: all)')
+    parser.add_argument(
+        '--output-file',
+        help='The path of a JSON file to write the results to')
+    parser.add_argument(
+        '--baseline-file',
+        help='The path of a JSON file with previous results to compare to')
+    args = parser.parse_args(argv)
+
+    tmp_dir = tempfile.mkdtemp(prefix='benchmark_job_generation_')
+    buildfarm = SyntheticBuildfarm(
+        os.path.join(tmp_dir, 'www'), args.packages, args.targets,
+        seed=args.seed, max_depends=args.max_depends)
+    try:
+        print('Generating synthetic build farm with %d packages in %d '
+              'repositories and %d targets' % (
+                  args.packages, len(buildfarm.repositories),
+                  len(buildfarm.targets)))
+        buildfarm.start()
+
+        results = {}
+        for name, function in BENCHMARKS:
+            if args.benchmarks and name not in args.benchmarks:
+                continue
+            print('- %s...' % name, end='')
+            sys.stdout.flush()
+            try:
+                results[name] = run_benchmark(
+                    name, function, buildfarm, tmp_dir, args.repeat)
+            except Exception as e:
+                print(' failed: %s (see %s)' % (
+                    e, os.path.join(tmp_dir, '%s.log' % name)))
+                continue
+            print(' %.3fs (cpu %.3fs)' % (
+                results[name]['min_wall_time'],
+                min(results[name]['cpu_time'])))
+    finally:
+        buildfarm.stop()
+
+    data = {
+        'timestamp': time.time(),
+        'parameters': {
+            'packages': args.packages,
+            'targets': args.targets,
+            'max_depends': args.max_depends,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'environment': get_environment(),
+        'results': results,
+    }
+    if args.output_file:
+        with open(args.output_file, 'w') as h:
+            json.dump(data, h, indent=2, sort_keys=True)
+        print("Wrote results to '%s'" % args.output_file)
+
+    if args.baseline_file:
+        with open(args.baseline_file, 'r') as h:
+            baseline = json.load(h)
+        if baseline.get('parameters') != data['parameters']:
+            print('The baseline was created with different parameters: %s' %
+                  baseline.get('parameters'))
+        print_comparison(results, baseline)
+
+    failed = [name for name, _ in BENCHMARKS
+              if (not args.benchmarks or name in args.benchmarks) and
+              name not in results]
+    if not failed:
+        shutil.rmtree(tmp_dir)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
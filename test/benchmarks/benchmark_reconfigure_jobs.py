@@ -0,0 +1,179 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark reconfiguring the jobs against a fake Jenkins master.
+
+A synthetic build farm (see ``synthetic_buildfarm.py``) is pointed at a fake
+Jenkins master (see ``fake_jenkins.py``).
+Each reconfiguration is run twice: the first pass creates all views and jobs,
+the second pass finds them unchanged.
+For every pass the wall time and the number and duration of the requests per
+endpoint are reported.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from benchmark_job_generation import get_environment  # noqa: E402
+from benchmark_job_generation import redirect_output  # noqa: E402
+from fake_jenkins import FakeJenkins  # noqa: E402
+from fake_jenkins import print_statistics  # noqa: E402
+from synthetic_buildfarm import BUILD_NAME  # noqa: E402
+from synthetic_buildfarm import ROSDISTRO_NAME  # noqa: E402
+from synthetic_buildfarm import SyntheticBuildfarm  # noqa: E402
+
+# a Jenkins instance without any jobs evaluates to False which the
+# configure functions interpret as the groovy script mode
+SEED_JOB_NAME = 'seed'
+SEED_JOB_CONFIG = \
+    "<?xml version='1.0' encoding='UTF-8'?>\n<project></project>\n"
+
+
+def reconfigure_release_jobs(buildfarm):
+    from ros_buildfarm.release_job import configure_release_jobs
+    configure_release_jobs(buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME)
+
+
+def reconfigure_devel_jobs(buildfarm):
+    from ros_buildfarm.devel_job import configure_devel_jobs
+    configure_devel_jobs(buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME)
+
+
+def reconfigure_doc_jobs(buildfarm):
+    from ros_buildfarm.doc_job import configure_doc_jobs
+    configure_doc_jobs(buildfarm.config_url, ROSDISTRO_NAME, BUILD_NAME)
+
+
+BENCHMARKS = [
+    ('release', reconfigure_release_jobs),
+    ('devel', reconfigure_devel_jobs),
+    ('doc', reconfigure_doc_jobs),
+]
+
+PASSES = ['create', 'unchanged']
+
+
+def run_pass(function, buildfarm, jenkins, log_filename):
+    jenkins.reset_statistics()
+    with redirect_output(log_filename):
+        start = time.time()
+        function(buildfarm)
+        wall_time = time.time() - start
+    statistics = jenkins.get_statistics()
+    return {
+        'wall_time': wall_time,
+        'request_count': sum(s['count'] for s in statistics.values()),
+        'request_time': sum(s['total_time'] for s in statistics.values()),
+        'job_count': len(jenkins.jobs),
+        'endpoints': statistics,
+    }
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--packages', type=int, default=200,
+        help='The number of packages in the distribution')
+    parser.add_argument(
+        '--targets', type=int, default=1,
+        help='The number of targets in the build files (at most 30)')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='The seed for the random number generator')
+    parser.add_argument(
+        '--latency', type=float, default=0.0,
+        help='The number of seconds every request to Jenkins is delayed')
+    parser.add_argument(
+        '--benchmarks', nargs='*', metavar='NAME',
+        choices=[name for name, _ in BENCHMARKS],
+        help='The job types to reconfigure (default: all)')
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help='Print the statistics of each endpoint')
+    parser.add_argument(
+        '--output-file',
+        help='The path of a JSON file to write the results to')
+    args = parser.parse_args(argv)
+
+    tmp_dir = tempfile.mkdtemp(prefix='benchmark_reconfigure_jobs_')
+    jenkins = FakeJenkins(latency=args.latency)
+    jenkins.add_job(SEED_JOB_NAME, SEED_JOB_CONFIG)
+    jenkins.start()
+    buildfarm = SyntheticBuildfarm(
+        os.path.join(tmp_dir, 'www'), args.packages, args.targets,
+        seed=args.seed, jenkins_url=jenkins.url)
+    results = {}
+    try:
+        print('Generating synthetic build farm with %d packages in %d '
+              'repositories and %d targets' % (
+                  args.packages, len(buildfarm.repositories),
+                  len(buildfarm.targets)))
+        buildfarm.start()
+
+        for name, function in BENCHMARKS:
+            if args.benchmarks and name not in args.benchmarks:
+                continue
+            results[name] = {}
+            log_filename = os.path.join(tmp_dir, '%s.log' % name)
+            for pass_name in PASSES:
+                print('- %s (%s)...' % (name, pass_name), end='')
+                sys.stdout.flush()
+                try:
+                    result = run_pass(
+                        function, buildfarm, jenkins, log_filename)
+                except Exception as e:
+                    print(' failed: %s (see %s)' % (e, log_filename))
+                    return 1
+                results[name][pass_name] = result
+                print(' %.3fs, %d requests taking %.3fs, %d jobs' % (
+                    result['wall_time'], result['request_count'],
+                    result['request_time'], result['job_count']))
+                if args.verbose:
+                    print_statistics(result['endpoints'])
+    finally:
+        buildfarm.stop()
+        jenkins.stop()
+
+    if args.output_file:
+        with open(args.output_file, 'w') as h:
+            json.dump({
+                'timestamp': time.time(),
+                'parameters': {
+                    'packages': args.packages,
+                    'targets': args.targets,
+                    'seed': args.seed,
+                    'latency': args.latency,
+                },
+                'environment': get_environment(),
+                'results': results,
+            }, h, indent=2, sort_keys=True)
+        print("Wrote results to '%s'" % args.output_file)
+
+    shutil.rmtree(tmp_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the dependency closure of the devel task generator.
+
+The recursive run dependencies of every package of a synthetic workspace are
+computed with the memoized ``WorkspaceDependencies`` as well as with the
+per package traversal and the results are compared.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from catkin_pkg.package import Dependency
+from catkin_pkg.package import Package
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from ros_buildfarm.workspace_dependencies import \
+    get_build_and_recursive_run_dependencies_uncached  # noqa: E402
+from ros_buildfarm.workspace_dependencies import \
+    WorkspaceDependencies  # noqa: E402
+
+
+def create_workspace(package_count, max_depends, cycle_count, seed):
+    rng = random.Random(seed)
+    names = ['pkg_%04d' % i for i in range(package_count)]
+    external_names = ['ext_%03d' % i for i in range(100)]
+    pkgs = []
+    for i, name in enumerate(names):
+        def sample_depends():
+            # depend on packages earlier in the order to form a DAG
+            candidates = names[:i]
+            count = rng.randint(0, min(max_depends, len(candidates)))
+            depends = rng.sample(candidates, count)
+            depends += rng.sample(external_names, rng.randint(0, 3))
+            return [Dependency(d) for d in depends]
+        pkgs.append(Package(
+            name=name,
+            build_depends=sample_depends(),
+            buildtool_depends=[Dependency('catkin')],
+            build_export_depends=sample_depends(),
+            buildtool_export_depends=[],
+            exec_depends=sample_depends(),
+            test_depends=[],
+        ))
+    # add a few run dependency cycles
+    for _ in range(cycle_count):
+        a, b = rng.sample(range(package_count), 2)
+        pkgs[min(a, b)].exec_depends.append(Dependency(names[max(a, b)]))
+    return pkgs
+
+
+def get_dependency_names(pkgs, callback):
+    return [sorted(callback(pkg)) for pkg in pkgs]
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--packages', type=int, default=500,
+        help='The number of packages in the workspace')
+    parser.add_argument(
+        '--max-depends', type=int, default=8,
+        help='The maximum number of dependencies per type and package')
+    parser.add_argument(
+        '--cycles', type=int, default=5,
+        help='The number of run dependency cycles to add')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='The seed for the random number generator')
+    args = parser.parse_args(argv)
+
+    pkgs = create_workspace(
+        args.packages, args.max_depends, args.cycles, args.seed)
+
+    start_time = time.time()
+    expected = get_dependency_names(
+        pkgs,
+        lambda pkg: set([
+            d.name for d in get_build_and_recursive_run_dependencies_uncached(
+                pkg, pkgs)]))
+    uncached_duration = time.time() - start_time
+
+    start_time = time.time()
+    workspace = WorkspaceDependencies(pkgs)
+    actual = get_dependency_names(
+        pkgs, workspace.get_build_and_recursive_run_dependency_names)
+    memoized_duration = time.time() - start_time
+
+    assert actual == expected, 'The dependency sets differ'
+    print('%d packages: per package traversal %.3fs, memoized %.3fs '
+          '(%.1fx)' % (
+              len(pkgs), uncached_duration, memoized_duration,
+              uncached_duration / memoized_duration
+              if memoized_duration else float('inf')))
+
+
+if __name__ == '__main__':
+    main()
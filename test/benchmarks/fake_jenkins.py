@@ -0,0 +1,544 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A lightweight fake Jenkins master.
+
+It implements the subset of the remote API used by ``ros_buildfarm.jenkins``
+through jenkinsapi: the job and view lists, reading and writing the
+config.xml of jobs and views, creating and deleting jobs and views, the
+crumb issuer, triggering builds and the queue.
+Jobs are never built, triggered builds stay in the queue.
+
+The number and the duration of the requests are recorded per endpoint.
+A latency can be injected for all requests or per endpoint to simulate a
+remote master.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from xml.etree import ElementTree
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from urllib.parse import quote
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+JENKINS_VERSION = '1.651.3'
+CRUMB_REQUEST_FIELD = 'Jenkins-Crumb'
+CRUMB = 'fake-crumb'
+
+
+class FakeJenkins(object):
+    """
+    The state of the fake Jenkins master and the HTTP server serving it.
+
+    :param latency: The number of seconds every request is delayed
+    :param endpoint_latencies: A dict mapping endpoints (e.g.
+      ``POST /job/*/config.xml``) to the number of seconds requests to them
+      are delayed instead
+    :param require_crumb: The flag if POST requests require a crumb
+    """
+
+    def __init__(
+            self, host='127.0.0.1', port=0, latency=0.0,
+            endpoint_latencies=None, require_crumb=True):
+        self.latency = latency
+        self.endpoint_latencies = endpoint_latencies or {}
+        self.require_crumb = require_crumb
+        self.jobs = {}
+        self.views = {}
+        self.queue = []
+        self._next_queue_id = 1
+        self._lock = threading.Lock()
+        self._statistics = {}
+        self._server = ThreadingHTTPServer((host, port), _get_handler(self))
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def start(self):
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_job(self, name, config):
+        """Add a job without going through the HTTP interface."""
+        with self._lock:
+            self._set_job_config(name, config)
+
+    def get_statistics(self):
+        """
+        Get the request statistics.
+
+        :returns: A dict mapping endpoints to dicts with the number of
+          requests as well as the total and maximum duration in seconds
+        """
+        with self._lock:
+            return json.loads(json.dumps(self._statistics))
+
+    def reset_statistics(self):
+        with self._lock:
+            self._statistics = {}
+
+    def _record(self, endpoint, duration):
+        with self._lock:
+            entry = self._statistics.setdefault(
+                endpoint, {'count': 0, 'total_time': 0.0, 'max_time': 0.0})
+            entry['count'] += 1
+            entry['total_time'] += duration
+            entry['max_time'] = max(entry['max_time'], duration)
+
+    def _get_latency(self, endpoint):
+        return self.endpoint_latencies.get(endpoint, self.latency)
+
+    # the following methods are called with the lock being held
+
+    def _get_root_data(self, base_url):
+        return {
+            '_class': 'hudson.model.Hudson',
+            'jobs': [self._get_job_summary(base_url, name)
+                     for name in sorted(self.jobs.keys())],
+            'primaryView': {'name': 'All', 'url': base_url + '/'},
+            'url': base_url + '/',
+            'useCrumbs': self.require_crumb,
+            'views': [{'name': 'All', 'url': base_url + '/'}] + [
+                {'name': name, 'url': _get_view_url(base_url, name)}
+                for name in sorted(self.views.keys())],
+        }
+
+    def _get_job_summary(self, base_url, name):
+        return {
+            'name': name,
+            'url': _get_job_url(base_url, name),
+            'color': 'disabled' if self.jobs[name]['disabled'] else 'notbuilt',
+        }
+
+    def _get_job_data(self, base_url, name):
+        job = self.jobs[name]
+        data = self._get_job_summary(base_url, name)
+        queue_items = [i for i in self.queue if i['task']['name'] == name]
+        parameter_definitions = [
+            {'name': n, 'defaultParameterValue': {'name': n, 'value': v}}
+            for n, v in job['parameters']]
+        data.update({
+            '_class': 'hudson.model.FreeStyleProject',
+            'actions': [],
+            'buildable': not job['disabled'],
+            'builds': [],
+            'description': job['description'],
+            'displayName': name,
+            'downstreamProjects': [],
+            'firstBuild': None,
+            'healthReport': [],
+            'inQueue': bool(queue_items),
+            'lastBuild': None,
+            'lastCompletedBuild': None,
+            'lastFailedBuild': None,
+            'lastStableBuild': None,
+            'lastSuccessfulBuild': None,
+            'nextBuildNumber': 1,
+            'property': [{'parameterDefinitions': parameter_definitions}]
+            if parameter_definitions else [],
+            'queueItem': queue_items[0] if queue_items else None,
+            'upstreamProjects': [],
+        })
+        return data
+
+    def _get_view_data(self, base_url, name):
+        view = self.views[name]
+        job_names = set(view['job_names'])
+        if view['include_regex']:
+            try:
+                regex = re.compile(view['include_regex'])
+            except re.error:
+                regex = None
+            if regex:
+                job_names |= set(
+                    n for n in self.jobs.keys() if regex.match(n))
+        return {
+            '_class': view['mode'],
+            'description': None,
+            'jobs': [self._get_job_summary(base_url, n)
+                     for n in sorted(job_names) if n in self.jobs],
+            'name': name,
+            'url': _get_view_url(base_url, name),
+        }
+
+    def _set_job_config(self, name, config):
+        root = ElementTree.fromstring(config)
+        disabled = root.find('disabled')
+        description = root.find('description')
+        parameters = []
+        for definition in root.findall('.//parameterDefinitions/*'):
+            parameters.append((
+                definition.findtext('name'),
+                definition.findtext('defaultValue')))
+        self.jobs[name] = {
+            'config': config,
+            'description': description.text if description is not None
+            else None,
+            'disabled': disabled is not None and disabled.text == 'true',
+            'parameters': parameters,
+        }
+
+    def _set_view_config(self, name, config):
+        root = ElementTree.fromstring(config)
+        view = self.views[name]
+        view['config'] = config
+        view['mode'] = root.tag
+        view['include_regex'] = root.findtext('includeRegex')
+        view['job_names'] = [
+            e.text for e in root.findall('jobNames/string')]
+
+
+def _get_job_url(base_url, name):
+    return '%s/job/%s/' % (base_url, quote(name))
+
+
+def _get_view_url(base_url, name):
+    return '%s/view/%s/' % (base_url, quote(name))
+
+
+def _get_empty_view_config(mode):
+    return (
+        "<?xml version='1.0' encoding='UTF-8'?>\n"
+        '<%s>\n'
+        '  <filterExecutors>false</filterExecutors>\n'
+        '  <filterQueue>false</filterQueue>\n'
+        '  <properties class="hudson.model.View$PropertyList"/>\n'
+        '  <jobNames>\n'
+        '    <comparator class="hudson.util.CaseInsensitiveComparator"/>\n'
+        '  </jobNames>\n'
+        '  <jobFilters/>\n'
+        '  <columns/>\n'
+        '  <recurse>false</recurse>\n'
+        '</%s>\n') % (mode, mode)
+
+
+def _filter_tree(data, tree):
+    # only the top level keys of the tree parameter are considered
+    if not tree:
+        return data
+    keys = []
+    depth = 0
+    key = ''
+    for c in tree:
+        if c == '[':
+            depth += 1
+        elif c == ']':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            keys.append(key)
+            key = ''
+        elif depth == 0:
+            key += c
+    keys.append(key)
+    return dict((k, v) for k, v in data.items() if k in keys or k == '_class')
+
+
+def _get_endpoint(method, path):
+    path = re.sub(r'/job/[^/]+', '/job/*', path)
+    path = re.sub(r'/view/[^/]+', '/view/*', path)
+    path = re.sub(r'/queue/item/\d+', '/queue/item/*', path)
+    return '%s %s' % (method, path.rstrip('/') or '/')
+
+
+def _get_handler(jenkins):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self._handle('GET')
+
+        def do_POST(self):
+            self._handle('POST')
+
+        def _handle(self, method):
+            start_time = time.time()
+            parts = urlsplit(self.path)
+            path = unquote(parts.path)
+            self.query = dict(
+                (k, v[0]) for k, v in parse_qs(parts.query).items())
+            self.base_url = 'http://%s' % self.headers.get(
+                'Host', '%s:%d' % jenkins._server.server_address[:2])
+            length = int(self.headers.get('Content-Length') or 0)
+            self.body = self.rfile.read(length).decode('utf-8') \
+                if length else ''
+            endpoint = _get_endpoint(method, path)
+            if not path.startswith('/_fake/'):
+                latency = jenkins._get_latency(endpoint)
+                if latency:
+                    time.sleep(latency)
+            try:
+                if method == 'POST' and jenkins.require_crumb and \
+                        not path.startswith('/_fake/') and \
+                        self.headers.get(CRUMB_REQUEST_FIELD) != CRUMB:
+                    self._send(403, 'No valid crumb was included')
+                else:
+                    with jenkins._lock:
+                        self._dispatch(method, path)
+            finally:
+                if not path.startswith('/_fake/'):
+                    jenkins._record(endpoint, time.time() - start_time)
+
+        def _dispatch(self, method, path):
+            segments = [s for s in path.split('/') if s]
+            if segments[:1] == ['_fake']:
+                return self._handle_fake(method, segments[1:])
+            if segments[:1] == ['job'] and len(segments) >= 2:
+                return self._handle_job(method, segments[1], segments[2:])
+            if segments[:1] == ['view'] and len(segments) >= 2:
+                return self._handle_view(method, segments[1], segments[2:])
+            if segments[:1] == ['queue']:
+                return self._handle_queue(method, segments[1:])
+            if method == 'GET' and not segments:
+                return self._send(200, '<html>Fake Jenkins</html>')
+            if method == 'GET' and segments[0] == 'api' and \
+                    len(segments) == 2:
+                return self._send_api(
+                    segments[1], jenkins._get_root_data(self.base_url))
+            if segments == ['crumbIssuer', 'api', 'python'] or \
+                    segments == ['crumbIssuer', 'api', 'json']:
+                if not jenkins.require_crumb:
+                    return self._send(404, 'Not found')
+                return self._send_api(segments[2], {
+                    'crumb': CRUMB,
+                    'crumbRequestField': CRUMB_REQUEST_FIELD})
+            if method == 'POST' and segments == ['createItem']:
+                name = self.query.get('name')
+                if not name or name in jenkins.jobs:
+                    return self._send(
+                        400, "A job already exists with the name '%s'" % name)
+                jenkins._set_job_config(name, self.body)
+                return self._send(200, '')
+            if method == 'POST' and segments == ['createView']:
+                form = dict(
+                    (k, v[0]) for k, v in parse_qs(self.body).items())
+                name = form.get('name') or self.query.get('name')
+                mode = form.get('mode', 'hudson.model.ListView')
+                if not name or name in jenkins.views:
+                    return self._send(
+                        400, "A view already exists with the name '%s'" %
+                        name)
+                jenkins.views[name] = {}
+                jenkins._set_view_config(name, _get_empty_view_config(mode))
+                return self._send(200, '')
+            self._send(404, 'Not found')
+
+        def _handle_job(self, method, name, segments):
+            if name not in jenkins.jobs:
+                return self._send(404, "No job '%s'" % name)
+            if method == 'GET' and segments[:1] == ['api'] and \
+                    len(segments) == 2:
+                return self._send_api(
+                    segments[1], jenkins._get_job_data(self.base_url, name))
+            if segments == ['config.xml']:
+                if method == 'GET':
+                    return self._send(
+                        200, jenkins.jobs[name]['config'],
+                        content_type='application/xml')
+                jenkins._set_job_config(name, self.body)
+                return self._send(200, '')
+            if method == 'POST' and segments == ['doDelete']:
+                del jenkins.jobs[name]
+                jenkins.queue = [
+                    i for i in jenkins.queue if i['task']['name'] != name]
+                return self._send(200, '')
+            if method == 'POST' and segments in (
+                    ['build'], ['buildWithParameters']):
+                queue_id = jenkins._next_queue_id
+                jenkins._next_queue_id += 1
+                form = dict(
+                    (k, v[0]) for k, v in parse_qs(self.body).items())
+                jenkins.queue.append({
+                    'id': queue_id,
+                    'actions': [{'causes': [{
+                        'shortDescription': form.get('cause', '')}]}],
+                    'blocked': False,
+                    'buildable': True,
+                    'executable': None,
+                    'inQueueSince': int(time.time() * 1000),
+                    'params': '',
+                    'stuck': False,
+                    'task': {
+                        'name': name,
+                        'url': _get_job_url(self.base_url, name)},
+                    'url': 'queue/item/%d/' % queue_id,
+                    'why': 'Waiting for next available executor',
+                })
+                return self._send(201, '', headers={
+                    'Location': '%s/queue/item/%d/' %
+                    (self.base_url, queue_id)})
+            if method == 'POST' and segments in (['disable'], ['enable']):
+                jenkins.jobs[name]['disabled'] = segments == ['disable']
+                return self._send(200, '')
+            self._send(404, 'Not found')
+
+        def _handle_view(self, method, name, segments):
+            if name not in jenkins.views:
+                return self._send(404, "No view '%s'" % name)
+            if method == 'GET' and segments[:1] == ['api'] and \
+                    len(segments) == 2:
+                return self._send_api(
+                    segments[1], jenkins._get_view_data(self.base_url, name))
+            if segments == ['config.xml']:
+                if method == 'GET':
+                    return self._send(
+                        200, jenkins.views[name]['config'],
+                        content_type='application/xml')
+                jenkins._set_view_config(name, self.body)
+                return self._send(200, '')
+            if method == 'POST' and segments == ['addJobToView']:
+                job_name = self.query.get('name')
+                if job_name not in jenkins.jobs:
+                    return self._send(404, "No job '%s'" % job_name)
+                jenkins.views[name]['job_names'].append(job_name)
+                return self._send(200, '')
+            if method == 'POST' and segments == ['doDelete']:
+                del jenkins.views[name]
+                return self._send(200, '')
+            self._send(404, 'Not found')
+
+        def _handle_queue(self, method, segments):
+            if method == 'GET' and segments[:1] == ['api'] and \
+                    len(segments) == 2:
+                return self._send_api(segments[1], {'items': jenkins.queue})
+            if method == 'GET' and segments[:1] == ['item'] and \
+                    len(segments) == 4 and segments[2] == 'api':
+                items = [
+                    i for i in jenkins.queue if str(i['id']) == segments[1]]
+                if not items:
+                    return self._send(404, 'Not found')
+                return self._send_api(segments[3], items[0])
+            if method == 'POST' and segments == ['cancelItem']:
+                jenkins.queue = [
+                    i for i in jenkins.queue
+                    if str(i['id']) != self.query.get('id')]
+                return self._send(200, '')
+            self._send(404, 'Not found')
+
+        def _handle_fake(self, method, segments):
+            if segments == ['statistics']:
+                # the lock is already being held
+                return self._send(
+                    200, json.dumps(jenkins._statistics, sort_keys=True),
+                    content_type='application/json')
+            if method == 'POST' and segments == ['reset-statistics']:
+                jenkins._statistics = {}
+                return self._send(200, '')
+            self._send(404, 'Not found')
+
+        def _send_api(self, api_type, data):
+            data = _filter_tree(data, self.query.get('tree'))
+            if api_type == 'python':
+                return self._send(200, repr(data))
+            if api_type == 'json':
+                return self._send(
+                    200, json.dumps(data), content_type='application/json')
+            self._send(404, 'Not found')
+
+        def _send(self, code, body, content_type='text/plain', headers=None):
+            body = body.encode('utf-8')
+            self.send_response(code)
+            self.send_header('X-Jenkins', JENKINS_VERSION)
+            self.send_header('Content-Type', content_type + '; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+def print_statistics(statistics, file=sys.stdout):
+    total_count = sum(s['count'] for s in statistics.values())
+    total_time = sum(s['total_time'] for s in statistics.values())
+    print('%d requests taking %.3fs:' % (total_count, total_time), file=file)
+    for endpoint, s in sorted(
+            statistics.items(), key=lambda i: -i[1]['total_time']):
+        print('%8d %9.3fs %9.3fms %9.3fms  %s' % (
+            s['count'], s['total_time'],
+            s['total_time'] / s['count'] * 1000, s['max_time'] * 1000,
+            endpoint), file=file)
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Run a fake Jenkins master until it is interrupted and '
+                    'print the request statistics')
+    parser.add_argument(
+        '--host', default='127.0.0.1',
+        help='The host name to listen on')
+    parser.add_argument(
+        '--port', type=int, default=8080,
+        help='The port to listen on')
+    parser.add_argument(
+        '--latency', type=float, default=0.0,
+        help='The number of seconds every request is delayed')
+    parser.add_argument(
+        '--endpoint-latency', nargs=2, action='append', default=[],
+        metavar=('ENDPOINT', 'SECONDS'),
+        help="The latency of a specific endpoint, e.g. "
+             "'POST /job/*/config.xml' 0.5")
+    parser.add_argument(
+        '--no-crumb', action='store_true',
+        help='Accept POST requests without a crumb')
+    args = parser.parse_args(argv)
+
+    jenkins = FakeJenkins(
+        host=args.host, port=args.port, latency=args.latency,
+        endpoint_latencies=dict(
+            (e, float(s)) for e, s in args.endpoint_latency),
+        require_crumb=not args.no_crumb)
+    print("Serving fake Jenkins at '%s'" % jenkins.url)
+    try:
+        jenkins.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print('')
+    print_statistics(jenkins.get_statistics())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generate a synthetic build farm configuration and ROS distribution.
+
+The build farm config, the rosdistro index with its distribution and cache
+files as well as the Debian repositories are written into a directory which
+is served by a local HTTP server.
+This allows running the job generation and status page scripts at scale
+without network access.
+"""
+
+from __future__ import print_function
+
+import gzip
+import os
+import random
+import threading
+
+from http.server import HTTPServer
+from http.server import SimpleHTTPRequestHandler
+from socketserver import ThreadingMixIn
+
+import yaml
+
+ROSDISTRO_NAME = 'bench'
+# a second distribution used for the compare page
+OTHER_ROSDISTRO_NAME = 'bench2'
+BUILD_NAME = 'default'
+
+OS_NAME = 'ubuntu'
+OS_CODE_NAMES = [
+    'trusty', 'xenial', 'yakkety', 'zesty', 'artful',
+    'bionic', 'cosmic', 'disco', 'eoan', 'focal']
+ARCHES = ['amd64', 'arm64', 'armhf']
+
+
+def get_targets(target_count):
+    """
+    Get the requested number of targets.
+
+    All architectures of an OS code name are used before the next one.
+
+    :returns: A list of (os_code_name, arch) tuples
+    """
+    assert 1 <= target_count <= len(OS_CODE_NAMES) * len(ARCHES), \
+        'The number of targets must be between 1 and %d' % \
+        (len(OS_CODE_NAMES) * len(ARCHES))
+    return [
+        (OS_CODE_NAMES[i // len(ARCHES)], ARCHES[i % len(ARCHES)])
+        for i in range(target_count)]
+
+
+def create_repositories(
+        package_count, max_depends=5, packages_per_repository=3, seed=0):
+    """
+    Create repositories of packages with random dependencies.
+
+    Packages only depend on packages created before them which results in a
+    dependency graph without cycles.
+
+    :returns: A list of dicts describing each repository
+    """
+    rng = random.Random(seed)
+    system_depends = ['boost', 'eigen', 'python-yaml', 'libconsole-bridge-dev']
+    names = []
+    repositories = []
+    while len(names) < package_count:
+        repo_name = 'repo_%05d' % len(repositories)
+        count = min(
+            rng.randint(1, packages_per_repository),
+            package_count - len(names))
+        packages = []
+        for _ in range(count):
+            name = 'pkg_%05d' % len(names)
+            candidates = names[-200:]
+            depends = rng.sample(
+                candidates, rng.randint(0, min(max_depends, len(candidates))))
+            packages.append({
+                'name': name,
+                'build_depends': depends + rng.sample(system_depends, 1),
+                'exec_depends': depends,
+            })
+            names.append(name)
+        repositories.append({
+            'name': repo_name,
+            'version': '%d.%d.%d-0' % (
+                rng.randint(0, 2), rng.randint(0, 20), rng.randint(0, 50)),
+            'packages': packages,
+        })
+    return repositories
+
+
+def create_package_xml(name, version, build_depends, exec_depends):
+    lines = [
+        '<?xml version="1.0"?>',
+        '<package format="2">',
+        '  <name>%s</name>' % name,
+        '  <version>%s</version>' % version,
+        '  <description>The %s package</description>' % name,
+        '  <maintainer email="%s@example.com">Maintainer</maintainer>' % name,
+        '  <license>BSD</license>',
+        '  <buildtool_depend>catkin</buildtool_depend>',
+    ]
+    lines += ['  <build_depend>%s</build_depend>' % d for d in build_depends]
+    lines += ['  <exec_depend>%s</exec_depend>' % d for d in exec_depends]
+    lines.append('</package>')
+    return '\n'.join(lines) + '\n'
+
+
+class SyntheticBuildfarm(object):
+    """A synthetic build farm served from a local directory."""
+
+    def __init__(
+            self, path, package_count, target_count, seed=0, max_depends=5,
+            jenkins_url=None):
+        self.path = path
+        self.targets = get_targets(target_count)
+        self.repositories = create_repositories(
+            package_count, max_depends=max_depends, seed=seed)
+        self.seed = seed
+        # the jobs are only generated against a Jenkins master if a URL of a
+        # (fake) instance is passed
+        self.jenkins_url = jenkins_url
+        self.base_url = None
+        self._server = None
+
+    @property
+    def config_url(self):
+        return self.base_url + '/buildfarm/index.yaml'
+
+    @property
+    def rosdistro_index_url(self):
+        return self.base_url + '/rosdistro/index.yaml'
+
+    def get_debian_repository_url(self, name):
+        return '%s/%s/%s' % (self.base_url, OS_NAME, name)
+
+    def start(self):
+        """Start serving the directory and write all files."""
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+        path = self.path
+
+        class Handler(SimpleHTTPRequestHandler):
+
+            def translate_path(self, url_path):
+                url_path = url_path.split('?', 1)[0].split('#', 1)[0]
+                return os.path.join(path, *url_path.split('/'))
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = 'http://127.0.0.1:%d' % self._server.server_port
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self._write_files()
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _write_files(self):
+        self._write_rosdistro()
+        self._write_config()
+        self._write_debian_repositories()
+
+    def _write_yaml(self, relative_path, data):
+        filename = os.path.join(self.path, relative_path)
+        if not os.path.exists(os.path.dirname(filename)):
+            os.makedirs(os.path.dirname(filename))
+        with open(filename, 'w') as h:
+            yaml.safe_dump(data, h, default_flow_style=False)
+
+    def _write_gzip(self, relative_path, content):
+        filename = os.path.join(self.path, relative_path)
+        if not os.path.exists(os.path.dirname(filename)):
+            os.makedirs(os.path.dirname(filename))
+        with gzip.open(filename, 'wb') as h:
+            h.write(content.encode())
+
+    def _get_distribution_data(self, rosdistro_name, version_bump):
+        repositories = {}
+        for repo in self.repositories:
+            url = 'https://github.com/synthetic/%s' % repo['name']
+            repositories[repo['name']] = {
+                'doc': {'type': 'git', 'url': url + '.git',
+                        'version': 'master'},
+                'release': {
+                    'packages': [p['name'] for p in repo['packages']],
+                    'tags': {'release': 'release/%s/{package}/{version}' %
+                             rosdistro_name},
+                    'url': url + '-release.git',
+                    'version': _bump_version(repo['version'], version_bump),
+                },
+                'source': {'type': 'git', 'url': url + '.git',
+                           'version': 'master', 'test_pull_requests': True},
+                'status': 'maintained',
+            }
+        os_code_names = []
+        for os_code_name, _ in self.targets:
+            if os_code_name not in os_code_names:
+                os_code_names.append(os_code_name)
+        return {
+            'type': 'distribution',
+            'version': 2,
+            'release_platforms': {OS_NAME: os_code_names},
+            'repositories': repositories,
+        }
+
+    def _write_rosdistro(self):
+        distributions = {}
+        for rosdistro_name, version_bump in [
+                (ROSDISTRO_NAME, 0), (OTHER_ROSDISTRO_NAME, 1)]:
+            dist_data = self._get_distribution_data(
+                rosdistro_name, version_bump)
+            self._write_yaml(
+                'rosdistro/%s/distribution.yaml' % rosdistro_name, dist_data)
+            release_package_xmls = {}
+            for repo in self.repositories:
+                version = _bump_version(
+                    repo['version'], version_bump).split('-')[0]
+                for pkg in repo['packages']:
+                    release_package_xmls[pkg['name']] = create_package_xml(
+                        pkg['name'], version,
+                        pkg['build_depends'], pkg['exec_depends'])
+            cache_data = {
+                'type': 'cache',
+                'version': 2,
+                'name': rosdistro_name,
+                'distribution_file': [dist_data],
+                'release_package_xmls': release_package_xmls,
+            }
+            self._write_gzip(
+                'rosdistro/%s-cache.yaml.gz' % rosdistro_name,
+                yaml.safe_dump(cache_data, default_flow_style=False))
+            distributions[rosdistro_name] = {
+                'distribution': [
+                    '%s/rosdistro/%s/distribution.yaml' %
+                    (self.base_url, rosdistro_name)],
+                'distribution_cache':
+                    '%s/rosdistro/%s-cache.yaml.gz' %
+                    (self.base_url, rosdistro_name),
+            }
+        self._write_yaml('rosdistro/index.yaml', {
+            'type': 'index',
+            'version': 3,
+            'distributions': distributions,
+        })
+
+    def _write_config(self):
+        targets = {}
+        for os_code_name, arch in self.targets:
+            targets.setdefault(os_code_name, {})[arch] = {}
+        notifications = {'emails': [], 'maintainers': False}
+        self._write_yaml('buildfarm/release-build.yaml', {
+            'type': 'release-build',
+            'version': 2,
+            'targets': {OS_NAME: targets},
+            'target_repository': self.get_debian_repository_url('building'),
+            'archlinux_target_repository': self.base_url + '/archlinux',
+            'upload_credential_id': 'upload',
+            'notifications': notifications,
+            'sync': {'package_count': len(self.repositories)},
+        })
+        self._write_yaml('buildfarm/source-build.yaml', {
+            'type': 'source-build',
+            'version': 2,
+            'targets': {OS_NAME: targets},
+            'notifications': notifications,
+            'test_commits': {'default': True},
+            'test_pull_requests': {'default': True},
+        })
+        os_code_name, arch = self.targets[0]
+        self._write_yaml('buildfarm/doc-build.yaml', {
+            'type': 'doc-build',
+            'version': 1,
+            'documentation_type': 'rosdoc_lite',
+            'targets': {OS_NAME: {os_code_name: {arch: {}}}},
+            'canonical_base_url': 'http://docs.example.com',
+            'notifications': notifications,
+            'upload_credential_id': 'upload',
+        })
+        self._write_yaml('buildfarm/index.yaml', {
+            'type': 'buildfarm',
+            'version': 1,
+            'distributions': {
+                ROSDISTRO_NAME: {
+                    'doc_builds': {BUILD_NAME: 'doc-build.yaml'},
+                    'release_builds': {BUILD_NAME: 'release-build.yaml'},
+                    'source_builds': {BUILD_NAME: 'source-build.yaml'},
+                },
+            },
+            'jenkins_url': self.jenkins_url or self.base_url + '/jenkins',
+            'prerequisites': {},
+            'rosdistro_index_url': self.rosdistro_index_url,
+            'status_page_repositories': {
+                'ros': [
+                    self.get_debian_repository_url(name)
+                    for name in ['building', 'testing', 'main']],
+            },
+        })
+
+    def _write_debian_repositories(self):
+        # building contains all packages, testing and main lag behind
+        rng = random.Random(self.seed)
+        for repo_name, ratio in [
+                ('building', 1.0), ('testing', 0.9), ('main', 0.8)]:
+            for os_code_name in sorted(set(t[0] for t in self.targets)):
+                arches = [a for c, a in self.targets if c == os_code_name]
+                blocks = []
+                for repo in self.repositories:
+                    if rng.random() > ratio:
+                        continue
+                    version = repo['version']
+                    if ratio < 1.0 and rng.random() < 0.1:
+                        version = _bump_version(version, -1)
+                    for pkg in repo['packages']:
+                        blocks.append(
+                            'Package: ros-%s-%s\nVersion: %s%s-20160101\n' % (
+                                ROSDISTRO_NAME, pkg['name'].replace('_', '-'),
+                                version, os_code_name))
+                content = '\n'.join(blocks)
+                dists_path = '%s/%s/dists/%s/main' % (
+                    OS_NAME, repo_name, os_code_name)
+                self._write_gzip(
+                    dists_path + '/source/Sources.gz', content)
+                for arch in arches:
+                    self._write_gzip(
+                        dists_path + '/binary-%s/Packages.gz' % arch,
+                        content)
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+def _bump_version(version, bump):
+    version, _, debian_inc = version.partition('-')
+    major, minor, patch = [int(v) for v in version.split('.')]
+    return '%d.%d.%d-%s' % (major, minor, max(0, patch + bump), debian_inc)
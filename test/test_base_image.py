@@ -0,0 +1,181 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shlex
+import shutil
+import stat
+import subprocess
+import sys
+from tempfile import mkdtemp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ros_buildfarm.base_image import \
+    BASE_IMAGE_COMMON_DEPENDENCIES_LABEL  # noqa: E402
+from ros_buildfarm.base_image import BASE_IMAGE_PACKAGES_LABEL  # noqa: E402
+from ros_buildfarm.base_image import get_base_image_data  # noqa: E402
+from ros_buildfarm.base_image import get_base_image_name  # noqa: E402
+from ros_buildfarm.templates import create_dockerfile  # noqa: E402
+from ros_buildfarm.templates import expand_template  # noqa: E402
+
+REGISTRY = 'localhost:5000'
+PACKAGES = ['python-catkin-pkg', 'ros-kinetic-catkin']
+COMMON_DEPENDENCIES = ['ros-kinetic-catkin', 'ros-kinetic-roscpp']
+
+# a stand-in for the docker CLI
+# the images of the host are stored in the directory FAKE_DOCKER_IMAGES,
+# the images of the registry in the directory FAKE_DOCKER_REGISTRY
+FAKE_DOCKER = """#!%s
+import json
+import os
+import re
+import shutil
+import sys
+
+images = os.environ['FAKE_DOCKER_IMAGES']
+registry = os.environ['FAKE_DOCKER_REGISTRY']
+
+
+def path(directory, name):
+    return os.path.join(directory, name.replace('/', '_'))
+
+
+cmd, args = sys.argv[1], sys.argv[2:]
+name = args[-1]
+if cmd == 'build':
+    name = args[args.index('-t') + 1]
+    with open('Dockerfile', 'r') as h:
+        labels = dict(re.findall('^LABEL (\\\\S+)="(.*)"$', h.read(), re.M))
+    with open(path(images, name), 'w') as h:
+        json.dump(labels, h)
+elif cmd == 'push':
+    if '/' not in name or not os.path.exists(path(images, name)):
+        sys.exit("An image does not exist locally with the tag: " + name)
+    shutil.copy(path(images, name), path(registry, name))
+elif cmd == 'pull':
+    if not os.path.exists(path(registry, name)):
+        sys.exit('manifest for %%s not found' %% name)
+    shutil.copy(path(registry, name), path(images, name))
+elif cmd == 'inspect':
+    if not os.path.exists(path(images, name)):
+        sys.exit('Error: No such image: ' + name)
+    label = re.search('"(.*)"', args[-2]).group(1)
+    with open(path(images, name), 'r') as h:
+        print(json.load(h).get(label, ''))
+else:
+    sys.exit("Unsupported command '%%s'" %% cmd)
+""" % sys.executable
+
+
+class _Repository(object):
+    url = 'https://github.com/ros-infrastructure/ros_buildfarm.git'
+    version = 'master'
+
+
+def _get_job_config(registry):
+    return expand_template('misc/base_image_job.xml.em', {
+        'ros_buildfarm_repository': _Repository(),
+        'script_generating_key_files': [],
+        'config_url': 'http://example.com/index.yaml',
+        'rosdistro_name': 'kinetic',
+        'os_name': 'ubuntu',
+        'os_code_name': 'xenial',
+        'arch': 'amd64',
+        'repository_args': [],
+        'node_label': 'buildslave',
+        'base_image': get_base_image_name(
+            'kinetic', 'ubuntu', 'xenial', 'amd64', registry=registry),
+        'base_image_registry': registry,
+        'notification_emails': [],
+    })
+
+
+def _get_docker_commands(job_config, subcommand):
+    prefix = 'docker %s ' % subcommand
+    return [
+        line for line in job_config.splitlines() if line.startswith(prefix)]
+
+
+# all templates are expanded in a single test since empy fails to install
+# its stdout proxy again after pytest replaced sys.stdout for the next test
+def test_base_image_push_and_pull():
+    image_name = get_base_image_name(
+        'kinetic', 'ubuntu', 'xenial', 'amd64', registry=REGISTRY)
+    assert image_name.startswith(REGISTRY + '/')
+    job_config = _get_job_config(REGISTRY)
+    assert _get_docker_commands(job_config, 'push') == \
+        ['docker push %s' % image_name]
+    # without a registry the image is not pushed
+    assert not _get_docker_commands(_get_job_config(''), 'push')
+
+    tmp_dir = mkdtemp()
+    environ = dict(os.environ)
+    try:
+        bin_dir = os.path.join(tmp_dir, 'bin')
+        os.makedirs(bin_dir)
+        docker = os.path.join(bin_dir, 'docker')
+        with open(docker, 'w') as h:
+            h.write(FAKE_DOCKER)
+        os.chmod(docker, os.stat(docker).st_mode | stat.S_IEXEC)
+        for name in ['registry', 'building_host', 'other_host', 'dockerfile']:
+            os.makedirs(os.path.join(tmp_dir, name))
+        os.environ['PATH'] = bin_dir + os.pathsep + os.environ['PATH']
+        os.environ['FAKE_DOCKER_REGISTRY'] = os.path.join(tmp_dir, 'registry')
+
+        # build and push the image like the base-image job
+        dockerfile_dir = os.path.join(tmp_dir, 'dockerfile')
+        create_dockerfile('misc/base_image_task.Dockerfile.em', {
+            'os_name': 'ubuntu',
+            'os_code_name': 'xenial',
+            'arch': 'amd64',
+            'distribution_repository_urls': [],
+            'distribution_repository_keys': [],
+            'dependencies': PACKAGES,
+            'dependency_versions': dict((p, '1.0') for p in PACKAGES),
+            'common_dependencies': COMMON_DEPENDENCIES,
+            'base_image_packages_label': BASE_IMAGE_PACKAGES_LABEL,
+            'base_image_common_dependencies_label':
+            BASE_IMAGE_COMMON_DEPENDENCIES_LABEL,
+        }, dockerfile_dir)
+        os.environ['FAKE_DOCKER_IMAGES'] = \
+            os.path.join(tmp_dir, 'building_host')
+        commands = [
+            c for c in _get_docker_commands(job_config, 'build')
+            if image_name in c] + _get_docker_commands(job_config, 'push')
+        assert len(commands) == 2
+        for command in commands:
+            subprocess.check_call(shlex.split(command), cwd=dockerfile_dir)
+
+        # another host pulls the image from the registry
+        os.environ['FAKE_DOCKER_IMAGES'] = os.path.join(tmp_dir, 'other_host')
+        data = get_base_image_data(
+            'kinetic', 'ubuntu', 'xenial', 'amd64', registry=REGISTRY)
+        assert data == {
+            'base_image': image_name,
+            'base_image_packages': PACKAGES,
+            'common_dependencies': COMMON_DEPENDENCIES,
+        }
+
+        # without a registry the image is not available on another host
+        data = get_base_image_data('kinetic', 'ubuntu', 'xenial', 'amd64')
+        assert data == {
+            'base_image': None,
+            'base_image_packages': [],
+            'common_dependencies': [],
+        }
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,146 @@
+# Copyright 2016 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ros_buildfarm.debian_version import compare_debian_versions  # noqa: E402
+from ros_buildfarm.debian_version import debian_version_key  # noqa: E402
+from ros_buildfarm.debian_version import get_debian_version  # noqa: E402
+
+# the expected results match the output of 'dpkg --compare-versions'
+COMPARISONS = [
+    ('1.0', '1.0', 0),
+    ('1.0', '1.00', 0),
+    ('1.0', '1.0-0', 0),
+    ('0:1.0', '1.0', 0),
+    ('1.0', '1.1', -1),
+    ('1.9', '1.10', -1),
+    ('1.0', '1.0.0', -1),
+    ('1.0a', '1.0', 1),
+    ('1.0a', '1.0+', -1),
+    ('1.0~rc1', '1.0', -1),
+    ('1.0~rc1', '1.0~rc2', -1),
+    ('1.0~~', '1.0~', -1),
+    ('1.0~', '1.0~a', -1),
+    ('1:0.1', '2.0', 1),
+    ('1:1.0', '2:0.1', -1),
+    ('1.0-1', '1.0-2', -1),
+    ('1.0-10', '1.0-9', 1),
+    ('1.0-1ubuntu1', '1.0-1', 1),
+    ('1.0-1~bpo1', '1.0-1', -1),
+    ('1.0-a', '1.0-+', -1),
+    ('1.2.3-0trusty', '1.2.3-0xenial', -1),
+    ('1.2.3-0xenial-20160101-1200-+0000',
+     '1.2.3-0xenial-20160102-1200-+0000', -1),
+    ('1.2.10-0trusty-20160101-1200-+0000',
+     '1.2.9-0trusty-20160102-1200-+0000', 1),
+    ('1.2.3-1trusty', '1.2.3-0trusty', 1),
+    ('0.10.0-0', '0.9.12-0', 1),
+    ('1.0', '', 1),
+    ('', '', 0),
+    ('0', '', 1),
+    ('0~', '', 1),
+    ('', '0~1', -1),
+]
+
+
+def test_comparisons():
+    for version, other_version, expected in COMPARISONS:
+        result = compare_debian_versions(version, other_version)
+        assert result == expected, \
+            "Comparing '%s' with '%s' resulted in %d instead of %d" % \
+            (version, other_version, result, expected)
+        result = compare_debian_versions(other_version, version)
+        assert result == -expected, \
+            "Comparing '%s' with '%s' resulted in %d instead of %d" % \
+            (other_version, version, result, -expected)
+
+
+def test_operators():
+    lower = get_debian_version('1.0~rc1-0')
+    higher = get_debian_version('1.0-0')
+    assert lower < higher
+    assert lower <= higher
+    assert higher > lower
+    assert higher >= lower
+    assert lower != higher
+    assert higher == get_debian_version('0:1.0-0')
+    assert hash(higher) == hash(get_debian_version('0:1.0'))
+    assert get_debian_version('1.0-0') is higher
+    assert str(higher) == '1.0-0'
+
+
+def test_parts():
+    version = get_debian_version('2:1.2.3-0xenial-20160101')
+    assert version.epoch == 2
+    assert version.upstream_version == '1.2.3-0xenial'
+    assert version.debian_revision == '20160101'
+    version = get_debian_version('1.2.3')
+    assert version.epoch == 0
+    assert version.upstream_version == '1.2.3'
+    assert version.debian_revision == ''
+
+
+def test_sort_key():
+    versions = ['1.0', '1.0~rc1', '1:0.1', '0.9-1', '1.0-1', '1.0+dfsg']
+    assert sorted(versions, key=debian_version_key) == \
+        ['0.9-1', '1.0~rc1', '1.0', '1.0-1', '1.0+dfsg', '1:0.1']
+
+
+def _dpkg_compare_versions(version, other_version):
+    for operator, result in [('lt', -1), ('eq', 0)]:
+        proc = subprocess.Popen(
+            ['dpkg', '--compare-versions', version, operator, other_version],
+            stderr=subprocess.PIPE)
+        _, stderr = proc.communicate()
+        if stderr:
+            # dpkg warns about invalid version strings
+            return None
+        if proc.returncode == 0:
+            return result
+    return 1
+
+
+def test_random_versions_against_dpkg():
+    try:
+        subprocess.check_output(['dpkg', '--version'])
+    except (OSError, subprocess.CalledProcessError):
+        print('Skipping comparison with dpkg since it is not available')
+        return
+    rng = random.Random(0)
+    alphabet = '0123456789~.+-:abzAZ'
+    for _ in range(500):
+        version, other_version = [
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+            for _ in range(2)]
+        expected = _dpkg_compare_versions(version, other_version)
+        if expected is None:
+            continue
+        result = compare_debian_versions(version, other_version)
+        assert result == expected, \
+            "Comparing '%s' with '%s' resulted in %d instead of %d as " \
+            'dpkg' % (version, other_version, result, expected)
+
+
+if __name__ == '__main__':
+    test_comparisons()
+    test_operators()
+    test_parts()
+    test_sort_key()
+    test_random_versions_against_dpkg()